@@ -4,6 +4,7 @@ and :py:class:`Block` for its basic blocks.
 """
 
 from graphviz import Digraph  # for dot output
+from zlib import crc32
 from typing import cast, Any, Dict, List, Set, Iterator
 
 from Lib.Errors import MiniCInternalError
@@ -71,6 +72,13 @@ class Block:
     def __repr__(self):
         return str(self._label)
 
+    def __hash__(self):
+        # Hash on the label rather than on the identity, so that iterating
+        # over sets of blocks (e.g. dominators) doesn't depend on memory
+        # addresses: the generated code is then reproducible. crc32 rather
+        # than hash(), which is randomized for strings.
+        return crc32(self._label.name.encode())
+
     def get_body(self) -> List[BlockInstr]:
         """Return the statements in the body of the block (no phi-node nor the terminator)."""
         return self._instructions
@@ -0,0 +1,161 @@
+"""
+This file defines :py:class:`CompileCache`, the on-disk cache of
+generated code used by MiniCC.py with `--cache`.
+
+An entry is the generated code for a program, stored in a file named
+after a hash of the source text and of the compiler options. The entry
+also records the source files of the compiler modules imported by the
+compilation, with a hash of their content: it is only used while none of
+them changes. The least recently used entries are removed when the cache
+grows over its size bound.
+"""
+
+from hashlib import sha256
+from typing import Dict, List, Optional
+import os
+import sys
+import tempfile
+
+
+# Directory of the compiler (MiniCC.py, Lib/, TP*/...).
+COMPILER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZE = 64  # MiB
+
+# Hashes of the compiler source files, computed once per process: the
+# process runs the code it imported, even if the files change later.
+_file_hashes: Dict[str, str] = {}
+
+
+def default_cache_dir() -> str:
+    """$XDG_CACHE_HOME/minicc, or ~/.cache/minicc."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or \
+        os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "minicc")
+
+
+def _compiler_file(module) -> Optional[str]:
+    """The source file of `module` relative to COMPILER_DIR, if it is a
+    module of the compiler."""
+    path = getattr(module, "__file__", None)
+    if path is None or not path.endswith(".py"):
+        return None
+    path = os.path.abspath(path)
+    if not path.startswith(COMPILER_DIR + os.sep):
+        return None
+    return os.path.relpath(path, COMPILER_DIR)
+
+
+def compiler_modules() -> List[str]:
+    """Names of the compiler modules imported by this process."""
+    return sorted(name for name, module in list(sys.modules.items())
+                  if _compiler_file(module) is not None)
+
+
+def compiler_files() -> List[str]:
+    """Source files of the compiler modules imported by this process,
+    relative to COMPILER_DIR."""
+    files = set()
+    for module in list(sys.modules.values()):
+        path = _compiler_file(module)
+        if path is not None:
+            files.add(path)
+    return sorted(files)
+
+
+def compiler_hash(files: List[str]) -> str:
+    """Hash of the compiler source `files` (relative to COMPILER_DIR)."""
+    h = sha256()
+    for f in files:
+        if f not in _file_hashes:
+            try:
+                with open(os.path.join(COMPILER_DIR, f), "rb") as stream:
+                    _file_hashes[f] = sha256(stream.read()).hexdigest()
+            except OSError:
+                _file_hashes[f] = ""
+        h.update(f.encode() + b"\0" + _file_hashes[f].encode() + b"\0")
+    return h.hexdigest()
+
+
+class CompileCache:
+    """
+    Cache of generated code in the directory `cache_dir`, holding at most
+    `max_size` MiB. Entries are looked up with :py:meth:`get` and added
+    with :py:meth:`put`, using a key given by :py:meth:`key`.
+
+    The cache is only an optimization: I/O errors are ignored, and
+    several processes may use the same directory at once.
+    """
+
+    _dir: str
+    _max_size: int
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: int = DEFAULT_SIZE):
+        self._dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self._max_size = max_size * 1024 * 1024
+
+    def key(self, source: str, *options) -> str:
+        """Key for the code generated from `source` with `options`."""
+        h = sha256()
+        for option in options:
+            h.update(b"\0" + repr(option).encode())
+        h.update(b"\0" + source.encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._dir, key + ".s")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the code cached for `key`, or None (also if the compiler
+        changed since it was cached)."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as stream:
+                # The hash of the compiler files, then these files
+                files = stream.readline().split()
+                code = stream.read()
+            if not files or files[0] != compiler_hash(files[1:]):
+                return None
+            os.utime(path)  # Most recently used
+        except OSError:
+            return None
+        return code
+
+    def put(self, key: str, code: str) -> None:
+        """Cache `code` for `key`, as generated by the compiler modules
+        imported so far, then evict the least recently used entries if
+        the cache is too big."""
+        files = compiler_files()
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            # Write then rename, so that other processes never read a
+            # partial entry.
+            fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as stream:
+                stream.write(" ".join([compiler_hash(files)] + files) + "\n")
+                stream.write(code)
+            os.replace(tmp, self._path(key))
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache holds
+        at most its maximal size."""
+        entries = []
+        for entry in os.scandir(self._dir):
+            if entry.name.endswith(".s"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self._max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,189 @@
+"""
+This file defines :py:class:`DFACache`, which keeps the prediction DFA
+of an ANTLR lexer and parser in a file between runs.
+
+The ANTLR runtime builds the DFA of the lexer and of the parser lazily,
+while it tokenizes and parses: the first files parsed in a process are
+much slower than the next ones. With ``--dfa-cache DIR``, MiniCC.py loads
+the DFA built by the previous runs from DIR before parsing, and saves it
+back when it has grown. The file is named after a hash of the grammars
+and of the runtime, and only used with them: the DFA is made of objects
+of the runtime, whose attributes are not part of its API.
+
+The file is written atomically, so that concurrent compilers never read a
+partial file, and only the classes of the runtime are unpickled from it.
+"""
+
+from hashlib import sha256
+from importlib import metadata
+from typing import List
+import os
+import pickle
+import sys
+import tempfile
+
+from antlr4.PredictionContext import PredictionContext
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.ATNState import ATNState
+from antlr4.atn.LexerAction import LexerAction
+from antlr4.atn.SemanticContext import SemanticContext
+
+
+def _runtime_version() -> str:
+    try:
+        return metadata.version("antlr4-python3-runtime")
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        return ""
+
+
+class _DFAPickler(pickle.Pickler):
+    """Pickle DFA states, referring to the ATN and to the singletons of
+    the runtime instead of copying them."""
+
+    def __init__(self, file, atn):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._actions = {id(action): i for i, action in enumerate(atn.lexerActions or [])}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, ATNState):
+            return ("state", obj.stateNumber)
+        elif isinstance(obj, LexerAction) and id(obj) in self._actions:
+            return ("action", self._actions[id(obj)])
+        elif obj is ATNSimulator.ERROR:
+            return ("error",)
+        elif obj is PredictionContext.EMPTY:
+            return ("empty",)
+        elif obj is SemanticContext.NONE:
+            return ("none",)
+        return None
+
+
+class _DFAUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, atn):
+        super().__init__(file)
+        self._atn = atn
+
+    def find_class(self, module, name):
+        # The DFA only holds objects of the runtime: don't let the file
+        # refer to (and call) anything else.
+        if not module.startswith("antlr4."):
+            raise pickle.UnpicklingError("Unexpected class {}.{}".format(module, name))
+        return super().find_class(module, name)
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "state":
+            return self._atn.states[pid[1]]
+        elif kind == "action":
+            return self._atn.lexerActions[pid[1]]
+        elif kind == "error":
+            return ATNSimulator.ERROR
+        elif kind == "empty":
+            return PredictionContext.EMPTY
+        elif kind == "none":
+            return SemanticContext.NONE
+        raise pickle.UnpicklingError("Unknown persistent id {}".format(pid))
+
+
+def _rehash(states) -> None:
+    """Forget the hash codes computed in the process which built `states`:
+    some of them are hashes of strings, which change from one process to
+    the other."""
+    for state in states:
+        state.configs.cachedHashCode = -1
+        executors = [state.lexerActionExecutor] + \
+            [getattr(config, "lexerActionExecutor", None) for config in state.configs]
+        for executor in executors:
+            if executor is not None:
+                executor.hashCode = hash("".join(str(la) for la in executor.lexerActions))
+
+
+class DFACache:
+    """
+    DFA of the recognizer classes `recognizers` (e.g. MiniCLexer and
+    MiniCParser), saved in the directory `directory`, in the file
+    "<key>.dfa" (see :py:meth:`key`).
+
+    Loading and saving are only optimizations: errors are ignored.
+    """
+
+    path: str
+    _key: str
+    _sizes: List[int]
+
+    def __init__(self, *recognizers, directory: str):
+        self._recognizers = recognizers
+        self._key = self.key()
+        self.path = os.path.join(directory, self._key + ".dfa")
+        self._sizes = self._dfa_sizes()
+
+    def _dfa_sizes(self) -> List[int]:
+        return [len(dfa._states) for recognizer in self._recognizers
+                for dfa in recognizer.decisionsToDFA]
+
+    def key(self) -> str:
+        """Hash of the grammars of the recognizers, and of the runtime."""
+        h = sha256(_runtime_version().encode())
+        for recognizer in self._recognizers:
+            module = sys.modules[recognizer.__module__]
+            h.update(b"\0" + repr(module.serializedATN()).encode())
+        return h.hexdigest()
+
+    def load(self) -> bool:
+        """Load the saved DFA, if any and built with the same grammars, in
+        place of the (empty) DFA of the recognizers. Return True if loaded."""
+        if any(self._dfa_sizes()):
+            return False  # Don't throw away what we already have.
+        try:
+            with open(self.path, "rb") as stream:
+                if stream.readline().decode().strip() != self._key:
+                    return False
+                loaded = []
+                for recognizer in self._recognizers:
+                    dfas = _DFAUnpickler(stream, recognizer.atn).load()
+                    if len(dfas) != len(recognizer.decisionsToDFA):
+                        return False
+                    loaded.append(dfas)
+        except Exception:
+            # A missing, truncated or otherwise unreadable file: start
+            # from an empty DFA, as without cache.
+            return False
+        for recognizer, dfas in zip(self._recognizers, loaded):
+            for dfa, (s0, states) in zip(recognizer.decisionsToDFA, dfas):
+                _rehash(states)
+                if s0 is not None and s0 not in states:
+                    _rehash([s0])  # The start state of a precedence DFA
+                dfa.s0 = s0
+                dfa._states = {state: state for state in states}
+        self._sizes = self._dfa_sizes()
+        return True
+
+    def save(self) -> None:
+        """Save the DFA of the recognizers, if it has grown since it was
+        loaded or last saved."""
+        sizes = self._dfa_sizes()
+        if sizes == self._sizes:
+            return
+        limit = sys.getrecursionlimit()
+        tmp = None
+        try:
+            # Write then rename, so that other processes never read a
+            # partial file.
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as stream:
+                stream.write(self._key.encode() + b"\n")
+                # Pickling follows the edges of the DFA recursively.
+                sys.setrecursionlimit(max(limit, 10000))
+                for recognizer in self._recognizers:
+                    _DFAPickler(stream, recognizer.atn).dump(
+                        [(dfa.s0, list(dfa._states)) for dfa in recognizer.decisionsToDFA])
+            os.replace(tmp, self.path)
+            self._sizes = sizes
+        except (OSError, RecursionError, pickle.PicklingError):
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+        finally:
+            sys.setrecursionlimit(limit)
@@ -16,3 +16,7 @@ class MiniCTypeError(Exception):
 
 class AllocationError(Exception):
     pass
+
+
+class MiniCTimeoutError(Exception):
+    pass
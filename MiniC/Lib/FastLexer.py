@@ -0,0 +1,170 @@
+"""
+This file defines :py:class:`FastLexer`, a hand-written lexer for the
+tokens of MiniC.g4, used by MiniCC.py with ``--lexer=fast``.
+
+The whole token set is matched by a single compiled regular expression,
+which is much faster than the generated MiniCLexer. The tokens are the
+same ANTLR CommonToken objects, with the same types, positions and
+texts, and lexical errors are reported to the error listeners with the
+messages of MiniCLexer: the parser and its messages cannot tell the
+difference. test_lexer.py compares both lexers.
+
+A :py:class:`Lib.LargeInput.MmapInputStream` is scanned in place, with
+the bytes version of the regular expressions: the file is never decoded
+as a whole.
+"""
+
+from typing import Dict, Iterator
+import re
+
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.InputStream import InputStream
+from antlr4.Token import Token
+from antlr4.error.ErrorListener import ConsoleErrorListener, ProxyErrorListener
+
+from Lib.LargeInput import MmapInputStream
+from MiniCLexer import MiniCLexer
+
+
+# Keywords and operators, from their text to their token type.
+LITERALS: Dict[str, int] = {
+    name[1:-1]: token_type
+    for token_type, name in enumerate(MiniCLexer.literalNames)
+    if name.startswith("'")
+}
+
+# Longest match first, as the ANTLR lexer does: e.g. "//" is a comment,
+# "1.5" a FLOAT, and keywords are recognized among the IDs.
+TOKEN_RE = re.compile(r"""
+    (?P<SPACE>[ \t\r\n]+)
+  | (?P<COMMENT>(?:\#|//)[^\r\n]*)
+  | (?P<ID>[a-zA-Z_][a-zA-Z_0-9]*)
+  | (?P<FLOAT>[0-9]+\.[0-9]*|\.[0-9]+)
+  | (?P<INT>[0-9]+)
+  | (?P<STRING>"(?:[^"\r\n]|"")*")
+  | (?P<LITERAL>\|\||&&|==|!=|>=|<=|[-+*/%!<>:;,=(){}])
+""", re.VERBOSE)
+
+NEWLINE_RE = re.compile(r"[\r\n]")
+
+# The same, to scan an ASCII file in bytes.
+BYTES_LITERALS: Dict[bytes, int] = {
+    text.encode('ascii'): token_type for text, token_type in LITERALS.items()
+}
+BYTES_TOKEN_RE = re.compile(TOKEN_RE.pattern.encode('ascii'), re.VERBOSE)
+BYTES_NEWLINE_RE = re.compile(NEWLINE_RE.pattern.encode('ascii'))
+
+TOKEN_TYPES = {
+    "FLOAT": MiniCLexer.FLOAT,
+    "INT": MiniCLexer.INT,
+    "STRING": MiniCLexer.STRING,
+}
+
+
+class FastLexer:
+    """
+    Token source for MiniCParser (through a CommonTokenStream), reading
+    the InputStream `input`.
+    """
+
+    def __init__(self, input: InputStream):
+        self._input = input
+        self._factory = CommonTokenFactory.DEFAULT
+        self._listeners = [ConsoleErrorListener.INSTANCE]
+        # Position of the current token, read by the CommonToken constructor.
+        self.line = 1
+        self.column = 0
+        self._tokens = self._scan()
+
+    def addErrorListener(self, listener) -> None:
+        self._listeners.append(listener)
+
+    def removeErrorListeners(self) -> None:
+        self._listeners = []
+
+    def getSourceName(self) -> str:
+        return self._input.getSourceName()
+
+    def nextToken(self) -> Token:
+        return next(self._tokens)
+
+    def _scan(self) -> Iterator[Token]:
+        if isinstance(self._input, MmapInputStream):
+            text = self._input.bytedata
+            literals = BYTES_LITERALS
+            match = BYTES_TOKEN_RE.match
+            newline = b"\n"
+        else:
+            text = self._input.strdata
+            literals = LITERALS
+            match = TOKEN_RE.match
+            newline = "\n"
+        size = len(text)
+        source = (self, self._input)
+        create = self._factory.create
+        pos = 0
+        line = 1
+        line_start = 0  # Index of the first character of the line
+        while pos < size:
+            m = match(text, pos)
+            if m is None:
+                end = self._error_end(text, pos)
+                self._error(text[pos:end + 1], line, pos - line_start)
+                new_pos = min(end + 1, size)
+            else:
+                kind = m.lastgroup
+                new_pos = m.end()
+                if kind == "ID":
+                    token_type = literals.get(m.group(), MiniCLexer.ID)
+                elif kind == "LITERAL":
+                    token_type = literals[m.group()]
+                elif kind == "SPACE" or kind == "COMMENT":
+                    token_type = None
+                else:
+                    token_type = TOKEN_TYPES[kind]
+                if token_type is not None:
+                    self.line = line
+                    self.column = pos - line_start
+                    yield create(source, token_type, None, Token.DEFAULT_CHANNEL,
+                                 pos, new_pos - 1, line, pos - line_start)
+            if m is None or kind == "SPACE":
+                # The other tokens never span several lines.
+                chunk = text[pos:new_pos]
+                newlines = chunk.count(newline)
+                if newlines:
+                    line += newlines
+                    line_start = pos + chunk.rindex(newline) + 1
+            pos = new_pos
+        self.line = line
+        self.column = size - line_start
+        while True:
+            yield create(source, Token.EOF, None, Token.DEFAULT_CHANNEL,
+                         size, size - 1, line, size - line_start)
+
+    @staticmethod
+    def _error_end(text, pos: int) -> int:
+        """Index of the character at which MiniCLexer detects an error for
+        a token starting at `pos`, which it skips along with the token."""
+        c = text[pos:pos + 1]
+        if isinstance(c, bytes):
+            c = c.decode('ascii')
+        if c in "|&.":
+            # Incomplete "||", "&&" or FLOAT
+            return pos + 1
+        elif c == '"':
+            # Unterminated STRING
+            regex = NEWLINE_RE if isinstance(text, str) else BYTES_NEWLINE_RE
+            m = regex.search(text, pos)
+            return m.start() if m else len(text)
+        return pos
+
+    def _error(self, text, line: int, column: int) -> None:
+        if isinstance(text, bytes):
+            text = text.decode('ascii')
+        msg = "token recognition error at: '" + self._error_display(text) + "'"
+        ProxyErrorListener(self._listeners).syntaxError(
+            self, None, line, column, msg, None)
+
+    @staticmethod
+    def _error_display(text: str) -> str:
+        return text.replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r")
@@ -0,0 +1,212 @@
+"""
+This file defines the ANTLR streams used by MiniCC.py with
+``--large-input``, for source files of hundreds of MB:
+
+- :py:class:`MmapInputStream`, a character stream reading the source
+  file through mmap, where antlr4.FileStream keeps both the text and a
+  list of its code points in memory,
+- :py:class:`UnbufferedTokenStream`, a token stream which only keeps the
+  tokens the parser may come back to, where antlr4.CommonTokenStream
+  keeps all of them.
+"""
+
+from typing import List
+import mmap
+import re
+
+import antlr4
+from antlr4.InputStream import InputStream
+from antlr4.Token import Token
+from antlr4.error.Errors import IllegalStateException
+
+
+NON_ASCII_RE = re.compile(rb"[\x80-\xff]")
+
+
+class MmapInputStream(InputStream):
+    """
+    Character stream over the mapping `data` of an ASCII file, in which
+    characters are bytes. Use :py:func:`open_input` to create one.
+    """
+
+    def __init__(self, data: mmap.mmap, name: str):
+        self.name = name
+        self._mmap = data
+        self._index = 0
+        self._size = len(data)
+
+    @property
+    def bytedata(self) -> mmap.mmap:
+        """The mapping itself, scanned in place by Lib.FastLexer."""
+        return self._mmap
+
+    @property
+    def strdata(self) -> str:  # type: ignore[override]
+        # A copy of the whole file: only for the InputStream API.
+        return self._mmap[:].decode('ascii')
+
+    def LA(self, offset: int):
+        if offset == 0:
+            return 0  # undefined
+        if offset < 0:
+            offset += 1  # e.g., translate LA(-1) to use offset=0
+        pos = self._index + offset - 1
+        if pos < 0 or pos >= self._size:  # invalid
+            return Token.EOF
+        return self._mmap[pos]
+
+    def LT(self, offset: int):
+        return self.LA(offset)
+
+    def getText(self, start: int, stop: int):
+        if stop >= self._size:
+            stop = self._size - 1
+        if start >= self._size:
+            return ""
+        return self._mmap[start:stop + 1].decode('ascii')
+
+    def __str__(self):
+        return self.strdata
+
+
+def open_input(filename: str) -> InputStream:
+    """Character stream for the UTF-8 file `filename`: a MmapInputStream if
+    it is ASCII (then offsets in bytes are offsets in characters), else a
+    regular antlr4.FileStream."""
+    with open(filename, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            data = None
+    if data is None or NON_ASCII_RE.search(data):
+        return antlr4.FileStream(filename, encoding='utf-8')
+    return MmapInputStream(data, filename)
+
+
+class UnbufferedTokenStream:
+    """
+    Token stream reading the tokens of `tokenSource` on demand, and only
+    keeping them from the first mark (see :py:meth:`mark`), or from the
+    current one. Same as the UnbufferedTokenStream of the Java runtime.
+
+    Parsing only needs the tokens from the start of the current
+    prediction, but the parse tree refers to all the tokens: use it with
+    parser.buildParseTrees = False for memory to stay bounded.
+    """
+
+    _tokens: List[Token]
+
+    def __init__(self, tokenSource):
+        self.tokenSource = tokenSource
+        self._tokens = []  # Tokens from the first mark, if any
+        self._p = 0  # Index of the current token in _tokens
+        self._numMarkers = 0
+        self._lastToken = None
+        self._lastTokenBufferStart = None  # _lastToken at the first mark
+        self._currentTokenIndex = 0
+        self._fill(1)
+
+    @property
+    def index(self) -> int:
+        return self._currentTokenIndex
+
+    @property
+    def sourceName(self) -> str:
+        return self.tokenSource.getSourceName()
+
+    def _bufferStartIndex(self) -> int:
+        return self._currentTokenIndex - self._p
+
+    def get(self, i: int) -> Token:
+        start = self._bufferStartIndex()
+        if i < start or i >= start + len(self._tokens):
+            raise IndexError("get({}) outside buffer: {}..{}".format(
+                i, start, start + len(self._tokens)))
+        return self._tokens[i - start]
+
+    def LT(self, i: int) -> Token:
+        if i == -1:
+            return self._lastToken
+        self._sync(i)
+        index = self._p + i - 1
+        if index < 0:
+            raise IndexError("LT({}) gives negative index".format(i))
+        if index >= len(self._tokens):
+            # Only past the EOF token
+            return self._tokens[-1]
+        return self._tokens[index]
+
+    def LA(self, i: int) -> int:
+        return self.LT(i).type
+
+    def getTokenSource(self):
+        return self.tokenSource
+
+    def getText(self, start=None, stop=None) -> str:
+        if isinstance(start, Token):
+            start = start.tokenIndex
+        if isinstance(stop, Token):
+            stop = stop.tokenIndex
+        return "".join(self.get(i).text for i in range(start, stop + 1))
+
+    def consume(self) -> None:
+        if self.LA(1) == Token.EOF:
+            raise IllegalStateException("cannot consume EOF")
+        self._lastToken = self._tokens[self._p]
+        if self._p == len(self._tokens) - 1 and self._numMarkers == 0:
+            # No mark: the current token is the last one to keep.
+            self._tokens = []
+            self._p = -1
+            self._lastTokenBufferStart = self._lastToken
+        self._p += 1
+        self._currentTokenIndex += 1
+        self._sync(1)
+
+    def _sync(self, want: int) -> None:
+        """Make sure we have `want` tokens from the current position."""
+        need = (self._p + want - 1) - len(self._tokens) + 1
+        if need > 0:
+            self._fill(need)
+
+    def _fill(self, n: int) -> None:
+        for _ in range(n):
+            if self._tokens and self._tokens[-1].type == Token.EOF:
+                return
+            t = self.tokenSource.nextToken()
+            t.tokenIndex = self._bufferStartIndex() + len(self._tokens)
+            self._tokens.append(t)
+
+    def mark(self) -> int:
+        if self._numMarkers == 0:
+            self._lastTokenBufferStart = self._lastToken
+        self._numMarkers += 1
+        return -self._numMarkers
+
+    def release(self, marker: int) -> None:
+        if marker != -self._numMarkers:
+            raise IllegalStateException("release() called with an invalid marker.")
+        self._numMarkers -= 1
+        if self._numMarkers == 0:
+            # Drop the tokens before the current one.
+            if self._p > 0:
+                self._tokens = self._tokens[self._p:]
+                self._p = 0
+            self._lastTokenBufferStart = self._lastToken
+
+    def seek(self, index: int) -> None:
+        if index == self._currentTokenIndex:
+            return
+        if index > self._currentTokenIndex:
+            self._sync(index - self._currentTokenIndex)
+            index = min(index, self._bufferStartIndex() + len(self._tokens) - 1)
+        i = index - self._bufferStartIndex()
+        if i < 0 or i >= len(self._tokens):
+            raise IndexError("seek({}) outside buffer: {}..{}".format(
+                index, self._bufferStartIndex(),
+                self._bufferStartIndex() + len(self._tokens)))
+        self._p = i
+        self._currentTokenIndex = index
+        if self._p == 0:
+            self._lastToken = self._lastTokenBufferStart
+        else:
+            self._lastToken = self._tokens[self._p - 1]
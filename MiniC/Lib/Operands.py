@@ -66,6 +66,11 @@ class Condition(Operand):
         """Return the opposite condition."""
         return Condition(opnot_dict[self._op])
 
+    def is_zero_test(self) -> bool:
+        """True for beqz and bnez, which compare their only operand to 0.
+        Jumps keep the register ZERO as their second operand."""
+        return self._op in ('beqz', 'bnez')
+
     def __str__(self):
         return self._op
 
@@ -197,6 +202,11 @@ class Temporary(DataLocation):
     def __repr__(self):
         return ("temp_{}".format(str(self._number)))
 
+    def __hash__(self):
+        # Hash on the number rather than on the identity, so that iterating
+        # over sets of temporaries doesn't depend on memory addresses.
+        return self._number
+
     def get_alloced_loc(self) -> DataLocation:
         """Return the DataLocation allocated to this Temporary."""
         return self._pool.get_alloced_loc(self)
@@ -0,0 +1,50 @@
+"""
+This file defines :py:class:`OutputBuffer`, through which the evaluation
+engines of ``--mode eval`` write the lines printed by the println_*
+statements of the program.
+
+Calling print() for each line executed makes the output of a loop cost
+more than the loop itself: the buffer writes the lines to the output
+stream in blocks. MiniCC.py flushes it once the program is done, before
+printing the error that stopped it, if any: the output is the same as
+when writing each line as soon as it is printed.
+"""
+
+from typing import List, Optional, TextIO
+import sys
+
+
+# Default size of the buffer of MiniCC.py, in characters
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class OutputBuffer:
+    """
+    Lines written to `stream` (sys.stdout when the buffer is created, by
+    default) once they are at least `size` characters. With a `size` of
+    0, each line is written as soon as it is printed.
+    """
+
+    _lines: List[str]
+
+    def __init__(self, size: int = 0, stream: Optional[TextIO] = None):
+        self._size = size
+        self._stream = stream if stream is not None else sys.stdout
+        self._lines = []
+        self._length = 0  # Characters in self._lines, newlines included
+
+    def println(self, value) -> None:
+        """Print the line str(value), as print(value) does."""
+        text = str(value)
+        self._lines.append(text)
+        self._length += len(text) + 1
+        if self._length > self._size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines to the stream."""
+        if self._lines:
+            self._lines.append("")  # For the last newline
+            self._stream.write("\n".join(self._lines))
+            self._lines = []
+            self._length = 0
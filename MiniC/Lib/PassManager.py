@@ -0,0 +1,135 @@
+"""
+This file defines :py:class:`PassManager`, which runs the passes of
+the compiler (parsing, typing, code generation, SSA, allocation...)
+and keeps track of where compile time goes.
+
+It is used by MiniCC.py for its `--time-passes` and `--stats` options.
+When none of them is given, :py:meth:`PassManager.run` simply calls the
+pass, and the counters are not computed.
+"""
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Name of the section for the passes running on the whole program.
+PROGRAM = "(program)"
+
+# IR counters reported by --stats, in this order.
+STATS = ["blocks", "instructions", "temporaries", "phis",
+         "interference edges", "spilled temps"]
+
+
+class PassManager:
+    """
+    Run passes, measuring their wall time and number of calls for each
+    function (with `time_passes`), and gather IR counters on the code of
+    each function (with `stats`).
+    """
+
+    time_passes: bool
+    stats: bool
+    _function: str
+    # function -> pass -> [number of calls, total time in seconds]
+    _timings: Dict[str, Dict[str, List]]
+    # function -> counter -> value
+    _counters: Dict[str, Dict[str, int]]
+
+    def __init__(self, time_passes=False, stats=False):
+        self.time_passes = time_passes
+        self.stats = stats
+        self._function = PROGRAM
+        self._timings = dict()
+        self._counters = dict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.time_passes or self.stats
+
+    def set_function(self, name: str) -> None:
+        """The next passes and counters are about function `name`."""
+        self._function = name
+
+    def run(self, name: str, f: Callable, *args, **kwargs) -> Any:
+        """Run the pass `name`, i.e. return f(*args, **kwargs)."""
+        if not self.time_passes:
+            return f(*args, **kwargs)
+        start = perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            timing = (self._timings.setdefault(self._function, dict())
+                      .setdefault(name, [0, 0.]))
+            timing[0] += 1
+            timing[1] += perf_counter() - start
+
+    @contextmanager
+    def instrumented(self, obj: Any, method: str, name: str,
+                     after: Optional[Callable[[], None]] = None) -> Iterator[None]:
+        """
+        Within the `with` block, calls to `obj.method` (typically made by
+        another pass, e.g. the allocator calls the liveness analysis)
+        are run as the pass `name`, followed by a call to `after()`.
+        `obj` is an object: only this instance is instrumented.
+        """
+        if not self.enabled:
+            yield
+            return
+        original = getattr(obj, method)
+
+        def wrapper(*args, **kwargs):
+            result = self.run(name, original, *args, **kwargs)
+            if after is not None:
+                after()
+            return result
+
+        setattr(obj, method, wrapper)
+        try:
+            yield
+        finally:
+            delattr(obj, method)
+
+    def count(self, counter: str, value: int) -> None:
+        """Set the IR counter `counter` of the current function."""
+        if self.stats:
+            self._counters.setdefault(self._function, dict())[counter] = value
+
+    def results(self) -> Tuple[Dict, Dict]:
+        """Timings and counters, to be merged into another pass manager
+        with :py:meth:`merge` (e.g. from a worker process)."""
+        return self._timings, self._counters
+
+    def merge(self, results: Tuple[Dict, Dict]) -> None:
+        """Add the results of another pass manager."""
+        timings, counters = results
+        for function, passes in timings.items():
+            mine = self._timings.setdefault(function, dict())
+            for name, (calls, time) in passes.items():
+                timing = mine.setdefault(name, [0, 0.])
+                timing[0] += calls
+                timing[1] += time
+        for function, values in counters.items():
+            self._counters.setdefault(function, dict()).update(values)
+
+    def report(self, stream) -> None:
+        """Print the timings and counters on `stream`."""
+        if self.time_passes:
+            for function, passes in self._timings.items():
+                total = sum(time for _, time in passes.values())
+                print("=== Pass timings for {} ===".format(function), file=stream)
+                print("  {:<24} {:>6} {:>12} {:>7}".format(
+                    "pass", "calls", "time (ms)", "%"), file=stream)
+                for name, (calls, time) in passes.items():
+                    print("  {:<24} {:>6} {:>12.3f} {:>6.1f}%".format(
+                        name, calls, time * 1000,
+                        100 * time / total if total else 0.), file=stream)
+                print("  {:<24} {:>6} {:>12.3f}".format("total", "", total * 1000),
+                      file=stream)
+        if self.stats:
+            for function, values in self._counters.items():
+                print("=== Statistics for {} ===".format(function), file=stream)
+                for counter in STATS:
+                    if counter in values:
+                        print("  {:<24} {:>8}".format(counter, values[counter]),
+                              file=stream)
@@ -0,0 +1,120 @@
+"""
+This file defines :py:class:`StatementProfiler`, which measures the
+execution count and time of each statement of a program evaluated by
+MiniCInterpretVisitor.
+
+It is used by MiniCC.py for its `--profile` and `--profile-stacks`
+options. The profiler replaces the visit methods of the statements of
+one visitor (see :py:meth:`StackVisitor.wrap_visit`): without these
+options, the interpreter runs unchanged.
+"""
+
+from time import perf_counter
+from types import GeneratorType
+from typing import Any, Callable, Dict, List, Tuple
+
+from antlr4.ParserRuleContext import ParserRuleContext
+
+from MiniCParser import MiniCParser
+from Lib.StackVisitor import StackVisitor, Visit, tree_text
+
+
+# Context classes of the statements
+STATEMENTS = (
+    MiniCParser.AssignStatContext,
+    MiniCParser.IfStatContext,
+    MiniCParser.WhileStatContext,
+    MiniCParser.ForStatContext,
+    MiniCParser.PrintlnintStatContext,
+    MiniCParser.PrintlnfloatStatContext,
+    MiniCParser.PrintlnboolStatContext,
+    MiniCParser.PrintlnstringStatContext,
+)
+
+# Root of the stacks of statements
+ROOT = "main"
+
+# Characters of the text of a statement in the report
+TEXT_WIDTH = 40
+
+
+class StatementProfiler:
+    """
+    Execution count, total time (including the nested statements) and
+    self time of the statements of a program, identified by their line
+    and column, as in the messages of the typechecker.
+    """
+
+    # (line, column) -> [executions, total time, self time], in seconds
+    _timings: Dict[Tuple[int, int], List]
+    # (line, column) -> (kind of statement, text)
+    _statements: Dict[Tuple[int, int], Tuple[str, str]]
+    # Frames of the statements being executed: [(line, column), time of
+    # the nested statements]
+    _stack: List[List]
+    # Stack of frame names -> self time
+    _stacks: Dict[Tuple[str, ...], float]
+
+    def __init__(self):
+        self._timings = dict()
+        self._statements = dict()
+        self._stack = []
+        self._stacks = dict()
+
+    def profile(self, visitor: StackVisitor, classes=STATEMENTS) -> None:
+        """Measure the visits of the nodes of `classes` by `visitor`."""
+        for cls in classes:
+            visitor.wrap_visit(cls, self._timed)
+
+    def _timed(self, method: Callable[[Any], Any]) -> Callable[[Any], Visit[Any]]:
+        return lambda ctx: self._run(method, ctx)
+
+    def _run(self, method: Callable[[Any], Any], ctx: ParserRuleContext) -> Visit[Any]:
+        key = (ctx.start.line, ctx.start.column)
+        if key not in self._statements:
+            kind = type(ctx).__name__[:-len("StatContext")].lower()
+            self._statements[key] = (kind, tree_text(ctx, TEXT_WIDTH))
+        frame = [key, 0.]
+        self._stack.append(frame)
+        start = perf_counter()
+        try:
+            result = method(ctx)
+            if type(result) is GeneratorType:
+                result = yield result
+            return result
+        finally:
+            elapsed = perf_counter() - start
+            own = elapsed - frame[1]
+            timing = self._timings.setdefault(key, [0, 0., 0.])
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] += own
+            stack = (ROOT,) + tuple(self._frame(f[0]) for f in self._stack)
+            self._stacks[stack] = self._stacks.get(stack, 0.) + own
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def _frame(self, key: Tuple[int, int]) -> str:
+        return "{}@{}:{}".format(self._statements[key][0], *key)
+
+    def report(self, stream) -> None:
+        """Print the statements on `stream`, the longest first."""
+        print("=== Statement profile ===", file=stream)
+        print("  {:<10} {:<14} {:>10} {:>12} {:>12}  {}".format(
+            "line:col", "statement", "count", "total (ms)", "self (ms)", "text"),
+            file=stream)
+        for key, (count, total, own) in sorted(self._timings.items(),
+                                               key=lambda item: -item[1][1]):
+            kind, text = self._statements[key]
+            if len(text) > TEXT_WIDTH:
+                text = text[:TEXT_WIDTH - 3] + "..."
+            print("  {:<10} {:<14} {:>10} {:>12.3f} {:>12.3f}  {}".format(
+                "{}:{}".format(*key), kind, count, total * 1000, own * 1000, text),
+                file=stream)
+
+    def write_stacks(self, stream) -> None:
+        """Write the self time of each stack of statements on `stream`, in
+        microseconds, in the collapsed format of flame graph tools."""
+        for stack, own in sorted(self._stacks.items()):
+            print("{} {}".format(";".join(stack), round(own * 1e6)), file=stream)
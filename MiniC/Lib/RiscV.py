@@ -4,9 +4,24 @@ Functions to define instructions.
 """
 
 from Lib.Errors import MiniCInternalError
-from Lib.Operands import (Condition, Immediate, Operand, Function)
+from Lib.Operands import (Condition, Immediate, Operand, Function, ZERO)
 from Lib.Statement import (Instru3A, AbsoluteJump, ConditionalJump, Label)
 
+# Range of the 12-bit signed immediates of addi, xori, slti...
+IMM12_MIN = -2 ** 11
+IMM12_MAX = 2 ** 11 - 1
+
+
+def fits_imm12(value: int) -> bool:
+    """True if `value` can be the immediate operand of addi, xori..."""
+    return IMM12_MIN <= value <= IMM12_MAX
+
+
+def _imm12(imm: Immediate) -> Immediate:
+    if not fits_imm12(imm._val):
+        raise MiniCInternalError("Immediate {} doesn't fit in 12 bits".format(imm))
+    return imm
+
 
 def call(function: Function) -> Instru3A:
     """Function call."""
@@ -26,9 +41,19 @@ def conditional_jump(label: Label, op1: Operand, cond: Condition, op2: Operand):
     return ConditionalJump(cond=cond, op1=op1, op2=op2, label=label)
 
 
+def beqz(label: Label, op: Operand) -> ConditionalJump:
+    """Jump to label if op is 0."""
+    return ConditionalJump(cond=Condition('beqz'), op1=op, op2=ZERO, label=label)
+
+
+def bnez(label: Label, op: Operand) -> ConditionalJump:
+    """Jump to label if op is not 0."""
+    return ConditionalJump(cond=Condition('bnez'), op1=op, op2=ZERO, label=label)
+
+
 def add(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:
     if isinstance(sr2orimm7, Immediate):
-        return Instru3A("addi", dr, sr1, sr2orimm7)
+        return Instru3A("addi", dr, sr1, _imm12(sr2orimm7))
     else:
         return Instru3A("add", dr, sr1, sr2orimm7)
 
@@ -55,27 +80,53 @@ def rem(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:
 
 def sub(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:
     if isinstance(sr2orimm7, Immediate):
-        raise MiniCInternalError("Cant substract by an immediate")
+        # No subi: add the opposite
+        return Instru3A("addi", dr, sr1, _imm12(Immediate(-sr2orimm7._val)))
     return Instru3A("sub", dr, sr1, sr2orimm7)
 
 
 def land(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:
     """And instruction (cannot be called `and` due to Python and)."""
+    if isinstance(sr2orimm7, Immediate):
+        return Instru3A("andi", dr, sr1, _imm12(sr2orimm7))
     return Instru3A("and", dr, sr1, sr2orimm7)
 
 
 def lor(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:
     """Or instruction (cannot be called `or` due to Python or)."""
+    if isinstance(sr2orimm7, Immediate):
+        return Instru3A("ori", dr, sr1, _imm12(sr2orimm7))
     return Instru3A("or", dr, sr1, sr2orimm7)
 
 
-def xor(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:  # pragma: no cover
+def xor(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:
     if isinstance(sr2orimm7, Immediate):
-        return Instru3A("xori", dr, sr1, sr2orimm7)
+        return Instru3A("xori", dr, sr1, _imm12(sr2orimm7))
     else:
         return Instru3A("xor", dr, sr1, sr2orimm7)
 
 
+def slt(dr: Operand, sr1: Operand, sr2orimm7: Operand) -> Instru3A:
+    """Set dr to 1 if sr1 < sr2orimm7 (signed), to 0 otherwise."""
+    if isinstance(sr2orimm7, Immediate):
+        return Instru3A("slti", dr, sr1, _imm12(sr2orimm7))
+    return Instru3A("slt", dr, sr1, sr2orimm7)
+
+
+def seqz(dr: Operand, sr: Operand) -> Instru3A:
+    """Set dr to 1 if sr is 0, to 0 otherwise."""
+    return Instru3A("seqz", dr, sr)
+
+
+def snez(dr: Operand, sr: Operand) -> Instru3A:
+    """Set dr to 1 if sr is not 0, to 0 otherwise."""
+    return Instru3A("snez", dr, sr)
+
+
+def neg(dr: Operand, sr: Operand) -> Instru3A:
+    return Instru3A("neg", dr, sr)
+
+
 def li(dr: Operand, imm7: Immediate) -> Instru3A:
     return Instru3A("li", dr, imm7)
 
@@ -0,0 +1,280 @@
+"""
+This file defines :py:class:`StackVisitor`, the base class of the typing,
+evaluation and code generation visitors of the parse tree, which visits
+the tree with an explicit stack instead of recursive calls.
+
+A visit method which needs the result of a child yields the child, and
+the result is sent back by the yield::
+
+    def visitAdditiveExpr(self, ctx):
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
+        return lval + rval
+
+Visit methods of leaves can return their result directly. The
+generators of the nodes being visited are kept in a list by
+:py:meth:`StackVisitor.visit`: the depth of the tree is not limited by
+the Python stack, e.g. for a chain ``a + a + ... + a`` of 100000 terms.
+A visit method may also
+return :py:meth:`StackVisitor.dispatch` of a child, which only goes
+through the stack beyond MAX_DISPATCH_DEPTH nested calls, e.g. for
+nested parentheses. A visit method which wraps another one yields its
+generator, if it returns one, rather than ``yield from`` it: the
+wrappers of nested nodes would run inside each other. An exception raised by the visit of a child is
+thrown into the generator of its parent, as it would be raised by a
+recursive visit() call.
+"""
+
+from types import GeneratorType
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, TypeVar
+
+from antlr4.ParserRuleContext import ParserRuleContext
+from antlr4.tree.Tree import ErrorNode, ParseTree, TerminalNode
+from antlr4.tree.Trees import Trees
+from antlr4.Utils import escapeWhitespace
+
+from MiniCVisitor import MiniCVisitor
+
+
+T = TypeVar("T")
+
+# Return type of the visit methods which yield children.
+Visit = Generator[ParseTree, Any, T]
+
+# Nested dispatch() calls beyond which the node is visited through the
+# stack of visit() instead: a few Python frames each.
+MAX_DISPATCH_DEPTH = 50
+
+
+def _run_generator(gen: Generator) -> Generator:
+    return gen
+
+
+class StackVisitor(MiniCVisitor):
+    """
+    MiniCVisitor whose visit methods may be generators yielding the
+    children to visit, see the module documentation.
+    """
+
+    _methods: Dict[type, Callable[[Any], Any]]
+
+    def __init__(self):
+        # The visit method of each class of nodes, see _method: this is
+        # cheaper than the accept() of the generated contexts.
+        # A generator yielded instead of a child is run on the stack.
+        self._methods = {GeneratorType: _run_generator}
+        self._dispatch_depth = 0  # Nested calls of dispatch()
+        # The largest number of generators suspended at once by the last
+        # visit(), i.e. about the depth of the tree.
+        self.max_depth = 0
+
+    def visit(self, tree: ParseTree) -> Any:
+        self.max_depth = 0
+        result = self.dispatch(tree)
+        if type(result) is not GeneratorType:
+            return result
+        get = self._methods.get
+        # The generators of the ancestors of the current node
+        stack: List[Generator] = []
+        push = stack.append
+        pop = stack.pop
+        max_depth = 0
+        gen = result  # The generator of the current node
+        result = None  # To send to gen
+        error = None  # To throw into gen instead
+        while True:
+            try:
+                if error is None:
+                    child = gen.send(result)
+                else:
+                    error, e = None, error
+                    child = gen.throw(e)
+            except StopIteration as stop:
+                if not stack:
+                    self.max_depth = max_depth
+                    return stop.value
+                result = stop.value
+                gen = pop()
+                continue
+            except Exception as e:
+                # Propagate the error to the parent.
+                if not stack:
+                    self.max_depth = max_depth
+                    raise
+                error = e
+                gen = pop()
+                continue
+            try:
+                method = get(type(child))
+                if method is None:
+                    method = self._cached_method(type(child))
+                result = method(child)
+            except Exception as e:
+                error = e
+                continue
+            if type(result) is GeneratorType:
+                push(gen)
+                if len(stack) > max_depth:
+                    max_depth = len(stack)
+                gen = result
+                result = None
+
+    def dispatch(self, node: ParseTree) -> Any:
+        """Start the visit of `node`: return its result, or the generator
+        visiting it. A visit method can return this to be replaced by the
+        visit of a child, e.g. ``return self.dispatch(ctx.expr())``,
+        which saves a generator."""
+        if self._dispatch_depth >= MAX_DISPATCH_DEPTH:
+            return self._visitChild(node)
+        method = self._methods.get(type(node))
+        if method is None:
+            method = self._cached_method(type(node))
+        self._dispatch_depth += 1
+        try:
+            return method(node)
+        finally:
+            self._dispatch_depth -= 1
+
+    def _visitChild(self, node) -> Visit[Any]:
+        return (yield node)
+
+    def wrap_visit(self, cls: type,
+                   wrapper: Callable[[Callable[[Any], Any]], Callable[[Any], Any]]) -> None:
+        """Visit the nodes of class `cls` with wrapper(method), `method`
+        being their visit method so far, e.g. to profile them. The
+        visit of the other nodes is unchanged."""
+        method = self._methods.get(cls)
+        if method is None:
+            method = self._cached_method(cls)
+        self._methods[cls] = wrapper(method)
+
+    def _cached_method(self, cls: type) -> Callable[[Any], Any]:
+        method = self._methods[cls] = self._method(cls)
+        return method
+
+    def _method(self, cls: type) -> Callable[[Any], Any]:
+        """The function visiting the nodes of class `cls`, which calls the
+        visit method that their accept() would call."""
+        if issubclass(cls, ParserRuleContext) and cls.__name__.endswith("Context"):
+            # e.g. visitStat_block for Stat_blockContext
+            name = "visit" + cls.__name__[:-len("Context")]
+            method = getattr(self, name, self.visitChildren)
+            if getattr(type(self), name, None) is getattr(MiniCVisitor, name, None) \
+                    and self._default_children():
+                return self._visitDefault
+            return method
+        elif issubclass(cls, ErrorNode):
+            return self.visitErrorNode
+        elif issubclass(cls, TerminalNode):
+            return self.visitTerminal
+        return lambda node: node.accept(self)
+
+    def _default_children(self) -> bool:
+        """Whether visitChildren gives the result of the last child, and
+        None for leaves."""
+        cls = type(self)
+        return all(getattr(cls, name) is getattr(StackVisitor, name) for name in
+                   ("visitChildren", "defaultResult", "aggregateResult",
+                    "shouldVisitNextChild", "visitTerminal", "visitErrorNode"))
+
+    def _visitDefault(self, node) -> Any:
+        # The visit method generated in MiniCVisitor, i.e. visitChildren,
+        # which gives the result of the last child: if it is the only
+        # one, the node is replaced by its child.
+        children = node.children
+        if not children:
+            return None
+        elif len(children) == 1:
+            return self.dispatch(children[0])
+        return self._visitDefaultChildren(children)
+
+    def _visitDefaultChildren(self, children) -> Visit[Any]:
+        result = None
+        for child in children:
+            if isinstance(child, TerminalNode):
+                result = None
+            else:
+                result = yield child
+        return result
+
+    def visitChildren(self, node) -> Visit[Any]:
+        result = self.defaultResult()
+        for child in node.children or ():
+            if not self.shouldVisitNextChild(node, result):
+                break
+            if isinstance(child, TerminalNode):
+                # A leaf: no need to go through the stack.
+                childResult = self.dispatch(child)
+            else:
+                childResult = yield child
+            result = self.aggregateResult(result, childResult)
+        return result
+
+
+def string_tree(tree: ParseTree, parser, max_length: Optional[int] = None) -> str:
+    """Same as Trees.toStringTree(tree, None, parser), without recursion.
+    With `max_length`, only its first `max_length` characters followed by
+    "..." if it is longer, in a time which doesn't depend on the size of
+    `tree`: e.g. for the comment of each of many nested statements."""
+    rule_names = parser.ruleNames
+    parts: List[str] = []
+    length = 0
+    # The remaining children of the nodes being written
+    stack: List[Iterator[ParseTree]] = []
+    node: Optional[ParseTree] = tree
+    while node is not None:
+        if isinstance(node, TerminalNode):
+            text = Trees.getNodeText(node, rule_names)
+            if "\n" in text or "\r" in text or "\t" in text:
+                text = escapeWhitespace(text, False)
+            node = None
+        elif not node.children:
+            text = Trees.getNodeText(node, rule_names)
+            node = None
+        else:
+            text = "(" + Trees.getNodeText(node, rule_names) + " "
+            children = iter(node.children)
+            stack.append(children)
+            node = next(children)
+        parts.append(text)
+        length += len(text)
+        if max_length is not None and length > max_length:
+            break
+        # Then the next sibling of the last node, or of its ancestors
+        while node is None and stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                parts.append(")")
+            else:
+                parts.append(" ")
+            length += 1
+    text = "".join(parts)
+    if max_length is not None and len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
+
+
+def tree_text(tree: ParseTree, max_length: Optional[int] = None) -> str:
+    """Same as tree.getText(), without recursion. With `max_length`, only
+    its first `max_length` characters followed by "..." if it is longer,
+    as string_tree does."""
+    parts: List[str] = []
+    length = 0
+    stack: List[Iterator[ParseTree]] = [iter((tree,))]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+        elif isinstance(node, TerminalNode):
+            text = node.getText()
+            parts.append(text)
+            length += len(text)
+            if max_length is not None and length > max_length:
+                break
+        elif node.children:
+            stack.append(iter(node.children))
+    text = "".join(parts)
+    if max_length is not None and len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
@@ -242,5 +242,11 @@ class ConditionalJump(Instruction):
             else self.op2
         return ConditionalJump(self.cond, op1, op2, self.label)
 
+    def __str__(self):
+        if self.cond.is_zero_test():
+            # The second operand is the register zero
+            return "{} {}, {}".format(self.ins, self.op1, self.label)
+        return super().__str__()
+
     def __hash__(self):
         return hash(super)
@@ -0,0 +1,45 @@
+"""
+This file defines :py:class:`StatementBudget`, which stops the
+evaluation of a program by MiniCInterpretVisitor after a number of
+statements, with a :py:class:`MiniCTimeoutError`.
+
+It is used by MiniCC.py for its `--max-statements` option, e.g. by
+MiniCEvalService.py to give a result for programs which don't
+terminate. As the profiler (Lib/Profiler.py), it replaces the visit
+methods of the statements of one visitor: without the option, the
+interpreter runs unchanged.
+"""
+
+from typing import Any, Callable
+
+from MiniCParser import MiniCParser
+from Lib.Errors import MiniCTimeoutError
+from Lib.Profiler import STATEMENTS
+from Lib.StackVisitor import StackVisitor
+
+
+# The statements, and the bodies of loops: a loop with an empty body
+# executes no statement.
+COUNTED = STATEMENTS + (MiniCParser.Stat_blockContext,)
+
+
+class StatementBudget:
+    """Allow `limit` statements to be executed."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+
+    def watch(self, visitor: StackVisitor) -> None:
+        """Count the statements executed by `visitor`."""
+        for cls in COUNTED:
+            visitor.wrap_visit(cls, self._counted)
+
+    def _counted(self, method: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        def visit(ctx):
+            self.count += 1
+            if self.count > self.limit:
+                raise MiniCTimeoutError(
+                    "Timeout: more than {} statements executed".format(self.limit))
+            return method(ctx)
+        return visit
@@ -13,10 +13,7 @@ vardecl_l: vardecl* #varDeclList;
 vardecl: typee id_l SCOL #varDecl;
 
 
-id_l
-    : ID              #idListBase
-    | ID COM id_l     #idList
-    ;
+id_l: ID (COM ID)* #idList;
 
 block: stat*   #statList;
 
@@ -3,12 +3,14 @@
 Evaluation and code generation labs, main file.
 Usage:
     python3 MiniCC.py --mode <mode> <filename>
+    python3 MiniCC.py --serve [--socket <path>]
     python3 MiniCC.py --help
 """
 
 from __future__ import annotations
 
-from typing import cast
+from typing import List, Optional, Set, cast
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
 from MiniCLexer import MiniCLexer
@@ -16,15 +18,32 @@ from MiniCParser import MiniCParser
 from TP03.MiniCTypingVisitor import MiniCTypingVisitor, MiniCTypeError
 from TP03.MiniCInterpretVisitor import MiniCInterpretVisitor
 from Lib.Errors import (MiniCUnsupportedError, MiniCInternalError,
-                        MiniCRuntimeError, AllocationError)
+                        MiniCRuntimeError, MiniCTimeoutError, AllocationError)
+from Lib.PassManager import PassManager
+from Lib.CompileCache import CompileCache, DEFAULT_SIZE, compiler_modules
+from Lib.DFACache import DFACache
+from Lib.LargeInput import open_input, UnbufferedTokenStream
+from Lib.OutputBuffer import OutputBuffer, DEFAULT_BUFFER_SIZE
+from Lib.Profiler import StatementProfiler
+from Lib.StatementBudget import StatementBudget
 
 import antlr4
-from antlr4.error.ErrorListener import ErrorListener
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ConsoleErrorListener, ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
+from contextlib import nullcontext, redirect_stdout
+from io import StringIO
 from traceback import print_exc
+import ast
+import glob
+import importlib
+import multiprocessing
 import os
 import sys
+import threading
 
 
 class Mode(Enum):
@@ -72,6 +91,96 @@ def valid_modes():
     return modes
 
 
+# Mode of each value of --mode
+MODES = {"parse": Mode.PARSE, "typecheck": Mode.PARSE, "eval": Mode.EVAL,
+         "codegen-linear": Mode.LINEAR, "codegen-cfg": Mode.CFG,
+         "codegen-ssa": Mode.SSA, "codegen-optim": Mode.OPTIM}
+
+
+@dataclass
+class Options:
+    """
+    Options of the compiler, i.e. of main(): the command line options of
+    build_arg_parser, under the same names, except for `mode` (a Mode),
+    `typecheck` (false with --mode parse or --disable-typecheck) and
+    `filenames` (with the glob patterns expanded).
+    """
+
+    mode: Mode
+    filenames: List[str] = field(default_factory=list)
+    typecheck: bool = True
+    debug: bool = False
+    jobs: int = 1
+    # Evaluation and code generation
+    reg_alloc: Optional[str] = None
+    stdout: bool = False
+    output: Optional[str] = None
+    graphs: bool = False
+    ssa_graphs: bool = False
+    dom_graphs: bool = False
+    function_jobs: int = 1
+    fused_typing: bool = False
+    partial_eval: bool = False
+    partial_eval_fuel: Optional[int] = None
+    engine: str = "visitor"
+    output_buffer: int = DEFAULT_BUFFER_SIZE
+    profile: bool = False
+    profile_stacks: Optional[str] = None
+    max_statements: Optional[int] = None
+    # Front end
+    lexer: str = "antlr"
+    large_input: bool = False
+    dfa_cache: Optional[str] = None
+    # Reports and caches
+    time_passes: bool = False
+    stats: bool = False
+    cache: bool = False
+    cache_dir: Optional[str] = None
+    cache_size: int = DEFAULT_SIZE
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> Options:
+        """The options parsed in `args`. The options of the modes which
+        are not available (and not in `args`) keep their default value."""
+        options = cls(MODES[args.mode],
+                      filenames=expand_filenames(args.filename),
+                      typecheck=not args.disable_typecheck and args.mode != "parse")
+        for f in fields(cls):
+            if f.name not in ("mode", "filenames", "typecheck") and hasattr(args, f.name):
+                setattr(options, f.name, getattr(args, f.name))
+        return options
+
+    def counts_statements(self) -> bool:
+        """Whether the evaluation can count the statements it executes, for
+        --profile and --max-statements."""
+        return self.mode == Mode.EVAL and self.engine == "visitor"
+
+    def error(self) -> Optional[str]:
+        """The message of the error if some options can't be used together,
+        None otherwise."""
+        evaluation = self.counts_statements()
+        if self.reg_alloc is None and self.mode.is_codegen():
+            return "the following arguments is required: --reg-alloc"
+        elif self.reg_alloc is not None and not self.mode.is_codegen():
+            return "register allocation is only available in code generation mode"
+        elif self.reg_alloc == "smart" and self.mode == Mode.LINEAR:
+            return "smart register allocation is not compatible with linear code generation"
+        elif self.partial_eval and not self.mode.is_codegen():
+            return "--partial-eval is only available in code generation mode"
+        elif self.partial_eval and (self.fused_typing or not self.typecheck):
+            return "--partial-eval is not available with --fused-typing " \
+                "or --disable-typecheck"
+        elif self.partial_eval_fuel is not None and not self.partial_eval:
+            return "--partial-eval-fuel is only available with --partial-eval"
+        elif (self.profile or self.profile_stacks is not None) and not evaluation:
+            return "--profile is only available with --mode eval --engine=visitor"
+        elif self.max_statements is not None and not evaluation:
+            return "--max-statements is only available with --mode eval --engine=visitor"
+        elif self.output is not None and len(self.filenames) > 1:
+            return "--output is only available with a single source file"
+        return None
+
+
 class CountErrorListener(ErrorListener):
     """Count number of errors.
 
@@ -88,47 +197,327 @@ class CountErrorListener(ErrorListener):
         self.count += 1
 
 
-def main(inputname, reg_alloc, mode,
-         typecheck=True, stdout=False, output_name=None, debug=False,
-         debug_graphs=False, ssa_graphs=False, dom_graphs=False):
+# Recursion limit and stack size (in bytes) of deep_call: enough for
+# programs of about 100000 nested blocks.
+RECURSION_LIMIT = 10 ** 6
+STACK_SIZE = 512 * 1024 * 1024
+
+
+def deep_call(function, *args):
+    """Call `function` with `args` in a thread with a stack of STACK_SIZE
+    bytes and a recursion limit of RECURSION_LIMIT, and return its result.
+    The exception raised by `function`, if any, is raised again here.
+
+    Only for the parser, on inputs nested too deep for the Python stack:
+    the recursion limit is that of the whole process.
+    """
+    result = []
+    error: List[BaseException] = []
+
+    def target():
+        try:
+            result.append(function(*args))
+        except BaseException as e:
+            error.append(e)
+
+    limit = sys.getrecursionlimit()
+    stack_size = threading.stack_size(STACK_SIZE)
+    try:
+        sys.setrecursionlimit(RECURSION_LIMIT)
+        # A daemon thread: an interrupted compiler doesn't wait for it.
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(stack_size)
+        sys.setrecursionlimit(limit)
+    if error:
+        raise error[0]
+    return result[0]
+
+
+class DelayedErrorListener(ErrorListener):
+    """Keep the errors reported to it, to report them to other listeners
+    later, see :py:meth:`replay`."""
+
+    def __init__(self):
+        super().__init__()
+        self.errors: List[tuple] = []
+
+    def syntaxError(self, recognizer, offending_symbol, line, column, msg, e):
+        self.errors.append((recognizer, offending_symbol, line, column, msg, e))
+
+    def replay(self, listener: ErrorListener) -> None:
+        for error in self.errors:
+            listener.syntaxError(*error)
+
+
+def new_parser(input_s, lexer_class, listener: ErrorListener):
+    """A MiniCParser for the character stream `input_s`, tokenized by a
+    `lexer_class`, both reporting their errors to `listener` and to a
+    CountErrorListener, returned with the parser."""
+    counter = CountErrorListener()
+    lexer = lexer_class(input_s)
+    lexer._listeners = [listener, counter]
+    parser = MiniCParser(antlr4.CommonTokenStream(lexer))
+    parser._listeners = [listener, counter]
+    return parser, counter
+
+
+def parse_input(input_s, lexer_class, debug=False):
+    """Parse the program of the character stream `input_s` with parse(),
+    and return the tree, the parser and the CountErrorListener of its
+    lexical and syntax errors.
+
+    The parser generated by ANTLR calls itself for each nested block,
+    parenthesis and unary operator. If the Python stack is not deep
+    enough, the program is parsed again from the start with deep_call:
+    the errors are only reported once the parse is complete, to report
+    them only once.
+    """
+    delayed = DelayedErrorListener()
+    parser, counter = new_parser(input_s, lexer_class, delayed)
+    try:
+        tree = parse(parser, debug)
+    except RecursionError:
+        if debug:
+            print("Nested too deep for the Python stack, parsing again with a deeper one")
+        input_s.reset()
+        parser, counter = new_parser(input_s, lexer_class, ConsoleErrorListener.INSTANCE)
+        return deep_call(parse, parser, debug), parser, counter
+    delayed.replay(ConsoleErrorListener.INSTANCE)
+    return tree, parser, counter
+
+
+def parse(parser, debug=False):
+    """Parse a program with `parser` in two stages.
+
+    The SLL prediction mode is much faster than the default full LL one,
+    and gives the same tree for almost all valid programs. Try it first,
+    silently and giving up at the first error. Only if it fails, parse
+    again with the full LL prediction, which reports the syntax errors
+    to the error listeners of `parser` as usual.
+    """
+    listeners = parser._listeners
+    parser._listeners = []
+    parser._errHandler = BailErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    try:
+        tree = parser.prog()
+        if debug:
+            print("Parsed with SLL prediction")
+        return tree
+    except ParseCancellationException:
+        pass
+    finally:
+        parser._listeners = listeners
+    if debug:
+        print("SLL parsing failed, parsing again with full LL prediction")
+    parser.reset()
+    parser._errHandler = DefaultErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.LL
+    return parser.prog()
+
+
+def check_syntax(input_s, lexer_class) -> bool:
+    """Check that the character stream `input_s`, tokenized by a
+    `lexer_class`, is a valid program.
+
+    This is the first stage of parse(), without the parse tree and with
+    an UnbufferedTokenStream: only a few tokens at a time are kept in
+    memory. Errors are not reported: return False on the first lexical
+    or syntax error. As parse_input, check again with deep_call the
+    programs nested too deep for the Python stack.
+    """
+    counter = CountErrorListener()
+    lexer = lexer_class(input_s)
+    lexer._listeners = [counter]
+    parser = MiniCParser(UnbufferedTokenStream(lexer))
+    parser._listeners = []
+    parser.buildParseTrees = False
+    parser._errHandler = BailErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    try:
+        parser.prog()
+    except ParseCancellationException:
+        return False
+    except RecursionError:
+        input_s.reset()
+        return deep_call(check_syntax, input_s, lexer_class)
+    return counter.count == 0
+
+
+def main(inputname, options: Options, source=None, passes=None, cache=None,
+         profiler=None):
+    """Compile or evaluate `inputname`, with the Options `options`.
+
+    If `source` is given, it is used as the text of the program instead
+    of the content of `inputname`, which then only serves to name the
+    default output file. Passes are run through the PassManager `passes`
+    if given. Generated code is looked up in and added to the
+    CompileCache `cache` if given. The statements evaluated by
+    MiniCInterpretVisitor are measured by the StatementProfiler
+    `profiler` if given.
+
+    Beyond the choice of the mode and register allocation: with
+    `function_jobs` > 1, the backend runs on several functions at once, in
+    as many processes. With `fused_typing`, code generation typechecks
+    the program in the same traversal. With the "fast" `lexer`, the
+    program is tokenized by Lib/FastLexer.py instead of the generated
+    MiniCLexer. With `large_input`, the source file is read through mmap,
+    and tokens are only kept as long as necessary. `engine` is the evaluation engine:
+    "visitor" (MiniCInterpretVisitor), "closure" (MiniCClosureVisitor),
+    "vm" (TP03/MiniCBytecode.py) or "pyast" (MiniCPythonVisitor). The
+    evaluated program prints through an OutputBuffer of `output_buffer`
+    characters, and is limited to `max_statements` if given. With
+    `partial_eval`, code generation first evaluates the program with at
+    most `partial_eval_fuel` statements if given (see
+    TP04/MiniCPartialEvaluation.py). The prediction DFA of the parser is
+    loaded from and saved to the directory `dfa_cache` if given.
+    """
+    mode = options.mode
+    reg_alloc = options.reg_alloc
+    typecheck = options.typecheck
+    debug = options.debug
+    engine = options.engine
+    if passes is None:
+        passes = PassManager()
     (basename, rest) = os.path.splitext(inputname)
+    output_name = options.output
     if mode.is_codegen():
-        if stdout:
+        if options.stdout:
             output_name = None
             print("Code will be generated on standard output")
         elif output_name is None:
             output_name = basename + ".s"
             print("Code will be generated in file " + output_name)
+    header = code_header()
 
-    input_s = antlr4.FileStream(inputname, encoding='utf-8')
-    lexer = MiniCLexer(input_s)
-    counter = CountErrorListener()
-    lexer._listeners.append(counter)
-    stream = antlr4.CommonTokenStream(lexer)
-    parser = MiniCParser(stream)
-    parser._listeners.append(counter)
-    tree = parser.prog()
+    cache_key = ""
+    if cache is not None:
+        if source is None:
+            with open(inputname, encoding='utf-8') as f:
+                source = f.read()
+        cache_key = cache.key(source, mode.name, reg_alloc, typecheck, header)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            with open(output_name, 'w') if output_name else nullcontext(sys.stdout) as output:
+                output.write(cached)
+            return
+
+    if source is not None:
+        input_s = antlr4.InputStream(source)
+    elif options.large_input:
+        input_s = open_input(inputname)
+    else:
+        input_s = antlr4.FileStream(inputname, encoding='utf-8')
+    if options.lexer == 'fast':
+        from Lib.FastLexer import FastLexer
+        lexer_class = FastLexer
+    else:
+        lexer_class = MiniCLexer
+    # Start from the DFA built by the previous runs, and save it back
+    # with the states added by this one.
+    dfa_cache = None
+    if options.dfa_cache is not None:
+        dfa_cache = DFACache(MiniCLexer, MiniCParser, directory=options.dfa_cache)
+        dfa_cache.load()
+    try:
+        if options.large_input and mode == Mode.PARSE and not typecheck:
+            if passes.run("parsing", check_syntax, input_s, lexer_class):
+                if debug:
+                    print("Checked the syntax with SLL prediction, without parse tree")
+                return
+            # Parse again as usual, to report the errors.
+            input_s.reset()
+        tree, parser, counter = passes.run("parsing", parse_input, input_s, lexer_class,
+                                           debug)
+    finally:
+        if dfa_cache is not None:
+            dfa_cache.save()
     if counter.count > 0:
-        exit(3)  # Syntax or lexicography errors occurred, don't try to go further.
-    if typecheck:
+        sys.exit(3)  # Syntax or lexicography errors occurred, don't try to go further.
+    if options.large_input:
+        # Nothing reads the token stream after parsing: drop its buffer,
+        # the tree keeps the tokens it needs.
+        parser.getTokenStream().setTokenSource(None)
+    # Code generation does the typechecking itself.
+    fused_typing = options.fused_typing and typecheck and mode.is_codegen()
+    # Types of the expressions and variables, for evaluation and codegen
+    types = None
+    if typecheck and not fused_typing:
         typing_visitor = MiniCTypingVisitor()
         try:
-            typing_visitor.visit(tree)
+            passes.run("typing", typing_visitor.visit, tree)
         except MiniCTypeError as e:
             print(e.args[0])
-            exit(2)
+            sys.exit(2)
+        types = typing_visitor.get_type_table()
 
     if mode == Mode.EVAL:
         # interpret Visitor
-        interpreter_visitor = MiniCInterpretVisitor()
+        output = OutputBuffer(options.output_buffer)
         try:
-            interpreter_visitor.visit(tree)
+            try:
+                if engine == "pyast":
+                    from TP03.MiniCPythonVisitor import MiniCPythonVisitor, compile_module
+                    module = passes.run("translation to Python",
+                                        MiniCPythonVisitor(types).visit, tree)
+                    code = passes.run("Python compilation", compile_module, module, inputname)
+                    if code is None:
+                        if debug:
+                            print("Python can't compile the translation, using closures instead")
+                        engine = "closure"
+                    elif debug:
+                        try:
+                            print(ast.unparse(module))
+                        except RecursionError:
+                            print("The translation is nested too deep to be printed")
+                if engine == "closure":
+                    from TP03.MiniCClosureVisitor import compile_program
+                    program = passes.run("closure compilation", compile_program,
+                                         tree, types, output)
+                    if program is None:
+                        if debug:
+                            print("The closures would be nested too deep, "
+                                  "using the visitor instead")
+                        engine = "visitor"
+                if engine == "closure":
+                    passes.run("evaluation", program)
+                elif engine == "vm":
+                    from TP03.MiniCBytecodeVisitor import MiniCBytecodeVisitor
+                    from TP03.MiniCBytecode import disassemble, run as run_bytecode
+                    compiler = MiniCBytecodeVisitor(types)
+                    passes.run("bytecode compilation", compiler.visit, tree)
+                    bytecode = compiler.get_bytecode()
+                    if debug:
+                        print(disassemble(bytecode))
+                    passes.run("evaluation", run_bytecode, bytecode, output)
+                elif engine == "pyast":
+                    from TP03.MiniCPythonVisitor import run as run_python
+                    passes.run("evaluation", run_python, code, output)
+                else:
+                    interpreter = MiniCInterpretVisitor(types, output)
+                    if profiler is not None or options.max_statements is not None:
+                        # Count the statements of every iteration of the loops.
+                        interpreter.closed_form = False
+                    if profiler is not None:
+                        profiler.profile(interpreter)
+                    if options.max_statements is not None:
+                        StatementBudget(options.max_statements).watch(interpreter)
+                    passes.run("evaluation", interpreter.visit, tree)
+            finally:
+                # What the program printed comes before its error, if any.
+                output.flush()
         except MiniCRuntimeError as e:
             print(e.args[0])
-            exit(1)
+            sys.exit(1)
         except MiniCInternalError as e:
             print(e.args[0], file=sys.stderr)
-            exit(4)
+            sys.exit(4)
+        except MiniCTimeoutError as e:
+            print(e.args[0])
+            sys.exit(6)
         return
 
     if not mode.is_codegen():
@@ -137,118 +526,310 @@ def main(inputname, reg_alloc, mode,
         return
 
     # Codegen 3@ CFG Visitor, first argument is debug mode
-    from TP04.MiniCCodeGen3AVisitor import MiniCCodeGen3AVisitor  # type: ignore[import]
-    visitor3 = MiniCCodeGen3AVisitor(debug, parser)
+    if fused_typing:
+        from TP04.MiniCTypedCodeGen3AVisitor import (  # type: ignore[import]
+            MiniCTypedCodeGen3AVisitor)
+        visitor3 = MiniCTypedCodeGen3AVisitor(debug, parser)
+        try:
+            passes.run("typing + 3-address codegen", visitor3.visit, tree)
+        except MiniCTypeError as e:
+            print(e.args[0])
+            sys.exit(2)
+    else:
+        from TP04.MiniCCodeGen3AVisitor import MiniCCodeGen3AVisitor  # type: ignore[import]
+        visitor3 = MiniCCodeGen3AVisitor(debug, parser, types)
 
     # dump generated code on stdout or file.
-    with open(output_name, 'w') if output_name else sys.stdout as output:
-        visitor3.visit(tree)
-        for function in visitor3.get_functions():
-            fdata = function.fdata
-            # Allocation part
-            if mode == Mode.LINEAR:
-                code = function
-            else:
-                from TP04.BuildCFG import build_cfg  # type: ignore[import]
-                code = build_cfg(function)
-            if debug_graphs:
-                s = "{}.{}.dot".format(basename, code.fdata.get_name())
-                print("CFG:", s)
+    # Don't let the with statement close sys.stdout: the compile server
+    # keeps on using it after main() returns.
+    with open(output_name, 'w') if output_name else nullcontext(sys.stdout) as output:
+        if not fused_typing:
+            passes.run("3-address codegen", visitor3.visit, tree)
+        if options.partial_eval:
+            from TP04.MiniCPartialEvaluation import partial_evaluation  # type: ignore[import]
+            fuel = [] if options.partial_eval_fuel is None else [options.partial_eval_fuel]
+            result = passes.run("partial evaluation", partial_evaluation,
+                                tree, types, *fuel)
+            if result is not None:
+                visitor3.replace_main(*result)
+        backend_args = (reg_alloc, mode, basename, header,
+                        debug, options.graphs, options.ssa_graphs, options.dom_graphs)
+        if cache is None:
+            write_functions(visitor3, output, backend_args, options.function_jobs,
+                            passes, debug)
+        else:
+            # Generate the code in memory, to cache it once complete.
+            code = StringIO()
+            try:
+                write_functions(visitor3, code, backend_args, options.function_jobs,
+                                passes, debug)
+            finally:
+                output.write(code.getvalue())
+            cache.put(cache_key, code.getvalue())
+
+
+def write_functions(visitor3, output, backend_args, function_jobs, passes, debug):
+    """Run the backend on the functions generated by `visitor3`, with the
+    arguments `backend_args` of backend(), and write their code to
+    `output`."""
+    functions = visitor3.get_functions()
+    if (function_jobs > 1 and len(functions) > 1
+            and "fork" in multiprocessing.get_all_start_methods()):
+        # Functions are independent from each other once the 3-address
+        # code is generated: run their backend in worker processes,
+        # and print the results in the order of the functions.
+        # The workers are forked, to inherit the functions instead of
+        # unpickling them (temporaries and their pool are cyclic).
+        global _backend_functions
+        _backend_functions = functions
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=function_jobs,
+                                 mp_context=multiprocessing.get_context("fork")) as executor:
+            results = executor.map(_backend_captured, range(len(functions)),
+                                   [backend_args] * len(functions),
+                                   [(passes.time_passes, passes.stats)] * len(functions))
+            for out, code_text, error, pass_results, modules in results:
+                sys.stdout.write(out)
+                passes.merge(pass_results)
+                # Import the modules imported by the worker here too: the
+                # CompileCache records them.
+                for module in modules:
+                    importlib.import_module(module)
+                if error is not None:
+                    raise error
+                output.write(code_text)
+                if debug:
+                    visitor3.printSymbolTable()
+    else:
+        for function in functions:
+            backend(function, output, *backend_args, passes=passes)
+            if debug:
+                visitor3.printSymbolTable()
+
+
+def code_header() -> str:
+    """Comments written at the beginning of the code of each function."""
+    header = f"# Code generated by {os.path.realpath(sys.argv[0])}\n"
+    for v in os.environ:
+        if v.startswith("REPLACE_"):
+            header += f"# {v}={os.environ[v]}\n"
+    # These options don't change the generated code: leave them out, so
+    # that the output is the same as without them.
+    options = strip_arguments(sys.argv[1:], build_arg_parser(valid_modes()),
+                              {"jobs", "function_jobs", "cache", "cache_dir", "cache_size",
+                               "dfa_cache"})
+    header += f"# Options: {' '.join(options)}\n"
+    return header
+
+
+def strip_arguments(argv: List[str], parser: ArgumentParser, dests: Set[str]) -> List[str]:
+    """Return the command line arguments `argv` without the arguments that
+    `parser` stores in the attributes `dests`: options with their value,
+    and positional arguments (e.g. "filename"). As `parser` would, long
+    options may be abbreviated and given their value after "=", short ones
+    may be followed by their value, and "--" ends the options."""
+    actions = parser._option_string_actions
+    long_options = [o for o in actions if o.startswith("--")]
+    positional = {a.dest for a in parser._actions if not a.option_strings}
+    kept: List[str] = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+        if arg == "--":
+            # Only positional arguments from here on
+            rest = [] if positional & dests else argv[i:]
+            return kept + (["--"] + rest if rest else [])
+        option, value = arg, None
+        if arg.startswith("--") and "=" in arg:
+            option, value = arg.split("=", 1)
+        elif not arg.startswith("--") and arg[:2] in actions and len(arg) > 2:
+            option, value = arg[:2], arg[2:]
+        action = actions.get(option)
+        if action is None and option.startswith("--"):
+            matches = [o for o in long_options if o.startswith(option)]
+            if len(matches) == 1:
+                action = actions[matches[0]]
+        if action is None:
+            # A positional argument, or an invalid one left to the parser
+            if not (arg.startswith("-") and len(arg) > 1) and positional & dests:
+                continue
+            kept.append(arg)
+            continue
+        args = [arg]
+        if action.nargs != 0 and value is None and i < len(argv) \
+                and not (action.nargs == "?" and argv[i].startswith("-")):
+            args.append(argv[i])
+            i += 1
+        if action.dest not in dests:
+            kept += args
+    return kept
+
+
+def backend(function, output, reg_alloc, mode, basename, header,
+            debug=False, debug_graphs=False, ssa_graphs=False, dom_graphs=False,
+            passes=None):
+    """Run the backend (CFG, SSA, register allocation...) on the 3-address
+    code of one function, and write the resulting code to `output`."""
+    if passes is None:
+        passes = PassManager()
+    fdata = function.fdata
+    passes.set_function(fdata.get_name())
+    # Allocation part
+    if mode == Mode.LINEAR:
+        code = function
+    else:
+        from TP04.BuildCFG import build_cfg  # type: ignore[import]
+        code = passes.run("build_cfg", build_cfg, function)
+    if debug_graphs:
+        s = "{}.{}.dot".format(basename, code.fdata.get_name())
+        print("CFG:", s)
+        code.print_dot(s, view=True)
+    if mode.is_ssa():
+        from Lib.Dominators import computeDom, computeDT, computeDF  # type: ignore[import]
+        from TP05.EnterSSA import insertPhis, rename_variables  # type: ignore[import]
+        from Lib.CFG import CFG  # type: ignore[import]
+        # Same as enter_ssa(), one pass at a time.
+        cfg = cast(CFG, code)
+        dom = passes.run("computeDom", computeDom, cfg)
+        dt = passes.run("computeDT", computeDT, cfg, dom, dom_graphs, basename)
+        df = passes.run("computeDF", computeDF, cfg, dom, dt, dom_graphs, basename)
+        passes.run("insertPhis", insertPhis, cfg, df)
+        passes.run("rename_variables", rename_variables, cfg, dt)
+        passes.count("phis", _count_phis(cfg))
+        if ssa_graphs:
+            s = "{}.{}.enterssa.dot".format(basename, code.fdata.get_name())
+            print("SSA:", s)
+            code.print_dot(s, view=True)
+        if mode == Mode.OPTIM:
+            from TPoptim.OptimSSA import OptimSSA  # type: ignore[import]
+            passes.run("OptimSSA", OptimSSA, cast(CFG, code), debug=debug)
+            passes.count("phis", _count_phis(cast(CFG, code)))
+            if ssa_graphs:
+                s = "{}.{}.optimssa.dot".format(basename, code.fdata.get_name())
+                print("SSA after optim:", s)
                 code.print_dot(s, view=True)
-            if mode.is_ssa():
-                from TP05.EnterSSA import enter_ssa  # type: ignore[import]
+    allocator = None
+    if reg_alloc == "naive":
+        from Lib.Allocator import NaiveAllocator  # type: ignore[import]
+        allocator = NaiveAllocator(fdata)
+        comment = "naive allocation"
+    elif reg_alloc == "all-in-mem":
+        from TP04.AllInMemAllocator import AllInMemAllocator  # type: ignore[import]
+        allocator = AllInMemAllocator(fdata)
+        comment = "all-in-memory allocation"
+    elif reg_alloc == "hybrid":
+        from TP04.HybridNaiveAllocator import HybridNaiveAllocator  # type: ignore[import]
+        allocator = HybridNaiveAllocator(fdata)
+        comment = "hybrid, naive allocation"
+    elif reg_alloc == "smart":
+        liveness = None
+        if mode.is_ssa():
+            from TP05.LivenessSSA import LivenessSSA  # type: ignore[import]
+            try:
                 from Lib.CFG import CFG  # type: ignore[import]
-                enter_ssa(cast(CFG, code), dom_graphs, basename)
-                if ssa_graphs:
-                    s = "{}.{}.enterssa.dot".format(basename, code.fdata.get_name())
-                    print("SSA:", s)
-                    code.print_dot(s, view=True)
-                if mode == Mode.OPTIM:
-                    from TPoptim.OptimSSA import OptimSSA  # type: ignore[import]
-                    OptimSSA(cast(CFG, code), debug=debug)
-                    if ssa_graphs:
-                        s = "{}.{}.optimssa.dot".format(basename, code.fdata.get_name())
-                        print("SSA after optim:", s)
-                        code.print_dot(s, view=True)
-            allocator = None
-            if reg_alloc == "naive":
-                from Lib.Allocator import NaiveAllocator  # type: ignore[import]
-                allocator = NaiveAllocator(fdata)
-                comment = "naive allocation"
-            elif reg_alloc == "all-in-mem":
-                from TP04.AllInMemAllocator import AllInMemAllocator  # type: ignore[import]
-                allocator = AllInMemAllocator(fdata)
-                comment = "all-in-memory allocation"
-            elif reg_alloc == "hybrid":
-                from TP04.HybridNaiveAllocator import HybridNaiveAllocator  # type: ignore[import]
-                allocator = HybridNaiveAllocator(fdata)
-                comment = "hybrid, naive allocation"
-            elif reg_alloc == "smart":
-                liveness = None
-                if mode.is_ssa():
-                    from TP05.LivenessSSA import LivenessSSA  # type: ignore[import]
-                    try:
-                        from Lib.CFG import CFG  # type: ignore[import]
-                        liveness = LivenessSSA(cast(CFG, code), debug=debug)
-                    except NameError:
-                        form = "CFG in SSA form"
-                        raise ValueError("Invalid dataflow form: \
+                liveness = LivenessSSA(cast(CFG, code), debug=debug)
+            except NameError:
+                form = "CFG in SSA form"
+                raise ValueError("Invalid dataflow form: \
 liveness file not found for {}.".format(form))
-                else:
-                    try:
-                        from TP05.LivenessDataFlow import LivenessDataFlow  # type: ignore[import]
-                        liveness = LivenessDataFlow(code, debug=debug)
-                    except NameError:
-                        form = "CFG not in SSA form"
-                        raise ValueError("Invalid dataflow form: \
+        else:
+            try:
+                from TP05.LivenessDataFlow import LivenessDataFlow  # type: ignore[import]
+                liveness = LivenessDataFlow(code, debug=debug)
+            except NameError:
+                form = "CFG not in SSA form"
+                raise ValueError("Invalid dataflow form: \
 liveness file not found for {}.".format(form))
-                from TP05.SmartAllocator import SmartAllocator  # type: ignore[import]
-                allocator = SmartAllocator(fdata, basename, liveness,
-                                           debug, debug_graphs)
-                comment = "smart allocation with graph coloring"
-            elif reg_alloc == "none":
-                comment = "non executable 3-Address instructions"
-            else:
-                raise ValueError("Invalid allocation strategy:" + reg_alloc)
-            if allocator:
-                allocator.prepare()
-            if mode.is_ssa():
-                from Lib.CFG import CFG  # type: ignore[import]
-                from TP05.ExitSSA import exit_ssa  # type: ignore[import]
-                exit_ssa(cast(CFG, code), reg_alloc == 'smart')
-                comment += " with SSA"
-            if allocator:
-                allocator.rewriteCode(code)
-            if mode.is_ssa() and ssa_graphs:
-                s = "{}.{}.exitssa.dot".format(basename, code.fdata.get_name())
-                print("CFG after SSA:", s)
-                code.print_dot(s, view=True)
-            from Lib.LinearCode import LinearCode  # type: ignore[import]
-            output.write(f"# Code generated by {os.path.realpath(sys.argv[0])}\n")
-            for v in os.environ:
-                if v.startswith("REPLACE_"):
-                    output.write(f"# {v}={os.environ[v]}\n")
-            output.write(f"# Options: {' '.join(sys.argv[1:])}\n")
-            if isinstance(code, LinearCode):
-                code.print_code(output, comment=comment)
-            else:
-                from Lib.CFG import CFG  # type: ignore[import]
-                from TP04.LinearizeCFG import linearize  # type: ignore[import]
-                assert (isinstance(code, CFG))
-                code.print_code(output, linearize=linearize, comment=comment)
-            if debug:
-                visitor3.printSymbolTable()
+        from TP05.SmartAllocator import SmartAllocator  # type: ignore[import]
+        allocator = SmartAllocator(fdata, basename, liveness,
+                                   debug, debug_graphs)
+        comment = "smart allocation with graph coloring"
+    elif reg_alloc == "none":
+        comment = "non executable 3-Address instructions"
+    else:
+        raise ValueError("Invalid allocation strategy:" + reg_alloc)
+    passes.count("temporaries", len(fdata._pool.get_all_temps()))
+    if reg_alloc == "smart":
+        # The passes of the smart allocation are run by prepare()
+        def count_edges():
+            igraph = allocator._igraph
+            passes.count("interference edges",
+                         sum(len(n) for n in igraph.graph_dict.values()) // 2)
+        with passes.instrumented(liveness, "run", "liveness"), \
+                passes.instrumented(allocator, "build_interference_graph",
+                                    "interference graph", after=count_edges), \
+                passes.instrumented(allocator, "smart_alloc", "coloring"):
+            allocator.prepare()
+    elif allocator:
+        passes.run("allocation", allocator.prepare)
+    if allocator and passes.stats:
+        from Lib.Operands import Offset  # type: ignore[import]
+        passes.count("spilled temps",
+                     sum(isinstance(t.get_alloced_loc(), Offset)
+                         for t in fdata._pool.get_all_temps()))
+    if mode.is_ssa():
+        from Lib.CFG import CFG  # type: ignore[import]
+        from TP05.ExitSSA import exit_ssa  # type: ignore[import]
+        passes.run("exit_ssa", exit_ssa, cast(CFG, code), reg_alloc == 'smart')
+        comment += " with SSA"
+    if allocator:
+        passes.run("rewriteCode", allocator.rewriteCode, code)
+    if mode.is_ssa() and ssa_graphs:
+        s = "{}.{}.exitssa.dot".format(basename, code.fdata.get_name())
+        print("CFG after SSA:", s)
+        code.print_dot(s, view=True)
+    from Lib.LinearCode import LinearCode  # type: ignore[import]
+    from Lib.Statement import Instruction  # type: ignore[import]
+    output.write(header)
+    if isinstance(code, LinearCode):
+        passes.count("instructions", sum(isinstance(i, Instruction)
+                                         for i in code.get_instructions()))
+        passes.run("emission", code.print_code, output, comment=comment)
+    else:
+        from Lib.CFG import CFG  # type: ignore[import]
+        from TP04.LinearizeCFG import linearize  # type: ignore[import]
+        assert (isinstance(code, CFG))
+        passes.count("blocks", len(code.get_blocks()))
+        passes.count("instructions", sum(len(b.get_all_statements())
+                                         for b in code.get_blocks()))
+        passes.run("emission", code.print_code, output,
+                   linearize=linearize, comment=comment)
 
 
-# command line management
-if __name__ == '__main__':
+def _count_phis(cfg) -> int:
+    return sum(len(b.get_phis()) for b in cfg.get_blocks())
+
 
-    modes = valid_modes()
+# Functions of the program being compiled, inherited by the forked workers.
+_backend_functions: List = []
+
+
+def _backend_captured(index, backend_args, pass_options):
+    """Run backend() on a function in a worker process: return the standard
+    output, the generated code, the exception raised if any (re-raised
+    by main() after printing the output, as the sequential version would
+    do), the results of the pass manager and the compiler modules
+    imported."""
+    out = StringIO()
+    code_text = StringIO()
+    error = None
+    passes = PassManager(*pass_options)
+    with redirect_stdout(out):
+        try:
+            backend(_backend_functions[index], code_text, *backend_args, passes=passes)
+        except Exception as e:
+            error = e
+    return out.getvalue(), code_text.getvalue(), error, passes.results(), compiler_modules()
 
+
+def build_arg_parser(modes: List[str]) -> ArgumentParser:
+    """Build the command line parser, for the given list of valid modes."""
     parser = ArgumentParser(description='CAP/MIF08 MiniCC compiler')
 
-    parser.add_argument('filename', type=str,
-                        help='Source file.')
+    parser.add_argument('filename', type=str, nargs='+',
+                        help='Source file(s). Glob patterns such as tests/**/*.c '
+                        'are expanded.')
     parser.add_argument('--mode', type=str,
                         choices=modes,
                         required=True,
@@ -259,8 +840,53 @@ if __name__ == '__main__':
     parser.add_argument('--disable-typecheck', action='store_true',
                         default=False,
                         help="Don't run the typechecker before evaluation or code generation")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of processes used to handle several source files')
+    parser.add_argument('--lexer', type=str, choices=['antlr', 'fast'],
+                        default='antlr',
+                        help='Lexer to use: the one generated by ANTLR, or a '
+                        'faster hand-written one (default: %(default)s)')
+    parser.add_argument('--dfa-cache', type=str, metavar='DIR',
+                        help='Load the prediction DFA of the parser from DIR, '
+                        'and save it there when it has grown: the next runs '
+                        'parse faster')
+    parser.add_argument('--large-input', action='store_true',
+                        default=False,
+                        help='Save memory on large source files: map the file '
+                        'in memory, and only keep the tokens as long as necessary')
+    parser.add_argument('--engine', type=str,
+                        choices=['visitor', 'closure', 'vm', 'pyast'],
+                        default='visitor',
+                        help='Evaluation engine for --mode eval: visit the parse '
+                        'tree, or compile it first to Python closures, to the '
+                        'bytecode of a register machine or to a Python module '
+                        '(default: %(default)s)')
+    parser.add_argument('--output-buffer', type=int, default=DEFAULT_BUFFER_SIZE,
+                        metavar='SIZE',
+                        help='Characters printed by the program evaluated by '
+                        '--mode eval which are buffered before being written, '
+                        '0 to write each line at once (default: %(default)s)')
+    parser.add_argument('--profile', action='store_true',
+                        default=False,
+                        help='Print the execution count and time of each statement '
+                        'of the program evaluated by --mode eval')
+    parser.add_argument('--profile-stacks', type=str, metavar='FILE',
+                        help='Write the time spent in each stack of statements to '
+                        'FILE, in the collapsed format of flame graph tools '
+                        '(implies --profile)')
+    parser.add_argument('--max-statements', type=int, metavar='N',
+                        help='Stop the program evaluated by --mode eval after N '
+                        'statements (and bodies of loops), with exit code 6')
+    parser.add_argument('--time-passes', action='store_true',
+                        default=False,
+                        help='Print the time spent in each pass, for each function')
+    parser.add_argument('--stats', action='store_true',
+                        default=False,
+                        help='Print statistics on the code of each function '
+                        '(blocks, instructions, temporaries...)')
 
     if "codegen-linear" in modes:
+        from TP04.MiniCPartialEvaluation import DEFAULT_FUEL  # type: ignore[import]
         parser.add_argument('--reg-alloc', type=str,
                             choices=['none', 'naive', 'all-in-mem', 'hybrid', 'smart'],
                             help='Register allocation to perform during code generation')
@@ -268,6 +894,30 @@ if __name__ == '__main__':
                             help='Generate code to stdout')
         parser.add_argument('--output', type=str,
                             help='Generate code to outfile')
+        parser.add_argument('--fused-typing', action='store_true',
+                            default=False,
+                            help='Typecheck during 3-address code generation, '
+                            'in a single traversal of the parse tree')
+        parser.add_argument('--partial-eval', action='store_true',
+                            default=False,
+                            help='Evaluate the program at compile time, and only '
+                            'generate the printing of its output if it terminates')
+        parser.add_argument('--partial-eval-fuel', type=int, metavar='N',
+                            help='Statements evaluated by --partial-eval before '
+                            'giving up (default: {})'.format(DEFAULT_FUEL))
+        parser.add_argument('--function-jobs', type=int, default=1,
+                            help='Number of processes used to run the backend '
+                            'on the functions of a program')
+        parser.add_argument('--cache', action='store_true',
+                            default=False,
+                            help='Look up and store the generated code in the '
+                            'compilation cache')
+        parser.add_argument('--cache-dir', type=str,
+                            help='Directory of the compilation cache '
+                            '(default: $XDG_CACHE_HOME/minicc)')
+        parser.add_argument('--cache-size', type=int, default=DEFAULT_SIZE,
+                            help='Maximal size of the compilation cache, in MiB '
+                            '(default: %(default)s)')
 
     if "codegen-cfg" in modes:
         parser.add_argument('--graphs', action='store_true',
@@ -281,53 +931,125 @@ if __name__ == '__main__':
         parser.add_argument('--dom-graphs', action='store_true',
                             default=False,
                             help='Display dominance-related graphs (DT, DF).')
+    return parser
 
-    args = parser.parse_args()
-    reg_alloc = args.reg_alloc if "codegen-linear" in modes else None
-    to_stdout = args.stdout if "codegen-linear" in modes else False
-    outfile = args.output if "codegen-linear" in modes else None
-    graphs = args.graphs if "codegen-cfg" in modes else False
-    ssa_graphs = args.ssa_graphs if "codegen-ssa" in modes else False
-    dom_graphs = args.dom_graphs if "codegen-ssa" in modes else False
-
-    if reg_alloc is None and "codegen" in args.mode:
-        print("error: the following arguments is required: --reg-alloc")
-        exit(1)
-    elif reg_alloc is not None and "codegen" not in args.mode:
-        print("error: register allocation is only available in code generation mode")
-        exit(1)
-
-    typecheck = not args.disable_typecheck
-
-    if args.mode == "parse":
-        mode = Mode.PARSE
-        typecheck = False
-    elif args.mode == "typecheck":
-        mode = Mode.PARSE
-    elif args.mode == "eval":
-        mode = Mode.EVAL
-    elif args.mode == "codegen-linear":
-        mode = Mode.LINEAR
-        if reg_alloc == "smart":
-            print("error: smart register allocation is not compatible with linear code generation")
-            exit(1)
-    elif args.mode == "codegen-cfg":
-        mode = Mode.CFG
-    elif args.mode == "codegen-ssa":
-        mode = Mode.SSA
-    elif args.mode == "codegen-optim":
-        mode = Mode.OPTIM
-    else:
-        raise ValueError("Invalid mode:" + args.mode)
 
+def run(argv: List[str], source=None) -> int:
+    """Run the compiler with the command line arguments `argv` (without the
+    program name) and return its exit code.
+
+    Errors detected in main() still terminate through sys.exit(), i.e. by
+    raising SystemExit: see MiniCServer.run_captured to get the exit
+    code in all cases.
+    """
+    options = Options.from_args(build_arg_parser(valid_modes()).parse_args(argv))
+    error = options.error()
+    if error is not None:
+        print("error: " + error)
+        return 1
+    if len(options.filenames) > 1:
+        return run_batch(argv, options.filenames, options.jobs)
+
+    passes = PassManager(options.time_passes, options.stats)
+    profiler = None
+    if options.profile or options.profile_stacks is not None:
+        profiler = StatementProfiler()
+    cache = None
+    # Only cache the code written to a file, and not when we want to see
+    # what the compiler does (debug output, graphs, timings).
+    if options.cache and options.mode.is_codegen() and not (
+            options.stdout or options.debug or options.graphs or options.ssa_graphs
+            or options.dom_graphs or passes.enabled):
+        cache = CompileCache(options.cache_dir, options.cache_size)
     try:
-        main(args.filename, reg_alloc, mode,
-             typecheck,
-             to_stdout, outfile, args.debug,
-             graphs, ssa_graphs, dom_graphs)
+        main(options.filenames[0], options, source, passes, cache, profiler)
     except MiniCUnsupportedError as e:
         print(e)
-        exit(5)
+        return 5
     except (MiniCInternalError, AllocationError):
         print_exc()
-        exit(4)
+        return 4
+    finally:
+        passes.report(sys.stderr)
+        if profiler is not None:
+            profiler.report(sys.stderr)
+            if options.profile_stacks is not None:
+                with open(options.profile_stacks, 'w') as f:
+                    profiler.write_stacks(f)
+    return 0
+
+
+EXIT_CODE_NAMES = {0: "ok", 1: "runtime error", 2: "typing error",
+                   3: "syntax error", 4: "internal error", 5: "unsupported",
+                   6: "timeout"}
+
+
+def expand_filenames(patterns: List[str]) -> List[str]:
+    """Expand glob patterns among the source files given on the command
+    line. Patterns matching no file are kept as is, to get the usual error
+    when opening them."""
+    filenames: List[str] = []
+    for pattern in patterns:
+        if any(c in pattern for c in "*?["):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            filenames.extend(matches if matches else [pattern])
+        else:
+            filenames.append(pattern)
+    return filenames
+
+
+def _run_file(argv: List[str], argv0: str):
+    """Compile a single file of a batch, possibly in a worker process."""
+    from MiniCServer import run_captured
+    return run_captured(run, argv, argv0=argv0)
+
+
+def run_batch(argv: List[str], filenames: List[str], jobs: int) -> int:
+    """Handle several source files, distributed over `jobs` processes.
+
+    Each file is compiled with the same options as `argv` (without the
+    source files and -j), exactly as if MiniCC.py was called on it alone.
+    Outputs are printed in the order of the files, followed by the exit
+    code of each file on the standard error. The exit code of the batch
+    is the largest one.
+    """
+    options = strip_arguments(argv, build_arg_parser(valid_modes()), {"jobs", "filename"})
+    argv0 = sys.argv[0]
+    file_argvs = [options + (["--"] if filename.startswith("-") else []) + [filename]
+                  for filename in filenames]
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_run_file, file_argvs,
+                                        [argv0] * len(file_argvs)))
+    else:
+        results = [_run_file(file_argv, argv0) for file_argv in file_argvs]
+    for code, out, err, _ in results:
+        sys.stdout.write(out)
+        sys.stderr.write(err)
+    sys.stdout.flush()
+    for filename, (code, _, _, _) in zip(filenames, results):
+        print("{}: {} ({})".format(filename, code, EXIT_CODE_NAMES.get(code, "error")),
+              file=sys.stderr)
+    return max(code for code, _, _, _ in results)
+
+
+# command line management
+if __name__ == '__main__':
+
+    if "--serve" in sys.argv[1:]:
+        # Long-lived compile server: see MiniCServer.py for the protocol.
+        server_parser = ArgumentParser(description='CAP/MIF08 MiniCC compile server')
+        server_parser.add_argument('--serve', action='store_true', required=True,
+                                   help='Read compilation requests instead of a single file')
+        server_parser.add_argument('--socket', type=str,
+                                   help='Listen on this UNIX socket instead of stdin')
+        server_args = server_parser.parse_args()
+        from MiniCServer import serve_socket, serve_stdio
+        if server_args.socket is not None:
+            serve_socket(run, server_args.socket)
+        else:
+            serve_stdio(run)
+        sys.exit(0)
+
+    sys.exit(run(sys.argv[1:]))
@@ -0,0 +1,243 @@
+#! /usr/bin/env python3
+"""
+MiniC evaluation service, for autograders which evaluate many programs:
+
+    python3 MiniCEvalService.py [--workers N] [--max-statements N] [--socket path]
+
+Running ``MiniCC.py --mode eval`` for each program pays again for the
+interpreter startup, the ANTLR runtime import and the deserialization of
+the parser, which take much longer than evaluating a small program. The
+service evaluates programs in a pool of long-lived worker processes, each
+running MiniCC.py in-process on one program at a time (with a new
+MiniCInterpretVisitor, hence its own memory, and its own output capture:
+see MiniCServer.run_captured). An asyncio front end reads the requests,
+hands them to the workers as they come, and writes each response as soon
+as it is ready: responses may come in a different order than requests.
+
+Requests and responses are JSON objects, one per line, read on the
+standard input and written on the standard output, or on each
+connection to a UNIX socket with `--socket <path>`. A request gives the
+program, by file name and optionally its source text, with optional
+extra arguments of MiniCC.py and statement budget:
+
+    {"id": 1, "file": "foo.c", "source": "int main() { ... }",
+     "options": ["--disable-typecheck"], "max_statements": 100000}
+
+The response gives the codes computed by `evaluate` in test_interpreter.py
+(the exit code of the compiler, and 1 as execution code for a runtime
+error), the standard output and error of the evaluation, interleaved,
+and whether it was stopped after `max_statements` statements (by
+default, the --max-statements of the service, if the evaluation engine
+can count statements):
+
+    {"id": 1, "exitcode": 0, "execcode": 0, "output": "...", "timeout": false}
+
+As with MiniCServer.py, an uncaught exception of the compiler gives the
+exit code 4 and an "error" field, and invalid options only an "error"
+field, e.g. a budget with another engine than --engine=visitor:
+
+    {"id": 1, "error": "Invalid request: --max-statements is only ..."}
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set
+import asyncio
+import json
+import os
+import sys
+
+# Default statement budget of each program
+DEFAULT_MAX_STATEMENTS = 10 ** 7
+
+# Exit code of MiniCC.py when the budget is exhausted
+TIMEOUT_EXIT_CODE = 6
+
+
+def _raise_error(message: str):
+    raise ValueError(message)
+
+
+def request_argv(request: Dict, max_statements: Optional[int]) -> List[str]:
+    """Return the MiniCC.py command line arguments for `request`, with its
+    statement budget, or else `max_statements` if its engine can count
+    statements. Raise ValueError with the message of MiniCC.py if the
+    arguments are invalid: the exit code 1 is then a runtime error only."""
+    # Imported by the workers only: the front end doesn't need ANTLR.
+    from MiniCC import Options, build_arg_parser, valid_modes
+    argv = ["--mode", "eval"] + [str(a) for a in request.get("options", [])]
+    argv.append(request.get("file", "stdin.c"))
+    parser = build_arg_parser(valid_modes())
+    parser.error = _raise_error  # type: ignore[assignment]
+    options = Options.from_args(parser.parse_args(argv))
+    budget = request.get("max_statements")
+    if budget is None and options.counts_statements():
+        budget = max_statements
+    if budget is not None:
+        argv[-1:-1] = ["--max-statements", str(budget)]
+        options.max_statements = budget
+    error = options.error()
+    if error is not None:
+        raise ValueError(error)
+    return argv
+
+
+def evaluate(request: Dict, max_statements: Optional[int]) -> Dict:
+    """Evaluate the program of `request` in this process, and return the
+    response, without its id."""
+    from MiniCC import run
+    from MiniCServer import run_captured
+    try:
+        argv = request_argv(request, max_statements)
+    except ValueError as e:
+        return {"error": "Invalid request: {}".format(e)}
+    exitcode, output, _, error = run_captured(run, argv, request.get("source"),
+                                              merge_stderr=True, argv0="MiniCC.py")
+    execcode = 0
+    if exitcode == 1:
+        # As test_interpreter.py: exit code 1 is a runtime error.
+        exitcode, execcode = 0, 1
+    response = {"exitcode": exitcode, "execcode": execcode, "output": output,
+                "timeout": exitcode == TIMEOUT_EXIT_CODE}
+    if error is not None:
+        response["error"] = error
+    return response
+
+
+def _warm_up() -> None:
+    """Import MiniCC.py in a new worker, before its first request."""
+    import MiniCC  # noqa: F401
+
+
+class EvalService:
+    """
+    Evaluate programs in `workers` processes, with a budget of
+    `max_statements` statements by default. To be used as an async
+    context manager::
+
+        async with EvalService(4) as service:
+            response = await service.evaluate({"file": "foo.c"})
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 max_statements: Optional[int] = DEFAULT_MAX_STATEMENTS):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.max_statements = max_statements
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def __aenter__(self) -> "EvalService":
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_warm_up)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        assert self._executor is not None
+        self._executor.shutdown()
+        self._executor = None
+
+    async def evaluate(self, request: Dict) -> Dict:
+        """The response to `request`."""
+        assert self._executor is not None, "EvalService used outside of async with"
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(self._executor, evaluate,
+                                              request, self.max_statements)
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def handle(self, line: str) -> Dict:
+        """The response to the request line `line`."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+        except ValueError as e:
+            return {"error": "Invalid request: {}".format(e)}
+        return await self.evaluate(request)
+
+
+async def serve_lines(service: EvalService, readline, write) -> None:
+    """Answer the request lines given by `await readline()` until it
+    returns an empty string, with write(response line)."""
+    pending: Set[asyncio.Task] = set()
+
+    async def answer(line: str) -> None:
+        write(json.dumps(await service.handle(line)) + "\n")
+
+    while True:
+        line = await readline()
+        if not line:
+            break
+        if line.strip():
+            task = asyncio.ensure_future(answer(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+
+
+async def serve_stdio(service: EvalService) -> None:
+    """Serve requests read on the standard input until end of file."""
+    loop = asyncio.get_running_loop()
+
+    def write(text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    # Read in a thread: the standard input may be a file, which asyncio
+    # can't watch.
+    await serve_lines(service, lambda: loop.run_in_executor(None, sys.stdin.readline),
+                      write)
+
+
+async def serve_socket(service: EvalService, path: str) -> None:  # pragma: no cover
+    """Serve requests on the UNIX socket `path`, until interrupted. Each
+    connection may send any number of requests."""
+
+    async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def readline() -> str:
+            return (await reader.readline()).decode('utf-8')
+
+        await serve_lines(service, readline,
+                          lambda text: writer.write(text.encode('utf-8')))
+        await writer.drain()
+        writer.close()
+
+    if os.path.exists(path):
+        os.remove(path)
+    server = await asyncio.start_unix_server(connection, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        os.remove(path)
+
+
+async def serve(workers: Optional[int], max_statements: Optional[int],
+                socket: Optional[str]) -> None:
+    async with EvalService(workers, max_statements) as service:
+        if socket is not None:
+            await serve_socket(service, socket)
+        else:
+            await serve_stdio(service)
+
+
+def main() -> int:
+    parser = ArgumentParser(description='CAP/MIF08 MiniC evaluation service')
+    parser.add_argument('--workers', type=int,
+                        help='Worker processes (default: number of CPUs)')
+    parser.add_argument('--max-statements', type=int, default=DEFAULT_MAX_STATEMENTS,
+                        help='Default statement budget of each program, 0 for none '
+                        '(default: %(default)s)')
+    parser.add_argument('--socket', type=str,
+                        help='Listen on this UNIX socket instead of stdin')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.workers, args.max_statements or None, args.socket))
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+MiniCC compile server, started with `python3 MiniCC.py --serve`.
+
+The server is a long-lived process that compiles or evaluates many
+programs, so that each request doesn't pay again for the interpreter
+startup, the ANTLR runtime import and the deserialization of the parser.
+
+Requests and responses are JSON objects, one per line. They are read on
+the standard input (and responses written on the standard output), or
+on each connection to a UNIX socket with `--serve --socket <path>`.
+
+A request gives the command line of MiniCC.py, either directly:
+
+    {"id": 1, "args": ["--mode", "eval", "TP03/tests/provided/examples/test_print.c"]}
+
+or with separate fields, the source text being optional:
+
+    {"id": 2, "file": "foo.c", "source": "int main() { ... }",
+     "mode": "codegen-cfg", "reg_alloc": "naive", "output": "foo.s"}
+
+Other accepted fields are "stdout" (bool, for --stdout), "options" (list
+of extra arguments such as "--disable-typecheck") and "merge_stderr"
+(bool, to capture the standard error in "stdout", interleaved as with
+2>&1). The response gives the exit code, standard output and standard
+error of the request, as the command line would have:
+
+    {"id": 1, "exitcode": 0, "stdout": "...", "stderr": ""}
+
+If the compiler raises an uncaught exception, the exit code is 4
+(internal error), the traceback is in "stderr" and the response has an
+"error" field: the type and message of the exception. A request which
+is not a JSON object with a valid command line only gets an "error".
+
+Requests are handled one after another: the standard output and error
+are process-wide, so they can't be captured for two requests at once.
+"""
+
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from traceback import print_exc
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import socketserver
+import sys
+
+
+RunFunction = Callable[..., int]
+
+
+def request_argv(request: Dict) -> List[str]:
+    """Return the MiniCC.py command line arguments for `request`."""
+    if "args" in request:
+        return [str(a) for a in request["args"]]
+    argv: List[str] = []
+    if "mode" in request:
+        argv += ["--mode", request["mode"]]
+    if request.get("reg_alloc") is not None:
+        argv += ["--reg-alloc", request["reg_alloc"]]
+    if request.get("output") is not None:
+        argv += ["--output", request["output"]]
+    if request.get("stdout"):
+        argv += ["--stdout"]
+    argv += [str(a) for a in request.get("options", [])]
+    argv += [request.get("file", "stdin.c")]
+    return argv
+
+
+# Exit code of MiniCC.py for an internal error
+INTERNAL_ERROR = 4
+
+
+def run_captured(run: RunFunction, argv: List[str], source=None,
+                 merge_stderr=False, argv0=None) -> Tuple[int, str, str, Optional[str]]:
+    """Call run(argv, source) as if it was the whole process: return its
+    exit code, standard output and standard error, and the type and
+    message of the uncaught exception it raised, if any (the exit code is
+    then INTERNAL_ERROR).
+
+    `argv0` is the program name seen by run() in sys.argv[0] (MiniCC.py
+    writes it in the header of the generated code).
+    """
+    out = StringIO()
+    err = out if merge_stderr else StringIO()
+    error = None
+    saved_argv = sys.argv
+    sys.argv = [argv0 if argv0 is not None else saved_argv[0]] + argv
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                code = run(argv, source)
+            except SystemExit as e:
+                # exit() from main(), or argparse on invalid arguments
+                if e.code is None:
+                    code = 0
+                elif isinstance(e.code, int):
+                    code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except Exception as e:
+                # A bug of the compiler, as MiniCInternalError: print the
+                # traceback as the command line version, but keep the
+                # server running.
+                print_exc()
+                code = INTERNAL_ERROR
+                error = "{}: {}".format(type(e).__name__, e)
+    finally:
+        sys.argv = saved_argv
+    return code, out.getvalue(), "" if merge_stderr else err.getvalue(), error
+
+
+def handle_request(run: RunFunction, line: str, argv0: str) -> Dict:
+    """Handle one request line and return the response object."""
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("a request must be a JSON object")
+        argv = request_argv(request)
+    except ValueError as e:
+        return {"error": "Invalid request: {}".format(e)}
+    code, out, err, error = run_captured(run, argv, request.get("source"),
+                                         bool(request.get("merge_stderr")), argv0)
+    response: Dict = {"exitcode": code, "stdout": out, "stderr": err}
+    if error is not None:
+        response["error"] = error
+    if "id" in request:
+        response["id"] = request["id"]
+    return response
+
+
+def serve_stdio(run: RunFunction) -> None:
+    """Serve requests read on the standard input until end of file."""
+    argv0 = sys.argv[0]
+    output = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = handle_request(run, line, argv0)
+        output.write(json.dumps(response) + "\n")
+        output.flush()
+
+
+def serve_socket(run: RunFunction, path: str) -> None:  # pragma: no cover
+    """Serve requests on the UNIX socket `path`, until interrupted.
+    Each connection may send any number of requests."""
+    argv0 = sys.argv[0]
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode('utf-8')
+                if not line.strip():
+                    continue
+                response = handle_request(run, line, argv0)
+                self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+                self.wfile.flush()
+
+    if os.path.exists(path):
+        os.remove(path)
+    # Not a ThreadingUnixStreamServer: requests must not run concurrently.
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(path)
@@ -0,0 +1,259 @@
+"""
+Closed-form evaluation of counted loops, for MiniCInterpretVisitor.
+
+A loop whose body only assigns affine expressions to int variables,
+e.g.::
+
+    for (i = 0; i < n; i = i + 1) { s = s + 2 * i + k; }
+
+computes an affine recurrence: an iteration maps the vector v of the
+assigned variables (and a last component 1, for constants) to M v,
+where M is an integer matrix, so that t iterations give M^t v, computed
+with O(log t) products. The number t of iterations follows from the
+condition, which compares the counter, incremented by the same step at
+each iteration, to a bound which the loop doesn't change.
+
+:py:func:`affine_loop` analyses a loop once, and :py:meth:`AffineLoop.run`
+evaluates it from the current memory. The integers of the interpreter
+are the ones of Python, without overflow: the result is exact. Loops
+whose values grow beyond MAX_BITS bits, e.g. with `s = s * 2`, are left
+to the interpreter: the products of their matrices would be more and
+more costly.
+"""
+
+from typing import Dict, List, Optional
+
+from antlr4.ParserRuleContext import ParserRuleContext
+
+from MiniCParser import MiniCParser
+from TP03.MiniCTypingVisitor import BaseType, TypeTable
+from Lib.StackVisitor import StackVisitor, Visit
+
+# An affine form sum(coef * variable) + constant: the coefficient of each
+# slot of variable, and the constant at key ONE.
+Affine = Dict[int, int]
+ONE = -1
+
+# Bits of the values of the vector and matrix beyond which
+# AffineLoop.run gives up
+MAX_BITS = 1024
+
+
+class NotAffine(Exception):
+    pass
+
+
+def _add(lhs: Affine, rhs: Affine) -> Affine:
+    result = dict(lhs)
+    for key, coef in rhs.items():
+        coef += result.get(key, 0)
+        if coef:
+            result[key] = coef
+        else:
+            result.pop(key, None)
+    return result
+
+
+def _scale(form: Affine, factor: int) -> Affine:
+    if factor == 0:
+        return {}
+    return {key: factor * coef for key, coef in form.items()}
+
+
+def _substitute(form: Affine, forms: Dict[int, Affine]) -> Affine:
+    """`form`, where the variables of `forms` are replaced by their form."""
+    result: Affine = {}
+    for key, coef in form.items():
+        result = _add(result, _scale(forms.get(key, {key: 1}), coef))
+    return result
+
+
+def _too_large(values: List[int]) -> bool:
+    return any(value.bit_length() > MAX_BITS for value in values)
+
+
+def _value(form: Affine, memory: List) -> int:
+    return sum(coef * (memory[key] if key != ONE else 1)
+               for key, coef in form.items())
+
+
+class AffineVisitor(StackVisitor):
+    """Affine form of an int expression, or NotAffine."""
+
+    def __init__(self, types: TypeTable):
+        super().__init__()
+        self._type_table = types
+
+    def visitChildren(self, node):
+        # Any expression without a visit method below
+        raise NotAffine()
+
+    def visitParExpr(self, ctx) -> Affine:
+        return self.dispatch(ctx.expr())
+
+    def visitAtomExpr(self, ctx) -> Affine:
+        return self.dispatch(ctx.atom())
+
+    def visitIntAtom(self, ctx) -> Affine:
+        return _add({}, {ONE: int(ctx.getText())})
+
+    def visitIdAtom(self, ctx) -> Affine:
+        vtype, slot = self._type_table.variables[ctx.ID().getText()]
+        if vtype != BaseType.Integer:
+            raise NotAffine()
+        return {slot: 1}
+
+    def visitAdditiveExpr(self, ctx) -> Visit[Affine]:
+        assert ctx.myop is not None
+        lhs = yield ctx.expr(0)
+        rhs = yield ctx.expr(1)
+        if ctx.myop.type == MiniCParser.MINUS:
+            rhs = _scale(rhs, -1)
+        return _add(lhs, rhs)
+
+    def visitMultiplicativeExpr(self, ctx) -> Visit[Affine]:
+        assert ctx.myop is not None
+        if ctx.myop.type != MiniCParser.MULT:
+            raise NotAffine()
+        lhs = yield ctx.expr(0)
+        rhs = yield ctx.expr(1)
+        if set(lhs) <= {ONE}:
+            return _scale(rhs, lhs.get(ONE, 0))
+        elif set(rhs) <= {ONE}:
+            return _scale(lhs, rhs.get(ONE, 0))
+        raise NotAffine()
+
+    def visitUnaryMinusExpr(self, ctx) -> Visit[Affine]:
+        return _scale((yield ctx.expr()), -1)
+
+
+def _assignments(stats: List[ParserRuleContext]) -> List[ParserRuleContext]:
+    """The assignments of the statements `stats`, in order, or NotAffine
+    if they are not all assignments."""
+    result = []
+    todo = [stat for stat in reversed(stats) if stat is not None]
+    while todo:
+        node = todo.pop()
+        if isinstance(node, MiniCParser.AssignStatContext):
+            result.append(node)
+        elif isinstance(node, (MiniCParser.StatListContext, MiniCParser.StatContext,
+                               MiniCParser.Stat_blockContext)):
+            todo.extend(child for child in reversed(node.children or [])
+                        if isinstance(child, ParserRuleContext))
+        else:
+            raise NotAffine()
+    return result
+
+
+class AffineLoop:
+    """
+    Loop whose iteration assigns its form in `iteration` to each slot of
+    variable, while `counter` is less than `bound` (or greater than, with
+    `decreasing`), `counter` being incremented by `step` at each
+    iteration.
+    """
+
+    def __init__(self, iteration: Dict[int, Affine], counter: int,
+                 step: Affine, bound: Affine, decreasing: bool):
+        self.iteration = iteration
+        self.counter = counter
+        self.step = step
+        self.bound = bound
+        self.decreasing = decreasing
+
+    def trips(self, memory: List) -> Optional[int]:
+        """Number of iterations from `memory`, None if infinite."""
+        start = memory[self.counter]
+        step = _value(self.step, memory)
+        bound = _value(self.bound, memory)
+        if self.decreasing:
+            start, step, bound = -start, -step, -bound
+        if start >= bound:
+            return 0
+        elif step <= 0:
+            return None
+        return (bound - start + step - 1) // step
+
+    def run(self, memory: List) -> bool:
+        """Evaluate the loop on `memory`. Return False, without changing
+        anything, if it doesn't terminate or if its values grow beyond
+        MAX_BITS bits: it is then left to the interpreter."""
+        trips = self.trips(memory)
+        if trips is None:
+            return False
+        slots = list(self.iteration)
+        index = {slot: i for i, slot in enumerate(slots)}
+        size = len(slots) + 1
+        matrix = []
+        for slot in slots:
+            row = [0] * size
+            for key, coef in self.iteration[slot].items():
+                if key in index:
+                    row[index[key]] = coef
+                else:  # A constant, or a variable which the loop doesn't change
+                    row[-1] += coef * (memory[key] if key != ONE else 1)
+            matrix.append(row)
+        matrix.append([0] * (size - 1) + [1])
+        vector = [memory[slot] for slot in slots] + [1]
+        while trips:
+            if trips & 1:
+                vector = [sum(a * b for a, b in zip(row, vector)) for row in matrix]
+                if _too_large(vector):
+                    return False
+            trips >>= 1
+            if trips:
+                columns = list(zip(*matrix))
+                matrix = [[sum(a * b for a, b in zip(row, column)) for column in columns]
+                          for row in matrix]
+                if any(_too_large(row) for row in matrix):
+                    return False
+        for slot, value in zip(slots, vector):
+            memory[slot] = value
+        return True
+
+
+def affine_loop(ctx, types: TypeTable) -> Optional[AffineLoop]:
+    """The AffineLoop of the ForStat or WhileStat `ctx`, None if it is not
+    one."""
+    if isinstance(ctx, MiniCParser.ForStatContext):
+        cond, stats = ctx.cond, [ctx.body, ctx.inc]
+    else:
+        cond, stats = ctx.expr(), [ctx.stat_block()]
+    while isinstance(cond, MiniCParser.AtomExprContext) \
+            and isinstance(cond.atom(), MiniCParser.ParExprContext):
+        cond = cond.atom().expr()
+    if not isinstance(cond, MiniCParser.RelationalExprContext):
+        return None
+    visitor = AffineVisitor(types)
+    iteration: Dict[int, Affine] = {}
+    try:
+        for assign in _assignments(stats):
+            vtype, slot = types.variables[assign.ID().getText()]
+            if vtype != BaseType.Integer:
+                return None
+            iteration[slot] = _substitute(visitor.visit(assign.expr()), iteration)
+        # The condition is lhs - rhs < 0 (or <=, >, >=).
+        diff = _add(visitor.visit(cond.expr(0)), _scale(visitor.visit(cond.expr(1)), -1))
+    except NotAffine:
+        return None
+    counters = [key for key in diff if key in iteration]
+    if len(counters) != 1 or diff[counters[0]] not in (1, -1):
+        return None
+    counter = counters[0]
+    step = dict(iteration[counter])
+    if step.pop(counter, None) != 1 or any(key in iteration for key in step):
+        return None
+    # counter op bound, with op of the condition if the coefficient of
+    # counter in diff is 1, the opposite otherwise.
+    optype = cond.myop.type
+    if diff[counter] == -1:
+        optype = {MiniCParser.LT: MiniCParser.GT, MiniCParser.LTEQ: MiniCParser.GTEQ,
+                  MiniCParser.GT: MiniCParser.LT, MiniCParser.GTEQ: MiniCParser.LTEQ}[optype]
+    bound = _scale(diff, -diff[counter])
+    del bound[counter]
+    if optype == MiniCParser.LTEQ:
+        bound = _add(bound, {ONE: 1})  # counter < bound + 1
+    elif optype == MiniCParser.GTEQ:
+        bound = _add(bound, {ONE: -1})  # counter > bound - 1
+    decreasing = optype in (MiniCParser.GT, MiniCParser.GTEQ)
+    return AffineLoop(iteration, counter, step, bound, decreasing)
@@ -0,0 +1,209 @@
+"""
+Bytecode of the register machine of ``--mode eval --engine=vm``, and the
+machine itself.
+
+MiniCBytecodeVisitor compiles a program to a :py:class:`Bytecode`, whose
+instructions are packed in an array('q'), four words each: an opcode and
+three operands. Most operands are registers:
+
+- registers 0, 1... are the variables, then the temporaries,
+- registers -1, -2... hold the constant pool: the machine puts it at the
+  end of its list of registers, so that a constant is an operand like
+  any other, and needs no instruction to be loaded.
+
+:py:func:`run` executes a Bytecode, and :py:func:`disassemble` gives
+its text, which MiniCC.py prints with ``--debug``.
+"""
+
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import operator
+
+from Lib.Errors import MiniCRuntimeError
+from Lib.OutputBuffer import OutputBuffer
+from TP03.MiniCClosureVisitor import (
+    int_div, float_div, untyped_div, mod, untyped_add)
+from TP03.MiniCRope import concat
+
+
+# Binary operators: "OP dst, lhs, rhs" computes dst = lhs OP rhs, and
+# "JUMP_UNLESS_OP lhs, rhs, target" jumps to target unless lhs OP rhs.
+BINARY_OPS: List[Tuple[str, Callable[[Any, Any], Any]]] = [
+    ("OR", operator.or_),
+    ("AND", operator.and_),
+    ("EQ", operator.eq),
+    ("NE", operator.ne),
+    ("LT", operator.lt),
+    ("LE", operator.le),
+    ("GT", operator.gt),
+    ("GE", operator.ge),
+    ("ADD", operator.add),
+    ("SUB", operator.sub),
+    ("MUL", operator.mul),
+    ("IDIV", int_div),
+    ("FDIV", float_div),
+    ("MOD", mod),
+    ("UADD", untyped_add),
+    ("UDIV", untyped_div),
+    ("CONCAT", concat),
+]
+
+# Opcode of each binary operator, then of the jump unless it holds.
+BINARY: Dict[str, int] = {name: op for op, (name, _) in enumerate(BINARY_OPS)}
+JUMP_UNLESS = len(BINARY_OPS)
+
+# The other instructions, with the kind of their operands: register (r)
+# or jump target (l).
+OTHER_OPS: List[Tuple[str, str]] = [
+    ("MOVE", "rr"),  # dst, src
+    ("NOT", "rr"),  # dst, src
+    ("NEG", "rr"),  # dst, src
+    ("JUMP", "l"),  # target
+    ("JUMP_IF_FALSE", "rl"),  # src, target
+    ("PRINT", "r"),  # src
+    ("PRINT_FLOAT", "r"),  # src, always a float
+    ("PRINT_UFLOAT", "r"),  # src, untyped
+    ("PRINT_BOOL", "r"),  # src
+    ("LOAD_CHECKED", "rrr"),  # dst, src, name: src must be set
+    ("FAIL", "r"),  # message
+    ("HALT", ""),
+]
+(MOVE, NOT, NEG, JUMP, JUMP_IF_FALSE, PRINT, PRINT_FLOAT, PRINT_UFLOAT,
+ PRINT_BOOL, LOAD_CHECKED, FAIL, HALT) = range(2 * JUMP_UNLESS,
+                                               2 * JUMP_UNLESS + len(OTHER_OPS))
+
+# Name and kind of operands of each opcode
+OPCODES: List[Tuple[str, str]] = \
+    [(name, "rrr") for name, _ in BINARY_OPS] + \
+    [("JUMP_UNLESS_" + name, "rrl") for name, _ in BINARY_OPS] + \
+    OTHER_OPS
+
+
+class Unset:
+    """Value of a variable which was not declared, before it is
+    assigned (only without typechecking)."""
+
+    def __repr__(self):
+        return "<unset>"
+
+
+UNSET = Unset()
+
+
+class Bytecode:
+    """
+    Compiled program: `code` holds the instructions, `pool[k]` is the
+    value of register -k-1 (a constant, or an undeclared variable), and
+    registers 0 to `nregs` - 1 are the `nvars` variables then the
+    temporaries. `names` gives the name of the registers of variables.
+    """
+
+    code: array
+    pool: List[Any]
+    nvars: int
+    nregs: int
+    names: Dict[int, str]
+
+    def __init__(self, code: array, pool: List[Any], nvars: int, nregs: int,
+                 names: Dict[int, str]):
+        self.code = code
+        self.pool = pool
+        self.nvars = nvars
+        self.nregs = nregs
+        self.names = names
+
+    def registers(self) -> List[Any]:
+        """The initial registers of the machine."""
+        return [None] * self.nregs + self.pool[::-1]
+
+    def register_text(self, reg: int) -> str:
+        if reg in self.names:
+            return self.names[reg]
+        elif reg < 0:
+            return repr(self.pool[-reg - 1])
+        return "t{}".format(reg - self.nvars)
+
+
+def disassemble(bytecode: Bytecode) -> str:
+    """The instructions of `bytecode`, one per line, after their
+    offset in the code."""
+    code = bytecode.code
+    lines = []
+    for pc in range(0, len(code), 4):
+        name, kinds = OPCODES[code[pc]]
+        operands = []
+        for i, kind in enumerate(kinds):
+            operand = code[pc + 1 + i]
+            if kind == "r":
+                operands.append(bytecode.register_text(operand))
+            else:
+                operands.append("@{}".format(operand))
+        lines.append("{:6d}  {:<16} {}".format(pc, name, ", ".join(operands)).rstrip())
+    return "\n".join(lines)
+
+
+def run(bytecode: Bytecode, output: Optional[OutputBuffer] = None) -> None:
+    """Execute `bytecode`, with the output and runtime errors of
+    MiniCInterpretVisitor. Lines are printed to `output`, by default as
+    soon as printed."""
+    println = (output if output is not None else OutputBuffer()).println
+    code = bytecode.code
+    regs = bytecode.registers()
+    funcs = [f for _, f in BINARY_OPS]
+    jump_unless = JUMP_UNLESS
+    others = 2 * JUMP_UNLESS
+    pc = 0
+    while True:
+        op = code[pc]
+        if op < jump_unless:
+            regs[code[pc + 1]] = funcs[op](regs[code[pc + 2]], regs[code[pc + 3]])
+            pc += 4
+        elif op < others:
+            if funcs[op - jump_unless](regs[code[pc + 1]], regs[code[pc + 2]]):
+                pc += 4
+            else:
+                pc = code[pc + 3]
+        elif op == MOVE:
+            regs[code[pc + 1]] = regs[code[pc + 2]]
+            pc += 4
+        elif op == JUMP:
+            pc = code[pc + 1]
+        elif op == JUMP_IF_FALSE:
+            if regs[code[pc + 1]]:
+                pc += 4
+            else:
+                pc = code[pc + 2]
+        elif op == NOT:
+            regs[code[pc + 1]] = not regs[code[pc + 2]]
+            pc += 4
+        elif op == NEG:
+            regs[code[pc + 1]] = -regs[code[pc + 2]]
+            pc += 4
+        elif op == PRINT:
+            println(regs[code[pc + 1]])
+            pc += 4
+        elif op == PRINT_FLOAT:
+            println(f"{regs[code[pc + 1]]:.2f}")
+            pc += 4
+        elif op == PRINT_UFLOAT:
+            val = regs[code[pc + 1]]
+            if isinstance(val, float):
+                val = f"{val:.2f}"
+            println(val)
+            pc += 4
+        elif op == PRINT_BOOL:
+            println('1' if regs[code[pc + 1]] else '0')
+            pc += 4
+        elif op == LOAD_CHECKED:
+            val = regs[code[pc + 2]]
+            if val is UNSET:
+                # As MiniCInterpretVisitor, which doesn't find it in its memory
+                raise KeyError(regs[code[pc + 3]])
+            regs[code[pc + 1]] = val
+            pc += 4
+        elif op == FAIL:
+            raise MiniCRuntimeError(regs[code[pc + 1]])
+        elif op == HALT:
+            return
+        else:  # pragma: no cover
+            raise MiniCRuntimeError("Unknown opcode {} at {}".format(op, pc))
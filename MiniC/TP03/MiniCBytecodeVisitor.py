@@ -0,0 +1,307 @@
+# Visitor to *compile* MiniC files to the bytecode of TP03/MiniCBytecode.py
+from array import array
+from typing import Any, Dict, List, Optional, Set, Tuple
+from MiniCParser import MiniCParser
+from TP03.MiniCTypingVisitor import BaseType, TypeTable
+from TP03.MiniCInterpretVisitor import INITIAL_VALUES
+from TP03.MiniCClosureVisitor import DECLARED_TYPES
+from TP03 import MiniCBytecode as B
+from Lib.Errors import MiniCInternalError
+from Lib.StackVisitor import StackVisitor, Visit
+
+"""
+Compilation of the parse tree to a Bytecode, for ``--engine=vm``.
+
+Expressions are visited to the register holding their value: the
+register of a variable, of a constant, or a temporary computed by the
+instructions emitted by the visit. Temporaries are only live within a
+statement, and reused from one statement to the next.
+"""
+
+# Opcode of the operators which don't depend on types
+OPERATORS = {
+    MiniCParser.EQ: B.BINARY["EQ"],
+    MiniCParser.NEQ: B.BINARY["NE"],
+    MiniCParser.LT: B.BINARY["LT"],
+    MiniCParser.LTEQ: B.BINARY["LE"],
+    MiniCParser.GT: B.BINARY["GT"],
+    MiniCParser.GTEQ: B.BINARY["GE"],
+    MiniCParser.MINUS: B.BINARY["SUB"],
+    MiniCParser.MULT: B.BINARY["MUL"],
+    MiniCParser.MOD: B.BINARY["MOD"],
+}
+
+
+class MiniCBytecodeVisitor(StackVisitor):
+
+    _code: array
+    _pool: List[Any]
+    _constants: Dict[Tuple[type, Any], int]
+    _slots: Dict[str, int]
+    _undeclared: Set[str]
+
+    def __init__(self, types: Optional[TypeTable] = None):
+        """`types` is the table of MiniCTypingVisitor, None if the program
+        was not typechecked: the values are then checked at runtime."""
+        super().__init__()
+        self._type_table = types
+        self._code = array('q')
+        self._pool = []  # Register -k-1 is self._pool[k]
+        self._constants = dict()  # (type, value) -> register
+        self._slots = dict()  # variable -> register
+        self._undeclared = set()
+        self._nvars = 0
+        self._next_temp = 0
+        self._max_temp = 0
+
+    def get_bytecode(self) -> B.Bytecode:
+        names = {reg: var for var, reg in self._slots.items()}
+        return B.Bytecode(self._code, self._pool, self._nvars, self._max_temp, names)
+
+    def _emit(self, op: int, x: int = 0, y: int = 0, z: int = 0) -> int:
+        """Add an instruction, and return its offset."""
+        pc = len(self._code)
+        self._code.extend((op, x, y, z))
+        return pc
+
+    def _constant(self, value) -> int:
+        # 1, 1.0 and true are equal keys of a dictionary.
+        key = (type(value), value)
+        reg = self._constants.get(key)
+        if reg is None:
+            self._pool.append(value)
+            reg = self._constants[key] = -len(self._pool)
+        return reg
+
+    def _temp(self) -> int:
+        reg = self._next_temp
+        self._next_temp += 1
+        self._max_temp = max(self._max_temp, self._next_temp)
+        return reg
+
+    def _variable(self, var: str) -> int:
+        reg = self._slots.get(var)
+        if reg is None:
+            # Not declared in main, hence not typechecked: found in the
+            # pool, unset until assigned.
+            self._pool.append(B.UNSET)
+            reg = self._slots[var] = -len(self._pool)
+            self._undeclared.add(var)
+        return reg
+
+    def _opcode(self, ctx) -> int:
+        if isinstance(ctx, MiniCParser.OrExprContext):
+            return B.BINARY["OR"]
+        elif isinstance(ctx, MiniCParser.AndExprContext):
+            return B.BINARY["AND"]
+        assert ctx.myop is not None
+        optype = ctx.myop.type
+        if optype == MiniCParser.DIV:
+            if self._type_table is None:
+                return B.BINARY["UDIV"]
+            elif self._type_table.expressions[ctx] == BaseType.Integer:
+                return B.BINARY["IDIV"]
+            return B.BINARY["FDIV"]
+        elif optype == MiniCParser.PLUS:
+            if self._type_table is None:
+                return B.BINARY["UADD"]
+            elif self._type_table.expressions[ctx] == BaseType.String:
+                return B.BINARY["CONCAT"]
+            return B.BINARY["ADD"]
+        try:
+            return OPERATORS[optype]
+        except KeyError:
+            raise MiniCInternalError(
+                f"Unknown operator '{ctx.myop}'")
+
+    # TOPLEVEL
+    def visitProgRule(self, ctx) -> Visit[None]:
+        # Variables: their slot in the typing table, which has them all,
+        # or in the order of declaration in main.
+        if self._type_table is not None:
+            for var, (_, slot) in self._type_table.variables.items():
+                self._slots[var] = slot
+        else:
+            for function in ctx.function():
+                if function.ID().getText() == "main":
+                    for decl in function.vardecl_l().vardecl():
+                        for id in decl.id_l().ID():
+                            self._slots.setdefault(id.getText(), len(self._slots))
+        self._nvars = self._next_temp = self._max_temp = len(self._slots)
+        has_main = False
+        for function in ctx.function():
+            if function.ID().getText() == "main":
+                has_main = True
+                yield function
+            else:
+                self._emit(B.FAIL, self._constant(
+                    "Functions are not supported in evaluation mode"))
+        if not has_main:
+            # A program without a main function is compilable (hence
+            # it's not a typing error per se), but not executable,
+            # hence we consider it a runtime error.
+            self._emit(B.FAIL, self._constant("No main function in file"))
+        self._emit(B.HALT)
+
+    def visitFuncDef(self, ctx) -> Visit[None]:
+        yield ctx.vardecl_l()
+        yield ctx.block()
+
+    # variable declarations
+
+    def visitVarDecl(self, ctx) -> Visit[None]:
+        for var in (yield ctx.id_l()):
+            if self._type_table is not None:
+                vtype = self._type_table.variables[var][0]
+            else:
+                vtype = DECLARED_TYPES[ctx.typee().mytype.type]
+            self._emit(B.MOVE, self._slots[var], self._constant(INITIAL_VALUES[vtype]))
+
+    def visitIdList(self, ctx) -> List[str]:
+        return [id.getText() for id in ctx.ID()]
+
+    # atoms --> register
+
+    def visitParExpr(self, ctx) -> int:
+        return self.dispatch(ctx.expr())
+
+    def visitIntAtom(self, ctx) -> int:
+        return self._constant(int(ctx.getText()))
+
+    def visitFloatAtom(self, ctx) -> int:
+        return self._constant(float(ctx.getText()))
+
+    def visitBooleanAtom(self, ctx) -> int:
+        return self._constant(ctx.getText() == "true")
+
+    def visitIdAtom(self, ctx) -> int:
+        var = ctx.ID().getText()
+        reg = self._variable(var)
+        if var not in self._undeclared:
+            return reg
+        dest = self._temp()
+        self._emit(B.LOAD_CHECKED, dest, reg, self._constant(var))
+        return dest
+
+    def visitStringAtom(self, ctx) -> int:
+        return self._constant(ctx.getText()[1:-1])  # Remove the ""
+
+    # expressions
+
+    # No visitAtomExpr: the default visit method gives the result of the
+    # only child, the atom, without a generator.
+
+    def _visitBinary(self, ctx) -> Visit[int]:
+        mark = self._next_temp
+        lhs = yield ctx.expr(0)
+        rhs = yield ctx.expr(1)
+        # The temporaries of the operands are dead.
+        self._next_temp = mark
+        dest = self._temp()
+        self._emit(self._opcode(ctx), dest, lhs, rhs)
+        return dest
+
+    visitOrExpr = _visitBinary
+    visitAndExpr = _visitBinary
+    visitEqualityExpr = _visitBinary
+    visitRelationalExpr = _visitBinary
+    visitAdditiveExpr = _visitBinary
+    visitMultiplicativeExpr = _visitBinary
+
+    def _visitUnary(self, ctx, op: int) -> Visit[int]:
+        mark = self._next_temp
+        src = yield ctx.expr()
+        self._next_temp = mark
+        dest = self._temp()
+        self._emit(op, dest, src)
+        return dest
+
+    def visitNotExpr(self, ctx) -> Visit[int]:
+        return self._visitUnary(ctx, B.NOT)
+
+    def visitUnaryMinusExpr(self, ctx) -> Visit[int]:
+        return self._visitUnary(ctx, B.NEG)
+
+    # statements
+
+    def _value(self, expr) -> Visit[int]:
+        """Register of the value of `expr`, whose temporaries are dead once
+        it is used."""
+        mark = self._next_temp
+        src = yield expr
+        self._next_temp = mark
+        return src
+
+    def _jumpUnless(self, expr) -> Visit[int]:
+        """Emit a jump taken unless `expr` is true, and return the offset
+        of its target, to patch."""
+        while isinstance(expr, MiniCParser.AtomExprContext) \
+                and isinstance(expr.atom(), MiniCParser.ParExprContext):
+            expr = expr.atom().expr()
+        if isinstance(expr, (MiniCParser.RelationalExprContext,
+                             MiniCParser.EqualityExprContext)):
+            mark = self._next_temp
+            lhs = yield expr.expr(0)
+            rhs = yield expr.expr(1)
+            self._next_temp = mark
+            op = B.JUMP_UNLESS + self._opcode(expr)
+            return self._emit(op, lhs, rhs) + 3
+        src = yield from self._value(expr)
+        return self._emit(B.JUMP_IF_FALSE, src) + 2
+
+    def visitPrintlnintStat(self, ctx) -> Visit[None]:
+        self._emit(B.PRINT, (yield from self._value(ctx.expr())))
+
+    def visitPrintlnfloatStat(self, ctx) -> Visit[None]:
+        op = B.PRINT_FLOAT if self._type_table is not None else B.PRINT_UFLOAT
+        self._emit(op, (yield from self._value(ctx.expr())))
+
+    def visitPrintlnboolStat(self, ctx) -> Visit[None]:
+        self._emit(B.PRINT_BOOL, (yield from self._value(ctx.expr())))
+
+    def visitPrintlnstringStat(self, ctx) -> Visit[None]:
+        self._emit(B.PRINT, (yield from self._value(ctx.expr())))
+
+    def visitAssignStat(self, ctx) -> Visit[None]:
+        mark = self._next_temp
+        src = yield from self._value(ctx.expr())
+        dest = self._variable(ctx.ID().getText())
+        code = self._code
+        if src >= mark and code[-3] == src:
+            # A temporary computed by the last instruction: compute the
+            # variable instead.
+            code[-3] = dest
+        else:
+            self._emit(B.MOVE, dest, src)
+
+    def visitIfStat(self, ctx) -> Visit[None]:
+        to_else = yield from self._jumpUnless(ctx.expr())
+        yield ctx.stat_block(0)
+        if ctx.ELSE() is None:
+            self._code[to_else] = len(self._code)
+            return
+        to_end = self._emit(B.JUMP) + 1
+        self._code[to_else] = len(self._code)
+        yield ctx.stat_block(1)
+        self._code[to_end] = len(self._code)
+
+    def visitWhileStat(self, ctx) -> Visit[None]:
+        start = len(self._code)
+        to_end = yield from self._jumpUnless(ctx.expr())
+        yield ctx.stat_block()
+        self._emit(B.JUMP, start)
+        self._code[to_end] = len(self._code)
+
+    def visitForStat(self, ctx) -> Visit[None]:
+        if ctx.init is not None:
+            yield ctx.init
+        start = len(self._code)
+        to_end = None
+        if ctx.cond is not None:
+            to_end = yield from self._jumpUnless(ctx.cond)
+        yield ctx.body
+        if ctx.inc is not None:
+            yield ctx.inc
+        self._emit(B.JUMP, start)
+        if to_end is not None:
+            self._code[to_end] = len(self._code)
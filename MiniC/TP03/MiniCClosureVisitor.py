@@ -0,0 +1,401 @@
+# Visitor to *compile* MiniC files to Python closures, for evaluation
+from typing import Any, Callable, Dict, List, Optional
+import operator
+from MiniCParser import MiniCParser
+from TP03.MiniCTypingVisitor import BaseType, TypeTable
+from TP03.MiniCInterpretVisitor import INITIAL_VALUES, MINIC_VALUE
+from TP03.MiniCRope import Rope, concat
+from Lib.Errors import MiniCRuntimeError, MiniCInternalError
+from Lib.OutputBuffer import OutputBuffer
+from Lib.StackVisitor import StackVisitor, Visit
+
+"""
+Evaluation engine selected with ``--mode eval --engine=closure``.
+
+MiniCClosureVisitor visits the parse tree once, and gives a closure
+for each expression and statement: operators are resolved and constants
+parsed during this visit, and running the program only calls the
+closures. The output, runtime errors and exit codes are the same as with
+MiniCInterpretVisitor, and strings are also concatenated to a Rope.
+"""
+
+Expr = Callable[[], MINIC_VALUE]
+Stat = Callable[[], None]
+
+# Chains of left associative operators (e.g. a + b - c + ...) longer than
+# this are evaluated by a loop: nested closures would overflow the Python
+# stack.
+MAX_NESTING = 100
+
+# Programs nested deeper than this, in nodes visited at once by the
+# StackVisitor, are not compiled to closures: they would call each other
+# deeper than the Python stack allows. Closures of nested nodes call each
+# other, except in the chains evaluated by a loop, which are visited at
+# once.
+MAX_DEPTH = 400
+
+# Type of the variables declared with each type keyword
+DECLARED_TYPES = {
+    MiniCParser.INTTYPE: BaseType.Integer,
+    MiniCParser.FLOATTYPE: BaseType.Float,
+    MiniCParser.BOOLTYPE: BaseType.Boolean,
+    MiniCParser.STRINGTYPE: BaseType.String,
+}
+
+
+# The operators of MiniC on Python values, which raise the runtime errors
+# of MiniCInterpretVisitor. The untyped ones are for programs which were
+# not typechecked.
+
+def int_div(lval, rval):
+    if rval == 0:
+        raise MiniCRuntimeError("Division by 0")
+    return lval // rval
+
+
+def float_div(lval, rval):
+    if rval == 0:
+        raise MiniCRuntimeError("Division by 0")
+    return lval / rval
+
+
+def untyped_div(lval, rval):
+    if rval == 0:
+        raise MiniCRuntimeError("Division by 0")
+    if isinstance(lval, int):
+        return lval // rval
+    else:
+        return lval / rval
+
+
+def mod(lval, rval):
+    if rval == 0:
+        raise MiniCRuntimeError("Division by 0")
+    return lval % rval
+
+
+def untyped_add(lval, rval):
+    if isinstance(lval, (str, Rope)) or isinstance(rval, (str, Rope)):
+        return concat(lval, rval)
+    return lval + rval
+
+
+OPERATORS: Dict[int, Callable[[Any, Any], MINIC_VALUE]] = {
+    MiniCParser.EQ: operator.eq,
+    MiniCParser.NEQ: operator.ne,
+    MiniCParser.LT: operator.lt,
+    MiniCParser.LTEQ: operator.le,
+    MiniCParser.GT: operator.gt,
+    MiniCParser.GTEQ: operator.ge,
+    MiniCParser.PLUS: operator.add,
+    MiniCParser.MINUS: operator.sub,
+    MiniCParser.MULT: operator.mul,
+    MiniCParser.MOD: mod,
+}
+
+# Closures for the most frequent operators, which apply them without
+# calling a function.
+INLINE: Dict[Callable, Callable[[Expr, Expr], Expr]] = {
+    operator.or_: lambda lhs, rhs: lambda: lhs() | rhs(),
+    operator.and_: lambda lhs, rhs: lambda: lhs() & rhs(),
+    operator.eq: lambda lhs, rhs: lambda: lhs() == rhs(),
+    operator.ne: lambda lhs, rhs: lambda: lhs() != rhs(),
+    operator.lt: lambda lhs, rhs: lambda: lhs() < rhs(),
+    operator.le: lambda lhs, rhs: lambda: lhs() <= rhs(),
+    operator.gt: lambda lhs, rhs: lambda: lhs() > rhs(),
+    operator.ge: lambda lhs, rhs: lambda: lhs() >= rhs(),
+    operator.add: lambda lhs, rhs: lambda: lhs() + rhs(),
+    operator.sub: lambda lhs, rhs: lambda: lhs() - rhs(),
+    operator.mul: lambda lhs, rhs: lambda: lhs() * rhs(),
+}
+
+
+def _binary(op, lhs: Expr, rhs: Expr) -> Expr:
+    inline = INLINE.get(op)
+    if inline is not None:
+        return inline(lhs, rhs)
+    return lambda: op(lhs(), rhs())
+
+
+def _sequence(stats: List[Stat]) -> Stat:
+    if len(stats) == 1:
+        return stats[0]
+
+    def run():
+        for stat in stats:
+            stat()
+    return run
+
+
+class MiniCClosureVisitor(StackVisitor):
+
+    _memory: Dict[str, MINIC_VALUE]
+
+    def __init__(self, types: Optional[TypeTable] = None,
+                 output: Optional[OutputBuffer] = None):
+        """`types` is the table of MiniCTypingVisitor, None if the program
+        was not typechecked: the values are then checked at runtime.
+        Lines are printed to `output`, by default as soon as printed."""
+        super().__init__()
+        self._memory = dict()  # store all variable ids and values.
+        self._type_table = types
+        self._output = output if output is not None else OutputBuffer()
+
+    def _operator(self, ctx) -> Callable[[Any, Any], MINIC_VALUE]:
+        if isinstance(ctx, MiniCParser.OrExprContext):
+            return operator.or_
+        elif isinstance(ctx, MiniCParser.AndExprContext):
+            return operator.and_
+        assert ctx.myop is not None
+        optype = ctx.myop.type
+        if optype == MiniCParser.DIV:
+            if self._type_table is None:
+                return untyped_div
+            elif self._type_table.expressions[ctx] == BaseType.Integer:
+                return int_div
+            return float_div
+        elif optype == MiniCParser.PLUS:
+            if self._type_table is None:
+                return untyped_add
+            elif self._type_table.expressions[ctx] == BaseType.String:
+                return concat
+        try:
+            return OPERATORS[optype]
+        except KeyError:
+            raise MiniCInternalError(
+                f"Unknown operator '{ctx.myop}'")
+
+    # visitors for variable declarations
+
+    def visitVarDeclList(self, ctx) -> Visit[Stat]:
+        stats = []
+        for decl in ctx.vardecl():
+            stats.append((yield decl))
+        return _sequence(stats)
+
+    def visitVarDecl(self, ctx) -> Visit[Stat]:
+        value = INITIAL_VALUES[DECLARED_TYPES[ctx.typee().mytype.type]]
+        initial = {var: value for var in (yield ctx.id_l())}
+        memory = self._memory
+        return lambda: memory.update(initial)
+
+    def visitIdList(self, ctx) -> List[str]:
+        return [id.getText() for id in ctx.ID()]
+
+    # visitors for atoms --> closure giving their value
+
+    def visitParExpr(self, ctx) -> Expr:
+        return self.dispatch(ctx.expr())
+
+    def visitIntAtom(self, ctx) -> Expr:
+        value = int(ctx.getText())
+        return lambda: value
+
+    def visitFloatAtom(self, ctx) -> Expr:
+        value = float(ctx.getText())
+        return lambda: value
+
+    def visitBooleanAtom(self, ctx) -> Expr:
+        value = ctx.getText() == "true"
+        return lambda: value
+
+    def visitIdAtom(self, ctx) -> Expr:
+        memory = self._memory
+        var = ctx.ID().getText()
+        return lambda: memory[var]
+
+    def visitStringAtom(self, ctx) -> Expr:
+        value = ctx.getText()[1:-1]  # Remove the ""
+        return lambda: value
+
+    # visit expressions
+
+    # No visitAtomExpr: the default visit method gives the result of the
+    # only child, the atom, without a generator.
+
+    def _visitBinary(self, ctx) -> Visit[Expr]:
+        parent = ctx.parentCtx
+        if type(parent) is type(ctx) and parent.expr(0) is ctx:
+            # In a chain short enough for nested closures: the last
+            # operator of longer ones evaluates them by a loop.
+            lhs = yield ctx.expr(0)
+            return _binary(self._operator(ctx), lhs, (yield ctx.expr(1)))
+        # The chain of operators of the same kind on the left of ctx,
+        # e.g. both additions of a + b - c, from the last one.
+        chain = []
+        node = ctx
+        while type(node) is type(ctx):
+            chain.append(node)
+            node = node.expr(0)
+        if len(chain) <= MAX_NESTING:
+            # One generator by operator, as deep as the closures: see
+            # MAX_DEPTH.
+            lhs = yield ctx.expr(0)
+            return _binary(self._operator(ctx), lhs, (yield ctx.expr(1)))
+        first = yield node
+        rest = []
+        for node in reversed(chain):
+            rest.append((self._operator(node), (yield node.expr(1))))
+
+        def run():
+            val = first()
+            for op, rhs in rest:
+                val = op(val, rhs())
+            return val
+        return run
+
+    visitOrExpr = _visitBinary
+    visitAndExpr = _visitBinary
+    visitEqualityExpr = _visitBinary
+    visitRelationalExpr = _visitBinary
+    visitAdditiveExpr = _visitBinary
+    visitMultiplicativeExpr = _visitBinary
+
+    def visitNotExpr(self, ctx) -> Visit[Expr]:
+        expr = yield ctx.expr()
+        return lambda: not expr()
+
+    def visitUnaryMinusExpr(self, ctx) -> Visit[Expr]:
+        expr = yield ctx.expr()
+        return lambda: -expr()
+
+    # visit statements
+
+    def visitStatList(self, ctx) -> Visit[Stat]:
+        stats = []
+        for stat in ctx.stat():
+            stats.append((yield stat))
+        return _sequence(stats)
+
+    def visitStat(self, ctx) -> Stat:
+        return self.dispatch(ctx.getChild(0))
+
+    def visitStat_block(self, ctx) -> Stat:
+        block = ctx.block()
+        return self.dispatch(block if block is not None else ctx.stat())
+
+    def visitPrintlnintStat(self, ctx) -> Visit[Stat]:
+        expr = yield ctx.expr()
+        println = self._output.println
+        return lambda: println(expr())
+
+    def visitPrintlnfloatStat(self, ctx) -> Visit[Stat]:
+        expr = yield ctx.expr()
+        println = self._output.println
+        if self._type_table is not None:
+            return lambda: println(f"{expr():.2f}")
+
+        def run():
+            val = expr()
+            if isinstance(val, float):
+                val = f"{val:.2f}"
+            println(val)
+        return run
+
+    def visitPrintlnboolStat(self, ctx) -> Visit[Stat]:
+        expr = yield ctx.expr()
+        println = self._output.println
+        return lambda: println('1' if expr() else '0')
+
+    def visitPrintlnstringStat(self, ctx) -> Visit[Stat]:
+        expr = yield ctx.expr()
+        println = self._output.println
+        return lambda: println(expr())
+
+    def visitAssignStat(self, ctx) -> Visit[Stat]:
+        memory = self._memory
+        var = ctx.ID().getText()
+        expr = yield ctx.expr()
+
+        def run():
+            memory[var] = expr()
+        return run
+
+    def visitIfStat(self, ctx) -> Visit[Stat]:
+        cond = yield ctx.expr()
+        then_block = yield ctx.stat_block(0)
+        if ctx.ELSE() is None:
+            def run():
+                if cond():
+                    then_block()
+            return run
+        else_block = yield ctx.stat_block(1)
+
+        def run_else():
+            if cond():
+                then_block()
+            else:
+                else_block()
+        return run_else
+
+    def visitWhileStat(self, ctx) -> Visit[Stat]:
+        cond = yield ctx.expr()
+        body = yield ctx.stat_block()
+
+        def run():
+            while cond():
+                body()
+        return run
+
+    def visitForStat(self, ctx) -> Visit[Stat]:
+        init = (yield ctx.init) if ctx.init is not None else None
+        cond = (yield ctx.cond) if ctx.cond is not None else (lambda: True)
+        body = yield ctx.body
+        inc = (yield ctx.inc) if ctx.inc is not None else None
+
+        def run():
+            if init is not None:
+                init()
+            if inc is None:
+                while cond():
+                    body()
+            else:
+                while cond():
+                    body()
+                    inc()
+        return run
+
+    # TOPLEVEL
+    def visitProgRule(self, ctx) -> Visit[Stat]:
+        functions = []
+        has_main = False
+        for function in ctx.function():
+            has_main = has_main or function.ID().getText() == "main"
+            functions.append((yield function))
+
+        def run():
+            for function in functions:
+                function()
+            if not has_main:
+                # A program without a main function is compilable (hence
+                # it's not a typing error per se), but not executable,
+                # hence we consider it a runtime error.
+                raise MiniCRuntimeError("No main function in file")
+        return run
+
+    # Compile a function: fail when running it if non main!
+    def visitFuncDef(self, ctx) -> Visit[Stat]:
+        funname = ctx.ID().getText()
+        if funname == "main":
+            decls = yield ctx.vardecl_l()
+            block = yield ctx.block()
+
+            def run():
+                decls()
+                block()
+            return run
+        else:
+            def fail():
+                raise MiniCRuntimeError("Functions are not supported in evaluation mode")
+            return fail
+
+
+def compile_program(tree, types: Optional[TypeTable] = None,
+                    output: Optional[OutputBuffer] = None) -> Optional[Stat]:
+    """The closure running the program `tree` (see MiniCClosureVisitor for
+    `types` and `output`), None if it is nested deeper than MAX_DEPTH."""
+    visitor = MiniCClosureVisitor(types, output)
+    program = visitor.visit(tree)
+    if visitor.max_depth > MAX_DEPTH:
+        return None
+    return program
@@ -1,45 +1,108 @@
 # Visitor to *interpret* MiniC files
-from typing import Dict, List, cast
-from MiniCVisitor import MiniCVisitor
+from typing import Dict, List, Optional, cast
+from antlr4.ParserRuleContext import ParserRuleContext
 from MiniCParser import MiniCParser
+from TP03.MiniCTypingVisitor import BaseType, TypeTable
+from TP03.MiniCRope import Rope, concat
+from TP03.MiniCAffineLoop import AffineLoop, affine_loop
 from Lib.Errors import MiniCRuntimeError, MiniCInternalError
-
-MINIC_VALUE = int | str | bool | float | List['MINIC_VALUE']
-
-
-class MiniCInterpretVisitor(MiniCVisitor):
-
-    _memory: Dict[str, MINIC_VALUE]
-
-    def __init__(self):
-        self._memory = dict()  # store all variable ids and values.
+from Lib.OutputBuffer import OutputBuffer
+from Lib.StackVisitor import StackVisitor, Visit
+
+MINIC_VALUE = int | str | Rope | bool | float | List['MINIC_VALUE']
+
+# Initial value of the variables of each type
+INITIAL_VALUES: Dict[BaseType, MINIC_VALUE] = {
+    BaseType.Integer: 0,
+    BaseType.Float: 0.0,
+    BaseType.Boolean: False,
+    BaseType.String: "",
+}
+
+
+class MiniCInterpretVisitor(StackVisitor):
+
+    _slots: Dict[str, int]
+    _memory: List[MINIC_VALUE]
+    _loops: Dict[ParserRuleContext, Optional[AffineLoop]]
+
+    def __init__(self, types: Optional[TypeTable] = None,
+                 output: Optional[OutputBuffer] = None):
+        """`types` is the table of MiniCTypingVisitor, None if the program
+        was not typechecked: the values are then checked at runtime.
+        Lines are printed to `output`, by default as soon as printed."""
+        super().__init__()
+        self._type_table = types
+        self._output = output if output is not None else OutputBuffer()
+        # The value of each variable is in self._memory, at its slot: the
+        # one of the typing table, or without it, numbered in the order
+        # of declaration (or of assignment, for undeclared variables).
+        if types is not None:
+            self._slots = {var: slot for var, (_, slot) in types.variables.items()}
+        else:
+            self._slots = dict()
+        self._memory = [None] * len(self._slots)
+        self._loops = dict()
+        # Whether loops are evaluated in closed form when possible: not
+        # when each statement executed must be visited, e.g. to profile.
+        self.closed_form = True
         self.has_main = False
 
+    def _slot(self, ctx, assign=False) -> int:
+        """Slot of the variable ctx.ID() (of an IdAtom or AssignStat)."""
+        if self._type_table is not None:
+            return self._type_table.slots[ctx]
+        var = ctx.ID().getText()
+        slot = self._slots.get(var)
+        if slot is None:
+            if not assign:
+                raise KeyError(var)
+            slot = self._slots[var] = len(self._memory)
+            self._memory.append(None)
+        return slot
+
+    def _closedForm(self, ctx) -> bool:
+        """Evaluate the loop `ctx` at once if it is an AffineLoop (see
+        TP03/MiniCAffineLoop.py), and return whether it was."""
+        if self._type_table is None or not self.closed_form:
+            return False
+        try:
+            loop = self._loops[ctx]
+        except KeyError:
+            loop = self._loops[ctx] = affine_loop(ctx, self._type_table)
+        return loop is not None and loop.run(self._memory)
+
     # visitors for variable declarations
 
-    def visitVarDecl(self, ctx) -> None:
+    def visitVarDecl(self, ctx) -> Visit[None]:
         # Initialise all variables in self._memory
+        if self._type_table is not None:
+            for var in (yield ctx.id_l()):
+                self._memory[self._slots[var]] = \
+                    INITIAL_VALUES[self._type_table.variables[var][0]]
+            return
         type_str = ctx.typee().getText()
-        for var in self.visit(ctx.id_l()):
+        for var in (yield ctx.id_l()):
+            if var not in self._slots:
+                self._slots[var] = len(self._memory)
+                self._memory.append(None)
+            slot = self._slots[var]
             if type_str == "int":
-                self._memory[var] = 0
+                self._memory[slot] = 0
             elif type_str == "float":
-                self._memory[var] = 0.0
+                self._memory[slot] = 0.0
             elif type_str == "bool":
-                self._memory[var] = False
+                self._memory[slot] = False
             elif type_str == "string":
-                self._memory[var] = ""
+                self._memory[slot] = ""
 
     def visitIdList(self, ctx) -> List[str]:
-        return self.visitIdListBase(ctx) + self.visit(ctx.id_l())
-
-    def visitIdListBase(self, ctx) -> List[str]:
-        return [ctx.ID().getText()]
+        return [id.getText() for id in ctx.ID()]
 
     # visitors for atoms --> value
 
     def visitParExpr(self, ctx) -> MINIC_VALUE:
-        return self.visit(ctx.expr())
+        return self.dispatch(ctx.expr())
 
     def visitIntAtom(self, ctx) -> int:
         return int(ctx.getText())
@@ -51,41 +114,40 @@ class MiniCInterpretVisitor(MiniCVisitor):
         return ctx.getText() == "true"
 
     def visitIdAtom(self, ctx) -> MINIC_VALUE:
-        var = ctx.ID().getText()
-        return self._memory[var]
+        return self._memory[self._slot(ctx)]
 
     def visitStringAtom(self, ctx) -> str:
         return ctx.getText()[1:-1]  # Remove the ""
 
     # visit expressions
 
-    def visitAtomExpr(self, ctx) -> MINIC_VALUE:
-        return self.visit(ctx.atom())
+    # No visitAtomExpr: the default visit method gives the result of the
+    # only child, the atom, without a generator.
 
-    def visitOrExpr(self, ctx) -> bool:
-        lval = self.visit(ctx.expr(0))
-        rval = self.visit(ctx.expr(1))
+    def visitOrExpr(self, ctx) -> Visit[bool]:
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
         return lval | rval
 
-    def visitAndExpr(self, ctx) -> bool:
-        lval = self.visit(ctx.expr(0))
-        rval = self.visit(ctx.expr(1))
+    def visitAndExpr(self, ctx) -> Visit[bool]:
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
         return lval & rval
 
-    def visitEqualityExpr(self, ctx) -> bool:
+    def visitEqualityExpr(self, ctx) -> Visit[bool]:
         assert ctx.myop is not None
-        lval = self.visit(ctx.expr(0))
-        rval = self.visit(ctx.expr(1))
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
         # be careful for float equality
         if ctx.myop.type == MiniCParser.EQ:
             return lval == rval
         else:
             return lval != rval
 
-    def visitRelationalExpr(self, ctx) -> bool:
+    def visitRelationalExpr(self, ctx) -> Visit[bool]:
         assert ctx.myop is not None
-        lval = self.visit(ctx.expr(0))
-        rval = self.visit(ctx.expr(1))
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
         if ctx.myop.type == MiniCParser.LT:
             return lval < rval
         elif ctx.myop.type == MiniCParser.LTEQ:
@@ -99,13 +161,18 @@ class MiniCInterpretVisitor(MiniCVisitor):
                 f"Unknown comparison operator '{ctx.myop}'"
             )
 
-    def visitAdditiveExpr(self, ctx) -> MINIC_VALUE:
+    def visitAdditiveExpr(self, ctx) -> Visit[MINIC_VALUE]:
         assert ctx.myop is not None
-        lval = self.visit(ctx.expr(0))
-        rval = self.visit(ctx.expr(1))
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
         if ctx.myop.type == MiniCParser.PLUS:
-            if any(isinstance(x, str) for x in (lval, rval)):
-                return '{}{}'.format(lval, rval)
+            # Strings are concatenated to a Rope, see TP03/MiniCRope.py
+            if self._type_table is not None:
+                string = self._type_table.expressions[ctx] == BaseType.String
+            else:
+                string = any(isinstance(x, (str, Rope)) for x in (lval, rval))
+            if string:
+                return concat(lval, rval)
             else:
                 return lval + rval
         elif ctx.myop.type == MiniCParser.MINUS:
@@ -114,16 +181,20 @@ class MiniCInterpretVisitor(MiniCVisitor):
             raise MiniCInternalError(
                 f"Unknown additive operator '{ctx.myop}'")
 
-    def visitMultiplicativeExpr(self, ctx) -> MINIC_VALUE:
+    def visitMultiplicativeExpr(self, ctx) -> Visit[MINIC_VALUE]:
         assert ctx.myop is not None
-        lval = self.visit(ctx.expr(0))
-        rval = self.visit(ctx.expr(1))
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
         if ctx.myop.type == MiniCParser.MULT:
             return lval * rval
         elif ctx.myop.type == MiniCParser.DIV:
             if rval == 0:
                 raise MiniCRuntimeError("Division by 0")
-            if isinstance(lval, int):
+            if self._type_table is not None:
+                integer = self._type_table.expressions[ctx] == BaseType.Integer
+            else:
+                integer = isinstance(lval, int)
+            if integer:
                 return lval // rval
             else:
                 return lval / rval
@@ -135,63 +206,67 @@ class MiniCInterpretVisitor(MiniCVisitor):
             raise MiniCInternalError(
                 f"Unknown multiplicative operator '{ctx.myop}'")
 
-    def visitNotExpr(self, ctx) -> bool:
-        return not self.visit(ctx.expr())
+    def visitNotExpr(self, ctx) -> Visit[bool]:
+        return not (yield ctx.expr())
 
-    def visitUnaryMinusExpr(self, ctx) -> MINIC_VALUE:
-        return -self.visit(ctx.expr())
+    def visitUnaryMinusExpr(self, ctx) -> Visit[MINIC_VALUE]:
+        return -(yield ctx.expr())
 
     # visit statements
 
-    def visitPrintlnintStat(self, ctx) -> None:
-        val = self.visit(ctx.expr())
-        print(val)
+    def visitPrintlnintStat(self, ctx) -> Visit[None]:
+        val = yield ctx.expr()
+        self._output.println(val)
 
-    def visitPrintlnfloatStat(self, ctx) -> None:
-        val = self.visit(ctx.expr())
-        if isinstance(val, float):
+    def visitPrintlnfloatStat(self, ctx) -> Visit[None]:
+        val = yield ctx.expr()
+        if self._type_table is not None or isinstance(val, float):
             val = f"{val:.2f}"
-        print(val)
+        self._output.println(val)
 
-    def visitPrintlnboolStat(self, ctx) -> None:
-        val = self.visit(ctx.expr())
-        print('1' if val else '0')
+    def visitPrintlnboolStat(self, ctx) -> Visit[None]:
+        val = yield ctx.expr()
+        self._output.println('1' if val else '0')
 
-    def visitPrintlnstringStat(self, ctx) -> None:
-        val = self.visit(ctx.expr())
-        print(val)
+    def visitPrintlnstringStat(self, ctx) -> Visit[None]:
+        val = yield ctx.expr()
+        self._output.println(val)
 
-    def visitAssignStat(self, ctx) -> None:
-        var = ctx.ID().getText()
-        self._memory[var] = self.visit(ctx.expr())
+    def visitAssignStat(self, ctx) -> Visit[None]:
+        value = yield ctx.expr()
+        self._memory[self._slot(ctx, assign=True)] = value
 
-    def visitIfStat(self, ctx) -> None:
-        if self.visit(ctx.expr()):
-            self.visit(ctx.stat_block(0))
+    def visitIfStat(self, ctx) -> Visit[None]:
+        if (yield ctx.expr()):
+            yield ctx.stat_block(0)
         elif ctx.ELSE() is not None:
-            self.visit(ctx.stat_block(1))
+            yield ctx.stat_block(1)
 
-    def visitWhileStat(self, ctx) -> None:
-        while self.visit(ctx.expr()):
-            self.visit(ctx.stat_block())
+    def visitWhileStat(self, ctx) -> Visit[None]:
+        if self._closedForm(ctx):
+            return
+        while (yield ctx.expr()):
+            yield ctx.stat_block()
 
-    def visitForStat(self, ctx) -> None:
+    def visitForStat(self, ctx) -> Visit[None]:
         def visitBodyInc():
-            self.visit(ctx.body)
+            yield ctx.body
             if ctx.inc is not None:
-                self.visit(ctx.inc)
+                yield ctx.inc
         if ctx.init is not None:
-            self.visit(ctx.init)
+            yield ctx.init
+        if self._closedForm(ctx):
+            return
         if ctx.cond is not None:
-            while self.visit(ctx.cond):
-                visitBodyInc()
+            while (yield ctx.cond):
+                yield from visitBodyInc()
         else:
             while True:
-                visitBodyInc()
+                yield from visitBodyInc()
 
     # TOPLEVEL
-    def visitProgRule(self, ctx) -> None:
-        self.visitChildren(ctx)
+    def visitProgRule(self, ctx) -> Visit[None]:
+        yield from self.visitChildren(ctx)
         if not self.has_main:
             # A program without a main function is compilable (hence
             # it's not a typing error per se), but not executable,
@@ -199,12 +274,12 @@ class MiniCInterpretVisitor(MiniCVisitor):
             raise MiniCRuntimeError("No main function in file")
 
     # Visit a function: ignore if non main!
-    def visitFuncDef(self, ctx) -> None:
+    def visitFuncDef(self, ctx) -> Visit[None]:
         funname = ctx.ID().getText()
         if funname == "main":
             self.has_main = True
-            self.visit(ctx.vardecl_l())
-            self.visit(ctx.block())
+            yield ctx.vardecl_l()
+            yield ctx.block()
         else:
             raise MiniCRuntimeError("Functions are not supported in evaluation mode")
 
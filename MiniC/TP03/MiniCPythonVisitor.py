@@ -0,0 +1,331 @@
+# Visitor to *translate* MiniC files to Python, for evaluation
+from types import CodeType
+from typing import Any, Dict, List, Optional
+import ast
+import operator
+from MiniCParser import MiniCParser
+from TP03.MiniCTypingVisitor import BaseType, TypeTable
+from TP03.MiniCInterpretVisitor import INITIAL_VALUES
+from TP03.MiniCClosureVisitor import (
+    DECLARED_TYPES, MAX_NESTING, int_div, float_div, untyped_div, mod, untyped_add)
+from TP03.MiniCRope import concat
+from Lib.Errors import MiniCRuntimeError, MiniCInternalError
+from Lib.OutputBuffer import OutputBuffer
+from Lib.StackVisitor import StackVisitor, Visit
+
+"""
+Evaluation engine selected with ``--mode eval --engine=pyast``.
+
+MiniCPythonVisitor translates the program to a Python ast.Module, in
+which main is a Python function: its variables are Python locals, and
+if, while and for are Python statements. :py:func:`compile_module`
+compiles the module and :py:func:`run` executes it, so that CPython does
+the dispatch. The output, runtime errors and exit codes are the same as
+with MiniCInterpretVisitor:
+
+- typed integer division and modulo are Python's // and %, whose
+  ZeroDivisionError :py:func:`run` turns into the "Division by 0"
+  MiniCRuntimeError,
+- strings are concatenated to a Rope by _concat, as in MiniCInterpretVisitor,
+- the operations which depend on the types of values when the program
+  was not typechecked call the functions of MiniCClosureVisitor.
+"""
+
+# Prefix of the Python names of the MiniC variables, which can't clash
+# with Python keywords, builtins or the names of GLOBALS.
+VARIABLE_PREFIX = "v_"
+
+
+def _untyped_float(val):
+    """Text printed by println_float of an unchecked value."""
+    if isinstance(val, float):
+        return f"{val:.2f}"
+    return val
+
+
+def _chain(val, *rest):
+    """Value of val op1 rhs1 op2 rhs2..., from left to right."""
+    for i in range(0, len(rest), 2):
+        val = rest[i](val, rest[i + 1])
+    return val
+
+
+# Names defined for the translated programs
+GLOBALS: Dict[str, Any] = {
+    "MiniCRuntimeError": MiniCRuntimeError,
+    "_chain": _chain,
+    "_untyped_float": _untyped_float,
+    "_or": operator.or_,
+    "_and": operator.and_,
+    "_eq": operator.eq,
+    "_ne": operator.ne,
+    "_lt": operator.lt,
+    "_le": operator.le,
+    "_gt": operator.gt,
+    "_ge": operator.ge,
+    "_add": operator.add,
+    "_sub": operator.sub,
+    "_mul": operator.mul,
+    "_int_div": int_div,
+    "_float_div": float_div,
+    "_mod": mod,
+    "_untyped_add": untyped_add,
+    "_concat": concat,
+    "_untyped_div": untyped_div,
+}
+
+# Python operator and function of GLOBALS of the operators of MiniC
+# which don't depend on types
+OPERATORS: Dict[int, tuple] = {
+    MiniCParser.EQ: (ast.Eq, "_eq"),
+    MiniCParser.NEQ: (ast.NotEq, "_ne"),
+    MiniCParser.LT: (ast.Lt, "_lt"),
+    MiniCParser.LTEQ: (ast.LtE, "_le"),
+    MiniCParser.GT: (ast.Gt, "_gt"),
+    MiniCParser.GTEQ: (ast.GtE, "_ge"),
+    MiniCParser.MINUS: (ast.Sub, "_sub"),
+    MiniCParser.MULT: (ast.Mult, "_mul"),
+    MiniCParser.MOD: (ast.Mod, "_mod"),
+}
+
+
+def _name(name: str, store=False) -> ast.Name:
+    return ast.Name(id=name, ctx=ast.Store() if store else ast.Load())
+
+
+def _call(function: str, *args: ast.expr) -> ast.expr:
+    return ast.Call(func=_name(function), args=list(args), keywords=[])
+
+
+def _body(stats: List[ast.stmt]) -> List[ast.stmt]:
+    return stats or [ast.Pass()]
+
+
+def _raise(message: str) -> ast.stmt:
+    return ast.Raise(exc=_call("MiniCRuntimeError", ast.Constant(message)), cause=None)
+
+
+class MiniCPythonVisitor(StackVisitor):
+
+    def __init__(self, types: Optional[TypeTable] = None):
+        """`types` is the table of MiniCTypingVisitor, None if the program
+        was not typechecked: the values are then checked at runtime."""
+        super().__init__()
+        self._type_table = types
+
+    def _operator(self, ctx) -> tuple:
+        """The Python operator of the MiniC operator of ctx, None if there
+        is none, and the function of GLOBALS computing it."""
+        if isinstance(ctx, MiniCParser.OrExprContext):
+            return (ast.BitOr, "_or")
+        elif isinstance(ctx, MiniCParser.AndExprContext):
+            return (ast.BitAnd, "_and")
+        assert ctx.myop is not None
+        optype = ctx.myop.type
+        if optype == MiniCParser.DIV:
+            if self._type_table is None:
+                return (None, "_untyped_div")
+            elif self._type_table.expressions[ctx] == BaseType.Integer:
+                return (ast.FloorDiv, "_int_div")
+            return (ast.Div, "_float_div")
+        elif optype == MiniCParser.PLUS:
+            if self._type_table is None:
+                return (None, "_untyped_add")
+            elif self._type_table.expressions[ctx] == BaseType.String:
+                return (None, "_concat")
+            return (ast.Add, "_add")
+        try:
+            return OPERATORS[optype]
+        except KeyError:
+            raise MiniCInternalError(
+                f"Unknown operator '{ctx.myop}'")
+
+    # TOPLEVEL
+    def visitProgRule(self, ctx) -> Visit[ast.Module]:
+        body: List[ast.stmt] = []
+        has_main = False
+        for function in ctx.function():
+            if function.ID().getText() == "main":
+                has_main = True
+                main = ast.parse("def _main():\n    pass").body[0]
+                assert isinstance(main, ast.FunctionDef)
+                main.body = _body((yield function))
+                body.append(main)
+                body.append(ast.Expr(_call("_main")))
+            else:
+                body.append(_raise("Functions are not supported in evaluation mode"))
+        if not has_main:
+            # A program without a main function is compilable (hence
+            # it's not a typing error per se), but not executable,
+            # hence we consider it a runtime error.
+            body.append(_raise("No main function in file"))
+        return ast.Module(body=body, type_ignores=[])
+
+    def visitFuncDef(self, ctx) -> Visit[List[ast.stmt]]:
+        stats = []
+        for decl in ctx.vardecl_l().vardecl():
+            stats.extend((yield decl))
+        stats.extend((yield ctx.block()))
+        return stats
+
+    # variable declarations
+
+    def visitVarDecl(self, ctx) -> Visit[List[ast.stmt]]:
+        stats = []
+        for var in (yield ctx.id_l()):
+            if self._type_table is not None:
+                vtype = self._type_table.variables[var][0]
+            else:
+                vtype = DECLARED_TYPES[ctx.typee().mytype.type]
+            stats.append(ast.Assign(targets=[_name(VARIABLE_PREFIX + var, store=True)],
+                                    value=ast.Constant(INITIAL_VALUES[vtype])))
+        return stats
+
+    def visitIdList(self, ctx) -> List[str]:
+        return [id.getText() for id in ctx.ID()]
+
+    # atoms --> Python expression
+
+    def visitParExpr(self, ctx) -> ast.expr:
+        return self.dispatch(ctx.expr())
+
+    def visitIntAtom(self, ctx) -> ast.expr:
+        return ast.Constant(int(ctx.getText()))
+
+    def visitFloatAtom(self, ctx) -> ast.expr:
+        return ast.Constant(float(ctx.getText()))
+
+    def visitBooleanAtom(self, ctx) -> ast.expr:
+        return ast.Constant(ctx.getText() == "true")
+
+    def visitIdAtom(self, ctx) -> ast.expr:
+        return _name(VARIABLE_PREFIX + ctx.ID().getText())
+
+    def visitStringAtom(self, ctx) -> ast.expr:
+        return ast.Constant(ctx.getText()[1:-1])  # Remove the ""
+
+    # expressions
+
+    # No visitAtomExpr: the default visit method gives the result of the
+    # only child, the atom, without a generator.
+
+    def _visitBinary(self, ctx) -> Visit[ast.expr]:
+        # The chain of operators of the same kind on the left of ctx,
+        # e.g. both additions of a + b - c, from the last one.
+        chain = []
+        node = ctx
+        while type(node) is type(ctx):
+            chain.append(node)
+            node = node.expr(0)
+        result = yield node
+        if len(chain) <= MAX_NESTING:
+            for node in reversed(chain):
+                op, function = self._operator(node)
+                rhs = yield node.expr(1)
+                if op is None:
+                    result = _call(function, result, rhs)
+                elif issubclass(op, ast.cmpop):
+                    result = ast.Compare(left=result, ops=[op()], comparators=[rhs])
+                else:
+                    result = ast.BinOp(left=result, op=op(), right=rhs)
+            return result
+        # Python compiles expressions recursively: a long chain is
+        # computed by _chain. Its operands are computed first, which
+        # can't be told apart, as they have no side effect and only fail
+        # with the same "Division by 0" error as the operators.
+        args = [result]
+        for node in reversed(chain):
+            args.append(_name(self._operator(node)[1]))
+            args.append((yield node.expr(1)))
+        return _call("_chain", *args)
+
+    visitOrExpr = _visitBinary
+    visitAndExpr = _visitBinary
+    visitEqualityExpr = _visitBinary
+    visitRelationalExpr = _visitBinary
+    visitAdditiveExpr = _visitBinary
+    visitMultiplicativeExpr = _visitBinary
+
+    def visitNotExpr(self, ctx) -> Visit[ast.expr]:
+        return ast.UnaryOp(op=ast.Not(), operand=(yield ctx.expr()))
+
+    def visitUnaryMinusExpr(self, ctx) -> Visit[ast.expr]:
+        return ast.UnaryOp(op=ast.USub(), operand=(yield ctx.expr()))
+
+    # statements --> list of Python statements
+
+    def visitStatList(self, ctx) -> Visit[List[ast.stmt]]:
+        stats = []
+        for stat in ctx.stat():
+            stats.extend((yield stat))
+        return stats
+
+    def visitStat(self, ctx) -> List[ast.stmt]:
+        return self.dispatch(ctx.getChild(0))
+
+    def visitStat_block(self, ctx) -> List[ast.stmt]:
+        block = ctx.block()
+        return self.dispatch(block if block is not None else ctx.stat())
+
+    def visitPrintlnintStat(self, ctx) -> Visit[List[ast.stmt]]:
+        return [ast.Expr(_call("_println", (yield ctx.expr())))]
+
+    def visitPrintlnfloatStat(self, ctx) -> Visit[List[ast.stmt]]:
+        expr = yield ctx.expr()
+        if self._type_table is None:
+            return [ast.Expr(_call("_println", _call("_untyped_float", expr)))]
+        text = ast.JoinedStr(values=[ast.FormattedValue(
+            value=expr, conversion=-1,
+            format_spec=ast.JoinedStr(values=[ast.Constant(".2f")]))])
+        return [ast.Expr(_call("_println", text))]
+
+    def visitPrintlnboolStat(self, ctx) -> Visit[List[ast.stmt]]:
+        text = ast.IfExp(test=(yield ctx.expr()),
+                         body=ast.Constant('1'), orelse=ast.Constant('0'))
+        return [ast.Expr(_call("_println", text))]
+
+    def visitPrintlnstringStat(self, ctx) -> Visit[List[ast.stmt]]:
+        return [ast.Expr(_call("_println", (yield ctx.expr())))]
+
+    def visitAssignStat(self, ctx) -> Visit[List[ast.stmt]]:
+        var = _name(VARIABLE_PREFIX + ctx.ID().getText(), store=True)
+        return [ast.Assign(targets=[var], value=(yield ctx.expr()))]
+
+    def visitIfStat(self, ctx) -> Visit[List[ast.stmt]]:
+        test = yield ctx.expr()
+        then_block = yield ctx.stat_block(0)
+        else_block = (yield ctx.stat_block(1)) if ctx.ELSE() is not None else []
+        return [ast.If(test=test, body=_body(then_block), orelse=else_block)]
+
+    def visitWhileStat(self, ctx) -> Visit[List[ast.stmt]]:
+        test = yield ctx.expr()
+        body = yield ctx.stat_block()
+        return [ast.While(test=test, body=_body(body), orelse=[])]
+
+    def visitForStat(self, ctx) -> Visit[List[ast.stmt]]:
+        init = (yield ctx.init) if ctx.init is not None else []
+        test = (yield ctx.cond) if ctx.cond is not None else ast.Constant(True)
+        body = yield ctx.body
+        inc = (yield ctx.inc) if ctx.inc is not None else []
+        return init + [ast.While(test=test, body=_body(body + inc), orelse=[])]
+
+
+def compile_module(module: ast.Module, filename: str = "<minic>") -> Optional[CodeType]:
+    """Python code of the translation `module` of a program, None if
+    CPython can't compile it, e.g. with more than 20 nested loops or
+    nested deeper than the Python stack allows."""
+    try:
+        return compile(ast.fix_missing_locations(module), filename, "exec")
+    except (SyntaxError, RecursionError, MemoryError):
+        return None
+
+
+def run(code: CodeType, output: Optional[OutputBuffer] = None) -> None:
+    """Execute the code of the translation of a program. Lines are
+    printed to `output`, by default as soon as printed."""
+    namespace = dict(GLOBALS)
+    namespace["_println"] = (output if output is not None else OutputBuffer()).println
+    try:
+        exec(code, namespace)
+    except ZeroDivisionError:
+        raise MiniCRuntimeError("Division by 0") from None
@@ -0,0 +1,81 @@
+"""
+String values built by concatenation in the interpreters of TP03.
+
+Python strings are immutable: evaluating ``s = s + "x"`` with
+'{}{}'.format copies all of s, and a loop appending to a string is
+quadratic. :py:func:`concat` gives a :py:class:`Rope` instead, which
+only keeps the list of the concatenated strings: appending is amortized
+O(1), and the text is only joined when the value is printed or compared.
+
+A Rope is a value like a str: the list of its parts is shared with the
+Ropes which extend it, each of them using its first `count` parts only.
+A Rope is extended in place only if it uses the whole list; otherwise,
+it is joined first, to a new list.
+"""
+
+from functools import total_ordering
+from typing import List, Optional
+
+
+@total_ordering
+class Rope:
+    """The string "".join(parts[:count])."""
+
+    __slots__ = ("_parts", "_count", "_length", "_text")
+
+    _parts: List[str]
+    _text: Optional[str]
+
+    def __init__(self, parts: List[str], count: int, length: int):
+        self._parts = parts
+        self._count = count
+        self._length = length
+        self._text = None  # The joined text, once computed
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._parts[:self._count])
+            # Later appends extend a list of one part, and the old list
+            # is freed once the Ropes using it are.
+            self._parts = [self._text]
+            self._count = 1
+        return self._text
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (str, Rope)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if isinstance(other, (str, Rope)):
+            return str(self) < str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def append(self, text: str) -> "Rope":
+        """The Rope of self followed by `text`."""
+        if self._count != len(self._parts):
+            # Extended by another Rope: start a new list, even if the
+            # text was joined before (its list may have been extended since).
+            self._parts = [str(self)]
+            self._count = 1
+        self._parts.append(text)
+        return Rope(self._parts, self._count + 1, self._length + len(text))
+
+
+def concat(lval, rval) -> Rope:
+    """The string lval + rval, where values other than strings are
+    formatted as '{}{}'.format does."""
+    rtext = rval if isinstance(rval, str) else str(rval)
+    if isinstance(lval, Rope):
+        return lval.append(rtext)
+    ltext = lval if isinstance(lval, str) else str(lval)
+    return Rope([ltext, rtext], 2, len(ltext) + len(rtext))
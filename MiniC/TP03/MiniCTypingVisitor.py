@@ -1,9 +1,11 @@
 # Visitor to *typecheck* MiniC files
-from typing import List, NoReturn
-from MiniCVisitor import MiniCVisitor
+from typing import Dict, List, NoReturn, Tuple
+from antlr4.ParserRuleContext import ParserRuleContext
 from MiniCParser import MiniCParser
 from Lib.Errors import MiniCInternalError, MiniCTypeError
+from Lib.StackVisitor import StackVisitor, Visit
 
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -11,11 +13,44 @@ class BaseType(Enum):
     Float, Integer, Boolean, String = range(4)
 
 
+@dataclass
+class TypeTable:
+    """
+    The types computed by :py:class:`MiniCTypingVisitor`, for the
+    interpreter and the code generator: the type of each expression, from
+    its node in the parse tree, and the type and slot of each variable.
+    Slots number the variables from 0, in declaration order. The slot of
+    the variable of each IdAtom and AssignStat is also kept in `slots`,
+    from its node.
+    """
+
+    expressions: Dict[ParserRuleContext, BaseType] = field(default_factory=dict)
+    variables: Dict[str, Tuple[BaseType, int]] = field(default_factory=dict)
+    slots: Dict[ParserRuleContext, int] = field(default_factory=dict)
+
+    def declare(self, var: str, vtype: BaseType) -> None:
+        self.variables[var] = (vtype, len(self.variables))
+
+    def type_of(self, ctx) -> BaseType:
+        """Type of the expression or atom `ctx`. Parentheses and atomic
+        expressions are not in `expressions`: their type is the type of
+        their child."""
+        while True:
+            if isinstance(ctx, MiniCParser.ParExprContext):
+                ctx = ctx.expr()
+            elif isinstance(ctx, MiniCParser.AtomExprContext):
+                ctx = ctx.atom()
+            else:
+                return self.expressions[ctx]
+
+
 # Basic Type Checking for MiniC programs.
-class MiniCTypingVisitor(MiniCVisitor):
+class MiniCTypingVisitor(StackVisitor):
 
     def __init__(self):
+        super().__init__()
         self._memorytypes = dict()  # id -> types
+        self._type_table = TypeTable()
         # For now, we don't have real functions ...
         self._current_function = "main"
 
@@ -34,6 +69,14 @@ class MiniCTypingVisitor(MiniCVisitor):
                     ctx.start.line, ctx.start.column, for_what,
                     ' and '.join(t.name.lower() for t in types)))
 
+    def get_type_table(self) -> TypeTable:
+        """The types of the expressions and variables typed so far."""
+        return self._type_table
+
+    def _typed(self, ctx, etype: BaseType) -> BaseType:
+        self._type_table.expressions[ctx] = etype
+        return etype
+
     def _raiseNonType(self, ctx, message) -> NoReturn:
         raise MiniCTypeError(
             'In function {}: Line {} col {}: {}'.format(
@@ -42,13 +85,14 @@ class MiniCTypingVisitor(MiniCVisitor):
 
     # type declaration
 
-    def visitVarDecl(self, ctx) -> None:
-        typee = self.visit(ctx.typee())
-        for var in self.visit(ctx.id_l()):
+    def visitVarDecl(self, ctx) -> Visit[None]:
+        typee = yield ctx.typee()
+        for var in (yield ctx.id_l()):
             if var in self._memorytypes:
                 self._raiseNonType(ctx, "Variable {} already declared".format(
                     var))
             self._memorytypes[var] = typee
+            self._type_table.declare(var, typee)
 
     def visitBasicType(self, ctx):
         assert ctx.mytype is not None
@@ -62,123 +106,122 @@ class MiniCTypingVisitor(MiniCVisitor):
             return BaseType.String
 
     def visitIdList(self, ctx) -> List[str]:
-        return self.visitIdListBase(ctx) + self.visit(ctx.id_l())
-
-    def visitIdListBase(self, ctx) -> List[str]:
-        return [ctx.ID().getText()]
+        return [id.getText() for id in ctx.ID()]
 
     # typing visitors for expressions, statements !
 
     # visitors for atoms --> type
     def visitParExpr(self, ctx):
-        return self.visit(ctx.expr())
+        return self.dispatch(ctx.expr())
 
     def visitIntAtom(self, ctx):
-        return BaseType.Integer
+        return self._typed(ctx, BaseType.Integer)
 
     def visitFloatAtom(self, ctx):
-        return BaseType.Float
+        return self._typed(ctx, BaseType.Float)
 
     def visitBooleanAtom(self, ctx):
-        return BaseType.Boolean
+        return self._typed(ctx, BaseType.Boolean)
 
     def visitIdAtom(self, ctx):
         try:
-            return self._memorytypes[ctx.getText()]
+            vtype = self._memorytypes[ctx.getText()]
         except KeyError:
             self._raiseNonType(ctx,
                                "Undefined variable {}".format(ctx.getText()))
+        self._type_table.slots[ctx] = self._type_table.variables[ctx.getText()][1]
+        return self._typed(ctx, vtype)
 
     def visitStringAtom(self, ctx):
-        return BaseType.String
+        return self._typed(ctx, BaseType.String)
 
     # now visit expr
 
-    def visitAtomExpr(self, ctx):
-        return self.visit(ctx.atom())
+    # No visitAtomExpr: the default visit method gives the result of the
+    # only child, the atom, without a generator.
 
     def visitOrExpr(self, ctx):
-        ltype = self.visit(ctx.expr(0))
-        rtype = self.visit(ctx.expr(1))
+        ltype = yield ctx.expr(0)
+        rtype = yield ctx.expr(1)
         if ltype == rtype == BaseType.Boolean:
-            return BaseType.Boolean
+            return self._typed(ctx, BaseType.Boolean)
         self._raise(ctx, 'or operands', ltype, rtype)
 
     def visitAndExpr(self, ctx):
-        ltype = self.visit(ctx.expr(0))
-        rtype = self.visit(ctx.expr(1))
+        ltype = yield ctx.expr(0)
+        rtype = yield ctx.expr(1)
         if ltype == rtype == BaseType.Boolean:
-            return BaseType.Boolean
+            return self._typed(ctx, BaseType.Boolean)
         self._raise(ctx, 'and operands', ltype, rtype)
 
     def visitEqualityExpr(self, ctx):
-        ltype = self.visit(ctx.expr(0))
-        rtype = self.visit(ctx.expr(1))
+        ltype = yield ctx.expr(0)
+        rtype = yield ctx.expr(1)
         self._assertSameType(ctx, 'equality operands', ltype, rtype)
-        return BaseType.Boolean
+        return self._typed(ctx, BaseType.Boolean)
 
     def visitRelationalExpr(self, ctx):
-        ltype = self.visit(ctx.expr(0))
-        rtype = self.visit(ctx.expr(1))
+        ltype = yield ctx.expr(0)
+        rtype = yield ctx.expr(1)
         if ltype == rtype == BaseType.Integer:
-            return BaseType.Boolean
+            return self._typed(ctx, BaseType.Boolean)
         elif ltype == rtype == BaseType.Float:
-            return BaseType.Boolean
+            return self._typed(ctx, BaseType.Boolean)
         self._raise(ctx, 'relational operands', ltype, rtype)
 
     def visitAdditiveExpr(self, ctx):
         assert ctx.myop is not None
-        ltype = self.visit(ctx.expr(0))
-        rtype = self.visit(ctx.expr(1))
+        ltype = yield ctx.expr(0)
+        rtype = yield ctx.expr(1)
         if ltype == rtype == BaseType.Integer:
-            return BaseType.Integer
+            return self._typed(ctx, BaseType.Integer)
         elif ltype == rtype == BaseType.Float:
-            return BaseType.Float
+            return self._typed(ctx, BaseType.Float)
         elif ctx.myop.type == MiniCParser.PLUS  and ltype == rtype == BaseType.String:
-            return BaseType.String
+            return self._typed(ctx, BaseType.String)
         self._raise(ctx, 'additive operands', ltype, rtype)
 
     def visitMultiplicativeExpr(self, ctx):
         assert ctx.myop is not None
-        ltype = self.visit(ctx.expr(0))
-        rtype = self.visit(ctx.expr(1))
+        ltype = yield ctx.expr(0)
+        rtype = yield ctx.expr(1)
         if ltype == rtype == BaseType.Integer:
-            return BaseType.Integer
+            return self._typed(ctx, BaseType.Integer)
         elif ctx.myop.type != MiniCParser.MOD and ltype == rtype == BaseType.Float:
-            return BaseType.Float
+            return self._typed(ctx, BaseType.Float)
         self._raise(ctx, 'multiplicative operands', ltype, rtype)
 
     def visitNotExpr(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype == BaseType.Boolean:
-            return BaseType.Boolean
+            return self._typed(ctx, BaseType.Boolean)
         self._raise(ctx, 'not operand', etype)
 
     def visitUnaryMinusExpr(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype == BaseType.Integer or etype == BaseType.Float:
-            return etype
+            return self._typed(ctx, etype)
         self._raise(ctx, 'unary minus operand', etype)
 
     # visit statements
 
     def visitPrintlnintStat(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype != BaseType.Integer:
             self._raise(ctx, 'println_int statement', etype)
 
     def visitPrintlnfloatStat(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype != BaseType.Float:
             self._raise(ctx, 'println_float statement', etype)
 
     def visitPrintlnboolStat(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype != BaseType.Boolean:
             self._raise(ctx, 'println_bool statement', etype)
 
     def visitPrintlnstringStat(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype != BaseType.String:
             self._raise(ctx, 'println_string statement', etype)
 
@@ -187,30 +230,31 @@ class MiniCTypingVisitor(MiniCVisitor):
         if var not in self._memorytypes:
             self._raiseNonType(ctx, "Undefined variable {}".format(var))
         vtype = self._memorytypes[var]
-        etype = self.visit(ctx.expr())
+        self._type_table.slots[ctx] = self._type_table.variables[var][1]
+        etype = yield ctx.expr()
         self._assertSameType(ctx, "{}".format(var), vtype, etype)
 
     def visitWhileStat(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype != BaseType.Boolean:
             self._raise(ctx, 'while statement', etype)
-        self.visit(ctx.body)
+        yield ctx.body
 
     def visitIfStat(self, ctx):
-        etype = self.visit(ctx.expr())
+        etype = yield ctx.expr()
         if etype != BaseType.Boolean:
             self._raise(ctx, 'if statement', etype)
-        self.visit(ctx.then_block)
+        yield ctx.then_block
         if ctx.else_block is not None:
-            self.visit(ctx.else_block)
+            yield ctx.else_block
 
     def visitForStat(self, ctx):
         if ctx.init is not None:
-            self.visit(ctx.init)
+            yield ctx.init
         if ctx.cond is not None:
-            etype = self.visit(ctx.cond)
+            etype = yield ctx.cond
             if etype != BaseType.Boolean:
                 self._raise(ctx, 'for statement', etype)
         if ctx.inc is not None:
-            self.visit(ctx.inc)
-        self.visit(ctx.body)
+            yield ctx.inc
+        yield ctx.body
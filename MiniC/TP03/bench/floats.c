@@ -0,0 +1,30 @@
+#include "printlib.h"
+
+int main(){
+  int i;
+  float x, sum;
+  bool up;
+  i = 0;
+  x = 1.0;
+  sum = 0.0;
+  up = true;
+  while (i < 15000) {
+    sum = sum + x / 4.0;
+    while (sum > 100.0) {
+      sum = sum - 100.0;
+      up = !up;
+    }
+    x = x + 0.5;
+    if (x > 1000.0) {
+      x = 1.0;
+    }
+    i = i + 1;
+  }
+  println_float(sum);
+  println_bool(up);
+  return 0;
+}
+
+// EXPECTED
+// 41.00
+// 1
@@ -0,0 +1,21 @@
+#include "printlib.h"
+
+int main(){
+  int i, s;
+  i = 0;
+  s = 0;
+  while (i < 20000) {
+    s = (s + i * 3 - (i / 7) % 5) % 1000003;
+    if (s > 500 && !(i == 3)) {
+      s = s - 1;
+    } else {
+      s = s + 2;
+    }
+    i = i + 1;
+  }
+  println_int(s);
+  return 0;
+}
+
+// EXPECTED
+// 908323
@@ -0,0 +1,31 @@
+#include "printlib.h"
+
+int main(){
+  int i, j, n, primes;
+  bool prime;
+  primes = 0;
+  for (n = 2; n < 1500; n = n + 1) {
+    prime = true;
+    for (j = 2; j * j <= n; j = j + 1) {
+      if (n % j == 0) {
+        prime = false;
+      }
+    }
+    if (prime) {
+      primes = primes + 1;
+    }
+  }
+  println_int(primes);
+  i = 0;
+  for (n = 0; n < 150; n = n + 1) {
+    for (j = 0; j < 100; j = j + 1) {
+      i = i + (n * j + n + j) % 7;
+    }
+  }
+  println_int(i);
+  return 0;
+}
+
+// EXPECTED
+// 239
+// 51168
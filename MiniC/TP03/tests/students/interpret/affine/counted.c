@@ -0,0 +1,32 @@
+#include "printlib.h"
+
+int main()
+{
+    int i, n, s, t;
+
+    n = 50000;
+    for (i = 0; i < n; i = i + 1)
+    {
+        s = s + 3;
+        t = t + i;
+    }
+    println_int(s);
+    println_int(t);
+    while (n >= 1)
+    {
+        t = t - 2 * n;
+        n = n - 1;
+    }
+    println_int(n);
+    println_int(t);
+    println_int(i);
+    return 0;
+}
+
+// EXPECTED
+// EXECCODE 0
+// 150000
+// 1249975000
+// 0
+// -1250075000
+// 50000
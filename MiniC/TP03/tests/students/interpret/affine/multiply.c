@@ -0,0 +1,32 @@
+#include "printlib.h"
+
+int main()
+{
+    int i, k, s, t;
+
+    s = 1;
+    for (i = 0; i < 60; i = i + 1)
+    {
+        s = s * 2;
+    }
+    println_int(s);
+    // Beyond the values evaluated in closed form
+    t = 1;
+    for (i = 0; i < 3000; i = i + 1)
+    {
+        t = 3 * t + 1;
+    }
+    while (t > 1)
+    {
+        t = t / 3;
+        k = k + 1;
+    }
+    println_int(k);
+    return 0;
+}
+
+// SKIP TEST EXPECTED
+// EXPECTED
+// EXECCODE 0
+// 1152921504606846976
+// 3000
@@ -0,0 +1,4017 @@
+#include "printlib.h"
+
+int main()
+{
+    int x;
+
+    x = 0;
+    // 2000 nested blocks, and 2000 nested parentheses: the parser
+    // recurses deeper than the recursion limit of Python
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+if (x < 1) {
+while (x < 1) {
+x = ((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((((x + 1))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))))));
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+}
+    println_int(x);
+    return 0;
+}
+
+// EXPECTED
+// EXECCODE 0
+// 1
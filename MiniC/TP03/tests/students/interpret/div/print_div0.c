@@ -0,0 +1,61 @@
+#include "printlib.h"
+
+int main()
+{
+    int i;
+
+    i = 0;
+    while (i < 40)
+    {
+        println_int(i);
+        i = i + 1;
+    }
+    // The lines printed come before the error
+    println_int(1 / (i - 40));
+    return 0;
+}
+
+// SKIP TEST EXPECTED
+// EXPECTED
+// EXECCODE 1
+// 0
+// 1
+// 2
+// 3
+// 4
+// 5
+// 6
+// 7
+// 8
+// 9
+// 10
+// 11
+// 12
+// 13
+// 14
+// 15
+// 16
+// 17
+// 18
+// 19
+// 20
+// 21
+// 22
+// 23
+// 24
+// 25
+// 26
+// 27
+// 28
+// 29
+// 30
+// 31
+// 32
+// 33
+// 34
+// 35
+// 36
+// 37
+// 38
+// 39
+// Division by 0
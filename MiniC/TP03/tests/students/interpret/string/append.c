@@ -0,0 +1,33 @@
+#include "printlib.h"
+
+int main()
+{
+    int i;
+    string s, t, u;
+
+    i = 0;
+    while (i < 5)
+    {
+        s = s + "ab";
+        i = i + 1;
+    }
+    // t, s and u share the parts of s, but are different values
+    t = s;
+    s = s + "c";
+    u = t + "d";
+    println_string(s);
+    println_string(t);
+    println_string(u);
+    println_bool(t + "d" == u);
+    println_bool(s == t);
+    return 0;
+}
+
+// SKIP TEST EXPECTED
+// EXPECTED
+// EXECCODE 0
+// abababababc
+// ababababab
+// abababababd
+// 1
+// 0
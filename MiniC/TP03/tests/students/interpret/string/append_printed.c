@@ -0,0 +1,23 @@
+#include "printlib.h"
+
+int main()
+{
+    string r, s, t;
+
+    r = "a";
+    r = r + "b";
+    // Printing r joins its text, before s extends its parts.
+    println_string(r);
+    s = r + "x";
+    t = r + "y";
+    println_string(s);
+    println_string(t);
+    return 0;
+}
+
+// SKIP TEST EXPECTED
+// EXPECTED
+// EXECCODE 0
+// ab
+// abx
+// aby
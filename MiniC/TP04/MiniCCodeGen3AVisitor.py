@@ -1,26 +1,36 @@
-from typing import List, Tuple
-from MiniCVisitor import MiniCVisitor
+from typing import List, Optional, Tuple
 from MiniCParser import MiniCParser
+from TP03.MiniCTypingVisitor import BaseType, TypeTable
 from Lib.LinearCode import LinearCode
 from Lib import RiscV
 from Lib.RiscV import Condition
 from Lib import Operands
-from antlr4.tree.Trees import Trees
 from Lib.Errors import MiniCInternalError, MiniCUnsupportedError
+from Lib.StackVisitor import StackVisitor, Visit, string_tree
 
 """
 CAP, MIF08, three-address code generation + simple alloc
 This visitor constructs an object of type "LinearCode".
 """
 
+# a op b is b MIRRORED[op] a
+MIRRORED = {MiniCParser.LT: MiniCParser.GT, MiniCParser.GT: MiniCParser.LT,
+            MiniCParser.LTEQ: MiniCParser.GTEQ, MiniCParser.GTEQ: MiniCParser.LTEQ}
 
-class MiniCCodeGen3AVisitor(MiniCVisitor):
+# Length of the comment giving the source of each statement: nested
+# statements would repeat each other in the comments of their parents.
+COMMENT_LENGTH = 200
+
+
+class MiniCCodeGen3AVisitor(StackVisitor):
 
     _current_function: LinearCode
 
-    def __init__(self, debug, parser):
+    def __init__(self, debug, parser, types: Optional[TypeTable] = None):
+        # types: the table of MiniCTypingVisitor, None without typing
         super().__init__()
         self._parser = parser
+        self._type_table = types
         self._debug = debug
         self._functions = []
         self._lastlabel = ""
@@ -28,6 +38,24 @@ class MiniCCodeGen3AVisitor(MiniCVisitor):
     def get_functions(self) -> List[LinearCode]:
         return self._functions
 
+    def replace_main(self, printed: List[int], div_by_zero: bool) -> None:
+        """Replace the code of main by the printing of the values `printed`,
+        followed by the division by 0 error if `div_by_zero`, and by
+        "return 0;" otherwise: see TP04/MiniCPartialEvaluation.py."""
+        code = LinearCode("main")
+        code.add_comment("Partially evaluated: the output of the program")
+        tmp = code.fdata.fresh_tmp()
+        for value in printed:
+            code.add_instruction(RiscV.li(tmp, Operands.Immediate(value)))
+            code.add_instruction_PRINTLN_INT(tmp)
+        if div_by_zero:
+            code.add_instruction(RiscV.jump(code.fdata.get_label_div_by_zero()))
+        else:
+            code.add_comment("Return at end of function:")
+            code.add_instruction(RiscV.li(Operands.A0, Operands.Immediate(0)))
+        self._functions = [code if f.fdata.get_name() == "main" else f
+                           for f in self._functions]
+
     def printSymbolTable(self):  # pragma: no cover
         print("--variables to temporaries map--")
         for keys, values in self._symbol_table.items():
@@ -35,9 +63,8 @@ class MiniCCodeGen3AVisitor(MiniCVisitor):
 
     # handle variable decl
 
-    def visitVarDecl(self, ctx) -> None:
-        type_str = ctx.typee().getText()
-        vars_l = self.visit(ctx.id_l())
+    def visitVarDecl(self, ctx) -> Visit[None]:
+        vars_l = yield ctx.id_l()
         for name in vars_l:
             if name in self._symbol_table:
                 raise MiniCInternalError(
@@ -45,24 +72,86 @@ class MiniCCodeGen3AVisitor(MiniCVisitor):
             else:
                 tmp = self._current_function.fdata.fresh_tmp()
                 self._symbol_table[name] = tmp
-                if type_str not in ("int", "bool"):
-                    raise MiniCUnsupportedError("Unsupported type " + type_str)
+                if self._type_table is not None:
+                    vtype = self._type_table.variables[name][0]
+                    supported = vtype in (BaseType.Integer, BaseType.Boolean)
+                else:
+                    supported = ctx.typee().getText() in ("int", "bool")
+                if not supported:
+                    raise MiniCUnsupportedError(
+                        "Unsupported type " + ctx.typee().getText())
                 # Initialization to 0 or False, both represented with 0
                 self._current_function.add_instruction(
                     RiscV.li(tmp, Operands.Immediate(0)))
 
     def visitIdList(self, ctx) -> List[str]:
-        t = self.visit(ctx.id_l())
-        t.append(ctx.ID().getText())
-        return t
-
-    def visitIdListBase(self, ctx) -> List[str]:
-        return [ctx.ID().getText()]
+        # From the last variable to the first one: temporaries are
+        # allocated in this order.
+        return [id.getText() for id in reversed(ctx.ID())]
+
+    # immediate operands
+
+    def _literal(self, ctx) -> Optional[int]:
+        """The value of the expression `ctx` if it is a literal (possibly
+        negated or parenthesized), None otherwise."""
+        sign = 1
+        while True:
+            if isinstance(ctx, MiniCParser.UnaryMinusExprContext):
+                sign = -sign
+                ctx = ctx.expr()
+                continue
+            if not isinstance(ctx, MiniCParser.AtomExprContext):
+                return None
+            atom = ctx.atom()
+            if isinstance(atom, MiniCParser.IntAtomContext):
+                return sign * int(atom.getText())
+            elif isinstance(atom, MiniCParser.BooleanAtomContext):
+                return sign * (1 if atom.TRUE() is not None else 0)
+            elif isinstance(atom, MiniCParser.ParExprContext):
+                ctx = atom.expr()
+                continue
+            return None
+
+    @staticmethod
+    def _negated(ctx) -> bool:
+        """Whether the expression `ctx` is the operand of a unary minus,
+        possibly parenthesized. Its code is only generated if the negated
+        expression is not a literal: then neither is `ctx`."""
+        parent = ctx.parentCtx
+        while isinstance(parent, (MiniCParser.ParExprContext, MiniCParser.AtomExprContext)):
+            parent = parent.parentCtx
+        return isinstance(parent, MiniCParser.UnaryMinusExprContext)
+
+    def _immediate(self, ctx, negated=False) -> Optional[Operands.Immediate]:
+        """The expression `ctx` as the immediate operand of an instruction,
+        if it is a literal which fits in 12 bits (its opposite too with
+        `negated`: sub computes with addi). No code is generated for it."""
+        value = self._literal(ctx)
+        if value is None or not RiscV.fits_imm12(value) \
+                or (negated and not RiscV.fits_imm12(-value)):
+            return None
+        return Operands.Immediate(value)
+
+    def _operands(self, left, right, commutative: bool, negated=False) \
+            -> Visit[Tuple[Operands.Temporary, Operands.DataLocation]]:
+        """The operands of a binary operator applied to the expressions
+        `left` and `right`: the right one may be an Immediate, or the left
+        one, swapped with the right one, if the operator is `commutative`."""
+        imm = self._immediate(right, negated)
+        if imm is not None:
+            return (yield left), imm
+        if commutative:
+            imm = self._immediate(left, negated)
+            if imm is not None:
+                return (yield right), imm
+        tmpl = yield left
+        tmpr = yield right
+        return tmpl, tmpr
 
     # expressions
 
     def visitParExpr(self, ctx) -> Operands.Temporary:
-        return self.visit(ctx.expr())
+        return self.dispatch(ctx.expr())
 
     def visitIntAtom(self, ctx) -> Operands.Temporary:
         val = Operands.Immediate(int(ctx.getText()))
@@ -100,119 +189,144 @@ class MiniCCodeGen3AVisitor(MiniCVisitor):
 
     # now visit expressions
 
-    def visitAtomExpr(self, ctx) -> Operands.Temporary:
-        return self.visit(ctx.atom())
+    # No visitAtomExpr: the default visit method gives the result of the
+    # only child, the atom, without a generator.
 
-    def visitAdditiveExpr(self, ctx) -> Operands.Temporary:
+    def visitAdditiveExpr(self, ctx) -> Visit[Operands.Temporary]:
         assert ctx.myop is not None
-        tmpl: Operands.Temporary = self.visit(ctx.expr(0))
-        tmpr: Operands.Temporary = self.visit(ctx.expr(1))
-        if ctx.myop.type == MiniCParser.PLUS:
-            op = RiscV.add
-        elif ctx.myop.type == MiniCParser.MINUS:
-            op = RiscV.sub
-        else:
-            raise MiniCInternalError("Unknown additive operator")
-        dest = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(op(dest, tmpl, tmpr))
-        return dest
+        return (yield from self._additive(ctx.myop.type, ctx.expr(0), ctx.expr(1)))
 
-    def visitOrExpr(self, ctx) -> Operands.Temporary:
-        op = RiscV.lor
-        tmpl: Operands.Temporary = self.visit(ctx.expr(0))
-        tmpr: Operands.Temporary = self.visit(ctx.expr(1))
-        dest = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(op(dest, tmpl, tmpr))
-        return dest
+    def visitOrExpr(self, ctx) -> Visit[Operands.Temporary]:
+        return (yield from self._binary(RiscV.lor, ctx.expr(0), ctx.expr(1), commutative=True))
 
-    def visitAndExpr(self, ctx) -> Operands.Temporary:
-        op = RiscV.land
-        tmpl: Operands.Temporary = self.visit(ctx.expr(0))
-        tmpr: Operands.Temporary = self.visit(ctx.expr(1))
-        dest = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(op(dest, tmpl, tmpr))
-        return dest
+    def visitAndExpr(self, ctx) -> Visit[Operands.Temporary]:
+        return (yield from self._binary(RiscV.land, ctx.expr(0), ctx.expr(1), commutative=True))
 
-    def visitEqualityExpr(self, ctx) -> Operands.Temporary:
+    def visitEqualityExpr(self, ctx) -> Visit[Operands.Temporary]:
         return self.visitRelationalExpr(ctx)
 
-    def visitRelationalExpr(self, ctx) -> Operands.Temporary:
+    def visitRelationalExpr(self, ctx) -> Visit[Operands.Temporary]:
         assert ctx.myop is not None
         c = Condition(ctx.myop.type)
         if self._debug: # pragma: no cover
             print("relational expression:")
-            print(Trees.toStringTree(ctx, [], self._parser))
+            print(string_tree(ctx, self._parser))
             print("Condition:", c)
-        tmpl: Operands.Temporary = self.visit(ctx.expr(0))
-        tmpr: Operands.Temporary = self.visit(ctx.expr(1))
+        return (yield from self._relational(ctx.myop.type, ctx.expr(0), ctx.expr(1)))
+
+    def visitMultiplicativeExpr(self, ctx) -> Visit[Operands.Temporary]:
+        assert ctx.myop is not None
+        return (yield from self._multiplicative(ctx.myop.type, ctx.expr(0), ctx.expr(1)))
+
+    def visitNotExpr(self, ctx) -> Visit[Operands.Temporary]:
+        return (yield from self._not(ctx.expr()))
+
+    def visitUnaryMinusExpr(self, ctx) -> Visit[Operands.Temporary]:
+        return (yield from self._unary_minus(ctx, ctx.expr()))
+
+    # instruction selection: the operator is given by its token type
+    # `optype`, the operands are the subexpressions `left` and `right`.
+
+    def _binary(self, op, left, right, commutative: bool, negated=False) \
+            -> Visit[Operands.Temporary]:
+        tmpl, tmpr = yield from self._operands(left, right, commutative, negated)
         dest = self._current_function.fdata.fresh_tmp()
-        imm0 = Operands.Immediate(0)
-        imm1 = Operands.Immediate(1)
-        endl = self._current_function.fdata.fresh_label('end_rel_expr')
-        self._current_function.add_instruction(RiscV.li(dest, imm1))
-        jump = RiscV.conditional_jump(endl, tmpl, c, tmpr)
-        self._current_function.add_instruction(jump)
-        self._current_function.add_instruction(RiscV.li(dest, imm0))
-        self._current_function.add_label(endl)
+        self._current_function.add_instruction(op(dest, tmpl, tmpr))
         return dest
 
-    def visitMultiplicativeExpr(self, ctx) -> Operands.Temporary:
-        assert ctx.myop is not None
+    def _additive(self, optype: int, left, right) -> Visit[Operands.Temporary]:
+        if optype == MiniCParser.PLUS:
+            return (yield from self._binary(RiscV.add, left, right, commutative=True))
+        elif optype == MiniCParser.MINUS:
+            return (yield from self._binary(RiscV.sub, left, right, commutative=False,
+                                            negated=True))
+        else:
+            raise MiniCInternalError("Unknown additive operator")
+
+    def _relational(self, optype: int, left, right) -> Visit[Operands.Temporary]:
+        # Computed without branches: with slt for the order, seqz and snez
+        # for the equality. The other comparisons are first rewritten to
+        # a < b, a >= b (= not a < b), a == b or a != b.
+        if self._immediate(right) is None and self._immediate(left) is not None:
+            # The literal on the right: c < a is a > c...
+            left, right, optype = right, left, MIRRORED.get(optype, optype)
+        value = self._literal(right)
+        if optype in (MiniCParser.GT, MiniCParser.LTEQ) \
+                and value is not None and RiscV.fits_imm12(value + 1):
+            # a > c is a >= c + 1, a <= c is a < c + 1
+            tmpl = yield left
+            tmpr = Operands.Immediate(value + 1)
+            optype = MiniCParser.GTEQ if optype == MiniCParser.GT else MiniCParser.LT
+        elif optype in (MiniCParser.GT, MiniCParser.LTEQ):
+            # a > b is b < a, a <= b is b >= a
+            tmpr = yield left
+            tmpl = yield right
+            optype = MiniCParser.LT if optype == MiniCParser.GT else MiniCParser.GTEQ
+        else:
+            tmpl, tmpr = yield from self._operands(left, right, commutative=False)
+        dest = self._current_function.fdata.fresh_tmp()
+        if optype in (MiniCParser.EQ, MiniCParser.NEQ):
+            if value != 0:
+                # a == b is a ^ b == 0
+                self._current_function.add_instruction(RiscV.xor(dest, tmpl, tmpr))
+                tmpl = dest
+            test = RiscV.seqz if optype == MiniCParser.EQ else RiscV.snez
+            self._current_function.add_instruction(test(dest, tmpl))
+        else:
+            self._current_function.add_instruction(RiscV.slt(dest, tmpl, tmpr))
+            if optype == MiniCParser.GTEQ:
+                self._current_function.add_instruction(
+                    RiscV.xor(dest, dest, Operands.Immediate(1)))
+        return dest
 
+    def _multiplicative(self, optype: int, left, right) -> Visit[Operands.Temporary]:
         div_by_zero_lbl = self._current_function.fdata.get_label_div_by_zero()
 
-        tmpl: Operands.Temporary = self.visit(ctx.expr(0))
-        tmpr: Operands.Temporary = self.visit(ctx.expr(1))
+        tmpl: Operands.Temporary = yield left
+        tmpr: Operands.Temporary = yield right
         dest = self._current_function.fdata.fresh_tmp()
 
         op_type = {MiniCParser.MULT: RiscV.mul, MiniCParser.DIV: RiscV.div, MiniCParser.MOD: RiscV.rem}
-        if ctx.myop.type not in op_type:
+        if optype not in op_type:
             raise MiniCInternalError("Unknown multiplicative operator")
 
-        if ctx.myop.type == MiniCParser.DIV or ctx.myop.type == MiniCParser.MOD:
-            imm0= Operands.Immediate(0)
-            zero = self._current_function.fdata.fresh_tmp()
-            self._current_function.add_instruction(RiscV.li(zero, imm0))
-
-            jump = RiscV.conditional_jump
-            cond = Condition(MiniCParser.EQ)
-            self._current_function.add_instruction(jump(div_by_zero_lbl, tmpr, cond, zero))
+        if (optype == MiniCParser.DIV or optype == MiniCParser.MOD) \
+                and self._literal(right) in (None, 0):
+            # Only checked if the divisor isn't a nonzero literal
+            self._current_function.add_instruction(RiscV.beqz(div_by_zero_lbl, tmpr))
 
-        op = op_type[ctx.myop.type]
+        op = op_type[optype]
         self._current_function.add_instruction(op(dest, tmpl, tmpr))
         return dest
 
-    def visitNotExpr(self, ctx) -> Operands.Temporary:
-        tmp: Operands.Temporary = self.visit(ctx.expr())
-        # 1 is loaded in a temporary because sub does not support immediate
-        imm1 = Operands.Immediate(1)
-        one = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(RiscV.li(one, imm1))
+    def _not(self, expr) -> Visit[Operands.Temporary]:
+        tmp: Operands.Temporary = yield expr
         dest = self._current_function.fdata.fresh_tmp()
-        # Use sub 1 - x because not doest not exist
-        self._current_function.add_instruction(RiscV.sub(dest, one, tmp))
+        self._current_function.add_instruction(RiscV.seqz(dest, tmp))
         return dest
 
-    def visitUnaryMinusExpr(self, ctx) -> Operands.Temporary:
-        tmp = self.visit(ctx.expr())
-        # 0 is loaded in a temporary because sub does not support immediate
-        imm0 = Operands.Immediate(0)
-        zero = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(RiscV.li(zero, imm0))
+    def _unary_minus(self, node, expr) -> Visit[Operands.Temporary]:
+        # node is -expr
+        value = None if self._negated(node) else self._literal(node)
         dest = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(RiscV.sub(dest, zero, tmp))
+        if value is not None:
+            # A negative literal
+            self._current_function.add_instruction(RiscV.li(dest, Operands.Immediate(value)))
+            return dest
+        tmp = yield expr
+        self._current_function.add_instruction(RiscV.neg(dest, tmp))
         return dest
 
-    def visitProgRule(self, ctx) -> None:
-        self.visitChildren(ctx)
+    def visitProgRule(self, ctx) -> Visit[None]:
+        yield from self.visitChildren(ctx)
 
-    def visitFuncDef(self, ctx) -> None:
+    def visitFuncDef(self, ctx) -> Visit[None]:
         funcname = ctx.ID().getText()
         self._current_function = LinearCode(funcname)
         self._symbol_table = dict()
 
-        self.visit(ctx.vardecl_l())
-        self.visit(ctx.block())
+        yield ctx.vardecl_l()
+        yield ctx.block()
         self._current_function.add_comment("Return at end of function:")
         # This skeleton doesn't deal properly with functions, and
         # hardcodes a "return 0;" at the end of function. Generate
@@ -222,65 +336,55 @@ class MiniCCodeGen3AVisitor(MiniCVisitor):
         self._functions.append(self._current_function)
         del self._current_function
 
-    def visitAssignStat(self, ctx) -> None:
+    def visitAssignStat(self, ctx) -> Visit[None]:
         if self._debug: # pragma: no cover
             print("assign statement, rightexpression is:")
-            print(Trees.toStringTree(ctx.expr(), [], self._parser))
-        expr_temp = self.visit(ctx.expr())
+            print(string_tree(ctx.expr(), self._parser))
+        expr_temp = yield ctx.expr()
         name = ctx.ID().getText()
         self._current_function.add_instruction(RiscV.mv(self._symbol_table[name], expr_temp))
 
-    def visitIfStat(self, ctx) -> None:
+    def visitIfStat(self, ctx) -> Visit[None]:
         if self._debug: # pragma: no cover
             print("if statement, condition is")
-            print(Trees.toStringTree(ctx.expr(), None, self._parser))
+            print(string_tree(ctx.expr(), self._parser))
             print("and block is:")
-            print(Trees.toStringTree(ctx.then_block, None, self._parser))
+            print(string_tree(ctx.then_block, self._parser))
             if ctx.else_block is not None:
                 print("else block is:")
-                print(Trees.toStringTree(ctx.else_block, None, self._parser))
+                print(string_tree(ctx.else_block, self._parser))
         end_if_label = self._current_function.fdata.fresh_label("end_if")
         else_label = self._current_function.fdata.fresh_label("else")
 
-        tmp = self.visit(ctx.expr())
+        tmp = yield ctx.expr()
 
-        jump = RiscV.conditional_jump
-        cond = Condition(MiniCParser.EQ)
-        imm0 = Operands.Immediate(0)
-        zero = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(RiscV.li(zero, imm0))
-        self._current_function.add_instruction(jump(else_label, tmp, cond, zero))
+        self._current_function.add_instruction(RiscV.beqz(else_label, tmp))
 
-        self.visit(ctx.then_block)
+        yield ctx.then_block
         self._current_function.add_instruction(RiscV.jump(end_if_label))
 
         self._current_function.add_label(else_label)
         if ctx.else_block is not None:
-            self.visit(ctx.else_block)
+            yield ctx.else_block
 
         self._current_function.add_label(end_if_label)
 
-    def visitWhileStat(self, ctx) -> None:
+    def visitWhileStat(self, ctx) -> Visit[None]:
         if self._debug: # pragma: no cover
             print("while statement, condition is:")
-            print(Trees.toStringTree(ctx.expr(), [], self._parser))
+            print(string_tree(ctx.expr(), self._parser))
             print("and block is:")
-            print(Trees.toStringTree(ctx.stat_block(), None, self._parser))
+            print(string_tree(ctx.stat_block(), self._parser))
         loop_label = self._current_function.fdata.fresh_label("loop")
         end_loop_label = self._current_function.fdata.fresh_label("end_loop")
 
         self._current_function.add_label(loop_label)
 
-        tmp = self.visit(ctx.expr())
+        tmp = yield ctx.expr()
 
-        jump = RiscV.conditional_jump
-        cond = Condition(MiniCParser.EQ)
-        imm0 = Operands.Immediate(0)
-        zero = self._current_function.fdata.fresh_tmp()
-        self._current_function.add_instruction(RiscV.li(zero, imm0))
-        self._current_function.add_instruction(jump(end_loop_label, tmp, cond, zero))
+        self._current_function.add_instruction(RiscV.beqz(end_loop_label, tmp))
 
-        self.visit(ctx.stat_block())
+        yield ctx.stat_block()
 
         self._current_function.add_instruction(RiscV.jump(loop_label))
 
@@ -288,15 +392,15 @@ class MiniCCodeGen3AVisitor(MiniCVisitor):
 
     # visit statements
 
-    def visitPrintlnintStat(self, ctx) -> None:
-        expr_loc = self.visit(ctx.expr())
+    def visitPrintlnintStat(self, ctx) -> Visit[None]:
+        expr_loc = yield ctx.expr()
         if self._debug: # pragma: no cover
             print("print_int statement, expression is:")
-            print(Trees.toStringTree(ctx.expr(), [], self._parser))
+            print(string_tree(ctx.expr(), self._parser))
         self._current_function.add_instruction_PRINTLN_INT(expr_loc)
 
-    def visitPrintlnboolStat(self, ctx) -> None:
-        expr_loc = self.visit(ctx.expr())
+    def visitPrintlnboolStat(self, ctx) -> Visit[None]:
+        expr_loc = yield ctx.expr()
         self._current_function.add_instruction_PRINTLN_INT(expr_loc)
 
     def visitPrintlnfloatStat(self, ctx) -> None:
@@ -305,35 +409,31 @@ class MiniCCodeGen3AVisitor(MiniCVisitor):
     def visitPrintlnstringStat(self, ctx) -> None:
         raise MiniCUnsupportedError("Unsupported type string")
 
-    def visitStatList(self, ctx) -> None:
+    def visitStatList(self, ctx) -> Visit[None]:
         for stat in ctx.stat():
-            self._current_function.add_comment(Trees.toStringTree(stat, [], self._parser))
-            self.visit(stat)
+            self._current_function.add_comment(
+                string_tree(stat, self._parser, COMMENT_LENGTH))
+            yield stat
 
-    def visitForStat(self, ctx):
+    def visitForStat(self, ctx) -> Visit[None]:
         loop_label = self._current_function.fdata.fresh_label("loop")
         end_loop_label = self._current_function.fdata.fresh_label("end_loop")
 
         if ctx.init is not None:
-            self.visit(ctx.init)
+            yield ctx.init
 
         self._current_function.add_label(loop_label)
 
 
-        tmp = self.visit(ctx.cond) if ctx.cond is not None else None
+        tmp = (yield ctx.cond) if ctx.cond is not None else None
 
         if tmp is not None:
-            jump = RiscV.conditional_jump
-            cond = Condition(MiniCParser.EQ)
-            imm0 = Operands.Immediate(0)
-            zero = self._current_function.fdata.fresh_tmp()
-            self._current_function.add_instruction(RiscV.li(zero, imm0))
-            self._current_function.add_instruction(jump(end_loop_label, tmp, cond, zero))
+            self._current_function.add_instruction(RiscV.beqz(end_loop_label, tmp))
 
-        self.visit(ctx.body)
+        yield ctx.body
 
         if ctx.inc is not None:
-            self.visit(ctx.inc)
+            yield ctx.inc
 
         self._current_function.add_instruction(RiscV.jump(loop_label))
 
@@ -0,0 +1,116 @@
+"""
+Whole-program partial evaluation, for code generation.
+
+The main function of a MiniC program reads no input: if the program
+terminates, what it prints is known at compile time. With the option
+`--partial-eval` of MiniCC.py, the program is first evaluated by
+:py:class:`MachineInterpretVisitor`, within a budget of statements
+(`--partial-eval-fuel`, see Lib/StatementBudget.py). If it terminates within the budget,
+:py:meth:`MiniCCodeGen3AVisitor.replace_main` replaces the code of main
+by the printing of the values it printed, followed by its exit: the
+return, or the division by 0 error. Otherwise, the program is compiled
+as usual.
+
+The generated code computes on 64-bit integers, and its division
+rounds toward 0, while MiniCInterpretVisitor computes on the integers of
+Python, and its division rounds toward minus infinity.
+MachineInterpretVisitor divides as the generated code does, and gives up
+on any result which doesn't fit in 64 bits.
+"""
+
+from typing import List, Optional, Tuple
+
+from MiniCParser import MiniCParser
+from TP03.MiniCInterpretVisitor import MiniCInterpretVisitor
+from TP03.MiniCTypingVisitor import TypeTable
+from Lib.Errors import MiniCRuntimeError, MiniCTimeoutError
+from Lib.StackVisitor import Visit
+from Lib.StatementBudget import StatementBudget
+
+# Default budget of statements of the evaluation
+DEFAULT_FUEL = 10 ** 6
+
+# Values printed beyond which the program is compiled as usual: the
+# straight-line code would be larger than the program.
+MAX_PRINTED = 10 ** 4
+
+INT_MIN = -2 ** 63
+INT_MAX = 2 ** 63 - 1
+
+
+class NotEvaluable(Exception):
+    """The evaluation differs from the execution of the generated code."""
+    pass
+
+
+def _checked(value: int) -> int:
+    if not INT_MIN <= value <= INT_MAX:
+        raise NotEvaluable()
+    return value
+
+
+class MachineInterpretVisitor(MiniCInterpretVisitor):
+    """
+    MiniCInterpretVisitor computing as the generated code does, and
+    recording the values printed, in `printed`, instead of printing them.
+    """
+
+    printed: List[int]
+
+    def __init__(self, types: TypeTable):
+        super().__init__(types)
+        self.printed = []
+
+    def _closedForm(self, ctx) -> bool:
+        # A loop evaluated in closed form would not check the range of
+        # the intermediate values.
+        return False
+
+    def visitAdditiveExpr(self, ctx) -> Visit[int]:
+        return _checked((yield from super().visitAdditiveExpr(ctx)))
+
+    def visitMultiplicativeExpr(self, ctx) -> Visit[int]:
+        assert ctx.myop is not None
+        if ctx.myop.type == MiniCParser.MULT:
+            return _checked((yield from super().visitMultiplicativeExpr(ctx)))
+        lval = yield ctx.expr(0)
+        rval = yield ctx.expr(1)
+        if rval == 0:
+            raise MiniCRuntimeError("Division by 0")
+        # RISC-V div and rem: the quotient is rounded toward 0.
+        quotient = abs(lval) // abs(rval)
+        if (lval < 0) != (rval < 0):
+            quotient = -quotient
+        if ctx.myop.type == MiniCParser.DIV:
+            return _checked(quotient)
+        return _checked(lval - rval * quotient)
+
+    def visitUnaryMinusExpr(self, ctx) -> Visit[int]:
+        return _checked(-(yield ctx.expr()))
+
+    def visitPrintlnintStat(self, ctx) -> Visit[None]:
+        if len(self.printed) == MAX_PRINTED:
+            raise NotEvaluable()
+        # Booleans are printed as integers by the generated code.
+        self.printed.append(int((yield ctx.expr())))
+
+    visitPrintlnboolStat = visitPrintlnintStat
+
+
+def partial_evaluation(tree, types: TypeTable,
+                       fuel: int = DEFAULT_FUEL) -> Optional[Tuple[List[int], bool]]:
+    """Evaluate the program `tree`, which code generation accepts (its
+    values are int and bool), with at most `fuel` statements, and return
+    the values it prints, and whether it stops on a division by 0. Return
+    None if the program must be compiled as usual."""
+    interpreter = MachineInterpretVisitor(types)
+    StatementBudget(fuel).watch(interpreter)
+    try:
+        interpreter.visit(tree)
+    except MiniCRuntimeError as e:
+        if e.args[0] != "Division by 0":
+            return None  # No main function, or other functions
+        return interpreter.printed, True
+    except (MiniCTimeoutError, NotEvaluable):
+        return None
+    return interpreter.printed, False
@@ -0,0 +1,125 @@
+from types import GeneratorType
+from typing import Dict
+from MiniCParser import MiniCParser
+from TP03.MiniCTypingVisitor import MiniCTypingVisitor, BaseType
+from TP04.MiniCCodeGen3AVisitor import MiniCCodeGen3AVisitor
+from Lib.Errors import MiniCUnsupportedError
+from Lib.StackVisitor import Visit
+
+"""
+CAP, MIF08, type checking and three-address code generation in a single
+traversal of the parse tree.
+This visitor constructs the same "LinearCode" as MiniCCodeGen3AVisitor,
+and raises the same errors as MiniCTypingVisitor followed by
+MiniCCodeGen3AVisitor.
+"""
+
+
+class _SubexprTyping(MiniCTypingVisitor):
+    """Typing visitor which takes the types of the subexpressions already
+    typed by MiniCTypedCodeGen3AVisitor instead of visiting them again."""
+
+    def __init__(self, types):
+        super().__init__()
+        self._types = types
+
+    def _method(self, cls):
+        method = super()._method(cls)
+        if not issubclass(cls, (MiniCParser.ExprContext, MiniCParser.AtomContext)):
+            return method
+
+        def visit(tree):
+            try:
+                return self._types.pop(tree)
+            except KeyError:
+                return method(tree)
+        return visit
+
+
+# Statements whose condition must be checked as soon as it is typed.
+CONDITIONS = {
+    MiniCParser.IfStatContext: 'if statement',
+    MiniCParser.WhileStatContext: 'while statement',
+    MiniCParser.ForStatContext: 'for statement',
+}
+
+
+class MiniCTypedCodeGen3AVisitor(MiniCCodeGen3AVisitor):
+
+    _types: Dict[MiniCParser.ExprContext, BaseType]
+
+    def __init__(self, debug, parser):
+        super().__init__(debug, parser)
+        # Types of the expressions visited, until their parent is typed.
+        self._types = dict()
+        self._typing = _SubexprTyping(self._types)
+        self._type_table = self._typing.get_type_table()
+
+    def _method(self, cls):
+        # Each expression is typed right after its code is generated, from
+        # the types of its subexpressions: errors are found in the same
+        # order as MiniCTypingVisitor does.
+        method = super()._method(cls)
+        if issubclass(cls, MiniCParser.IdAtomContext):
+            def visit(tree):
+                # Typed first: code generation expects a declared variable.
+                self._types[tree] = self._typing.visit(tree)
+                return method(tree)
+            return visit
+        elif issubclass(cls, (MiniCParser.ExprContext, MiniCParser.AtomContext)):
+            return lambda tree: self._visitTyped(method, tree)
+        elif issubclass(cls, MiniCParser.Stat_blockContext):
+            def visit(tree):
+                if isinstance(tree.parentCtx, MiniCParser.ForStatContext) \
+                        and tree.parentCtx.inc is not None:
+                    # MiniCTypingVisitor checks the increment before the body.
+                    self._typing.visit(tree.parentCtx.inc)
+                return method(tree)
+            return visit
+        return method
+
+    def _visitTyped(self, method, tree) -> Visit:
+        tmp = method(tree)
+        if type(tmp) is GeneratorType:
+            tmp = yield tmp
+        self._types[tree] = self._typing.visit(tree)
+        self._check_condition(tree)
+        return tmp
+
+    def _check_condition(self, tree) -> None:
+        stat = tree.parentCtx
+        for_what = CONDITIONS.get(type(stat))
+        if for_what is None or (isinstance(stat, MiniCParser.ForStatContext)
+                                and tree is not stat.cond):
+            return
+        etype = self._types.pop(tree)
+        if etype != BaseType.Boolean:
+            self._typing._raise(stat, for_what, etype)
+
+    def visitProgRule(self, ctx) -> Visit[None]:
+        try:
+            yield from super().visitProgRule(ctx)
+        except MiniCUnsupportedError:
+            # Type errors are reported first, even when they come after
+            # the unsupported construct: finish type checking.
+            MiniCTypingVisitor().visit(ctx)
+            raise
+
+    def visitVarDecl(self, ctx) -> Visit[None]:
+        self._typing.visit(ctx)
+        yield from super().visitVarDecl(ctx)
+
+    def visitAssignStat(self, ctx) -> Visit[None]:
+        var = ctx.ID().getText()
+        if var not in self._typing._memorytypes:
+            self._typing._raiseNonType(ctx, "Undefined variable {}".format(var))
+        yield from super().visitAssignStat(ctx)
+        self._typing.visit(ctx)
+
+    def visitPrintlnintStat(self, ctx) -> Visit[None]:
+        yield from super().visitPrintlnintStat(ctx)
+        self._typing.visit(ctx)
+
+    def visitPrintlnboolStat(self, ctx) -> Visit[None]:
+        yield from super().visitPrintlnboolStat(ctx)
+        self._typing.visit(ctx)
@@ -0,0 +1,56 @@
+#include "printlib.h"
+
+int main()
+{
+    int x, y;
+    bool b;
+    x = 5;
+    y = x + 2047 - 2048 + (-7) - (-2048);
+    println_int(y);
+    println_int(3 - x);
+    println_int(1 + x);
+    println_int(-x);
+    println_int(x / 2);
+    println_int(x % 3);
+    b = !(x < 3) && true || false;
+    println_bool(b);
+    println_bool(3 < x);
+    println_bool(x <= 5);
+    println_bool(x > 5);
+    println_bool(2047 >= x);
+    println_bool(x > 2047);
+    println_bool(x <= -2049);
+    println_bool(x == 0);
+    println_bool(0 != x);
+    println_bool(x == 5);
+    println_bool(x == y);
+    println_bool(b == true);
+    while (x > 0) {
+        x = x - 1;
+    }
+    if (x == 0) {
+        println_int(42);
+    }
+    return 0;
+}
+
+// EXPECTED
+// 2045
+// -2
+// 6
+// -5
+// 2
+// 2
+// 1
+// 1
+// 1
+// 0
+// 1
+// 0
+// 0
+// 0
+// 1
+// 1
+// 0
+// 1
+// 42
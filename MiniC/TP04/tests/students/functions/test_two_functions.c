@@ -0,0 +1,23 @@
+#include "printlib.h"
+
+int f()
+{
+    int x;
+    x = 1;
+    while (x < 10) {
+        x = x + 1;
+    }
+    println_int(x);
+    return 0;
+}
+
+int main()
+{
+    int y;
+    y = 2;
+    println_int(y * 3);
+    return 0;
+}
+
+// EXPECTED
+// 6
@@ -257,12 +257,20 @@ class CondConstantPropagation:
             return mod_rd_0(args[0], args[1])
         elif name == "sub":
             return args[0] - args[1]
-        elif name == "and":
+        elif name == "and" or name == "andi":
             return args[0] & args[1]
-        elif name == "or":
+        elif name == "or" or name == "ori":
             return args[0] | args[1]
         elif name == "xor" or name == "xori":
             return args[0] ^ args[1]
+        elif name == "slt" or name == "slti":
+            return int(args[0] < args[1])
+        elif name == "seqz":
+            return int(args[0] == 0)
+        elif name == "snez":
+            return int(args[0] != 0)
+        elif name == "neg":
+            return -args[0]
         elif name == "li":
             assert (isinstance(ins.used()[0], Immediate))
             return args[0]
@@ -271,7 +279,8 @@ class CondConstantPropagation:
 
         raise MiniCInternalError("Instruction modifying a temporary not in\
                                   ['add', 'addi', 'mul', 'div', 'rem',\
-                                  'sub', 'and', 'or', 'xor', 'xori', 'li', 'mv']")
+                                  'sub', 'and', 'andi', 'or', 'ori', 'xor', 'xori',\
+                                  'slt', 'slti', 'seqz', 'snez', 'neg', 'li', 'mv']")
 
     def eval_bool_instr(self, ins: BranchingTerminator) -> LATTICE_VALUE:
         """
@@ -0,0 +1,138 @@
+#! /usr/bin/env python3
+"""
+Benchmark of the evaluation engines of MiniCC.py (--engine), on the
+loop-heavy programs of TP03/bench by default:
+
+    python3 bench_eval.py [--engines visitor,closure,vm,pyast] [--repeat 3] [file.c ...]
+
+Each program is parsed and typechecked once, then evaluated by each
+engine, compilation to closures, bytecode or Python included, with its output
+captured: all engines must print the same thing. The best time of each
+engine is reported, with its speedup over MiniCInterpretVisitor.
+"""
+
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+from typing import Callable, Dict
+import glob
+import os
+import sys
+
+import antlr4
+
+from MiniCLexer import MiniCLexer
+from MiniCParser import MiniCParser
+from MiniCC import parse
+from TP03.MiniCTypingVisitor import MiniCTypingVisitor, TypeTable
+from TP03.MiniCInterpretVisitor import MiniCInterpretVisitor
+from TP03.MiniCClosureVisitor import MiniCClosureVisitor
+from TP03.MiniCBytecodeVisitor import MiniCBytecodeVisitor
+from TP03.MiniCBytecode import run as run_bytecode
+from TP03.MiniCPythonVisitor import MiniCPythonVisitor, compile_module, run as run_python
+from Lib.Errors import MiniCRuntimeError
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+
+
+def eval_visitor(tree, types: TypeTable) -> None:
+    MiniCInterpretVisitor(types).visit(tree)
+
+
+def eval_closure(tree, types: TypeTable) -> None:
+    MiniCClosureVisitor(types).visit(tree)()
+
+
+def eval_vm(tree, types: TypeTable) -> None:
+    compiler = MiniCBytecodeVisitor(types)
+    compiler.visit(tree)
+    run_bytecode(compiler.get_bytecode())
+
+
+def eval_pyast(tree, types: TypeTable) -> None:
+    code = compile_module(MiniCPythonVisitor(types).visit(tree))
+    if code is None:
+        eval_closure(tree, types)  # As MiniCC.py
+    else:
+        run_python(code)
+
+
+ENGINES: Dict[str, Callable] = {
+    "visitor": eval_visitor,
+    "closure": eval_closure,
+    "vm": eval_vm,
+    "pyast": eval_pyast,
+}
+
+
+def load(filename: str):
+    """Parse tree and types of the program `filename`."""
+    lexer = MiniCLexer(antlr4.FileStream(filename, encoding='utf-8'))
+    parser = MiniCParser(antlr4.CommonTokenStream(lexer))
+    tree = parse(parser)
+    typing = MiniCTypingVisitor()
+    typing.visit(tree)
+    return tree, typing.get_type_table()
+
+
+def measure(engine: Callable, tree, types: TypeTable, repeat: int):
+    """Best time of `repeat` evaluations, and the output."""
+    best = None
+    output = ""
+    for _ in range(repeat):
+        out = StringIO()
+        start = perf_counter()
+        try:
+            with redirect_stdout(out):
+                engine(tree, types)
+        except MiniCRuntimeError as e:
+            out.write(e.args[0] + "\n")
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        output = out.getvalue()
+    return best, output
+
+
+def main() -> int:
+    arg_parser = ArgumentParser(description='Benchmark of the MiniC evaluation engines')
+    arg_parser.add_argument('filename', type=str, nargs='*',
+                            help='Programs to evaluate (default: TP03/bench/*.c)')
+    arg_parser.add_argument('--engines', type=str, default=",".join(ENGINES),
+                            help='Comma-separated engines (default: %(default)s)')
+    arg_parser.add_argument('--repeat', type=int, default=3,
+                            help='Evaluations of each program by each engine, '
+                            'the best time is kept (default: %(default)s)')
+    args = arg_parser.parse_args()
+    engines = args.engines.split(",")
+    for engine in engines:
+        if engine not in ENGINES:
+            print("error: unknown engine {}".format(engine))
+            return 1
+    filenames = args.filename or sorted(glob.glob(os.path.join(HERE, 'TP03/bench/*.c')))
+    print("{:<24}".format("program") + "".join("{:>18}".format(e) for e in engines))
+    status = 0
+    for filename in filenames:
+        tree, types = load(filename)
+        line = "{:<24}".format(os.path.basename(filename))
+        reference = None
+        visitor_time = None
+        for engine in engines:
+            elapsed, output = measure(ENGINES[engine], tree, types, args.repeat)
+            if reference is None:
+                reference = output
+            elif output != reference:
+                print("error: {} prints a different output on {}".format(engine, filename))
+                status = 1
+            if engine == "visitor":
+                visitor_time = elapsed
+            cell = "{:.3f}s".format(elapsed)
+            if visitor_time is not None and engine != "visitor":
+                cell += " (x{:.1f})".format(visitor_time / elapsed)
+            line += "{:>18}".format(cell)
+        print(line)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -75,14 +75,22 @@ ALL_IN_MEM_FILES.sort()
 ALL_FILES = list(set(ALL_FILES))
 ALL_FILES.sort()
 
+# Files for --fused-typing: with the typing errors of TP03
+TYPING_ERROR_FILES = [f for f in glob.glob(os.path.join(TEST_DIR, 'TP03/tests/**/*.c'),
+                                           recursive=True)
+                      if "// EXITCODE 2" in open(f, encoding='utf-8').read()]
+FUSED_TYPING_FILES = sorted(set(ALL_IN_MEM_FILES) | set(TYPING_ERROR_FILES))
+
 if 'TEST_FILES' in os.environ:
     ALLOC_FILES = ALL_FILES
     ALL_IN_MEM_FILES = ALL_FILES
+    FUSED_TYPING_FILES = ALL_FILES
 
 if 'FILTER' in os.environ:
     ALL_FILES = filter_pathnames(ALL_FILES, os.environ['FILTER'])
     ALLOC_FILES = filter_pathnames(ALLOC_FILES, os.environ['FILTER'])
     ALL_IN_MEM_FILES = filter_pathnames(ALL_IN_MEM_FILES, os.environ['FILTER'])
+    FUSED_TYPING_FILES = filter_pathnames(FUSED_TYPING_FILES, os.environ['FILTER'])
 
 
 class TestCodeGen(TestExpectPragmas, TestCompiler):
@@ -152,6 +160,78 @@ class TestCodeGen(TestExpectPragmas, TestCompiler):
         actual = self.compile_and_simulate(filename, expect, 'smart')
         self.assert_equal(actual, expect, "MiniCC with smart alloc")
 
+    @pytest.mark.parametrize('filename', ALL_IN_MEM_FILES)
+    def test_partial_eval(self, filename):
+        """Generate code with --partial-eval: the program is evaluated at
+        compile time, and its output printed by straight-line code."""
+        if DISABLE_TYPECHECK or DISABLE_CODEGEN or "--fused-typing" in MINICC_OPTS:
+            pytest.skip("--partial-eval needs typechecking and code generation")
+        cat(filename)  # For diagnosis
+        expect = self.get_expect(filename)
+        self.MINICC_OPTS = MINICC_OPTS + ["--partial-eval"]
+        actual = self.compile_and_simulate(filename, expect, 'all-in-mem')
+        self.assert_equal(actual, expect, "MiniCC with --partial-eval")
+
+    def linear_code(self, filename, output, reg_alloc, opts):
+        """The exit code of MiniCC.py generating the linear code of
+        `filename` in `output`, its output (e.g. error messages), and this
+        code without its headers."""
+        res = self.run_command([sys.executable, MINIC_COMPILE, "--mode=codegen-linear",
+                                "--reg-alloc=" + reg_alloc, "--output=" + output]
+                               + opts + [filename])
+        if not os.path.exists(output):
+            return res.exitcode, res.output, None
+        with open(output) as f:
+            # Without the header of each function: the compiler and its options
+            code = "".join(line for line in f
+                           if not line.startswith(("# Code generated by", "# Options:")))
+        os.remove(output)
+        return res.exitcode, res.output, code
+
+    @pytest.mark.parametrize('reg_alloc', ['none', 'naive'])
+    @pytest.mark.parametrize('filename', FUSED_TYPING_FILES)
+    def test_fused_typing(self, filename, reg_alloc, tmp_path):
+        """The typing during code generation (--fused-typing) gives the
+        same code and the same typing errors as the typechecker."""
+        if DISABLE_CODEGEN:
+            pytest.skip("--fused-typing needs code generation")
+        output = str(tmp_path / "linear.s")
+        fused = self.linear_code(filename, output, reg_alloc, ["--fused-typing"])
+        expected = self.linear_code(filename, output, reg_alloc, [])
+        assert fused[:2] == expected[:2]
+        # Without --fused-typing, the file is opened before the code
+        # generation fails.
+        if expected[0] == 0:
+            assert fused[2] == expected[2]
+
+    def test_immediates(self, tmp_path):
+        """The instruction selection of MiniCCodeGen3AVisitor: immediate
+        operands, slt, seqz and snez, beqz, neg, and no division check for
+        a nonzero literal divisor."""
+        if DISABLE_CODEGEN:
+            pytest.skip("needs code generation")
+        filename = os.path.join(TEST_DIR, 'TP04/tests/students/exprs/test_immediates.c')
+        output = str(tmp_path / "immediates.s")
+        exitcode, _, code = self.linear_code(filename, output, "none", [])
+        assert exitcode == 0
+        instrs = [line.split()[0] for line in code.splitlines() if line.strip()]
+        for instr in ("addi", "slti", "xori", "seqz", "snez", "beqz", "neg"):
+            assert instr in instrs
+        # Only the loop and the if branch
+        assert instrs.count("beqz") == 2
+
+    @pytest.mark.parametrize('opts', [[], ["--fused-typing"]])
+    def test_deep_program(self, opts, tmp_path):
+        """Code generation for blocks and parentheses nested deeper than
+        the Python recursion limit."""
+        if DISABLE_CODEGEN:
+            pytest.skip("needs code generation")
+        filename = os.path.join(TEST_DIR, 'TP03/tests/students/interpret/deep/nested.c')
+        output = str(tmp_path / "nested.s")
+        exitcode, _, code = self.linear_code(filename, output, "none", opts)
+        assert exitcode == 0
+        assert "call println_int" in code
+
 
 if __name__ == '__main__':
     pytest.main(sys.argv)
@@ -0,0 +1,611 @@
+#! /usr/bin/env python3
+"""
+Tests of the driver MiniCC.py, beyond the compilation of each test file
+done by test_interpreter.py and test_codegen.py: the compilation cache
+(--cache), the compile server (--serve), the batches of files (-j), the
+backend run in parallel on the functions (--function-jobs), the pass
+manager of Lib/PassManager.py, the options of --partial-eval, the DFA
+cache of Lib/DFACache.py (--dfa-cache), the streams of Lib/LargeInput.py
+(--large-input) and the two-stage parsing of MiniCC.parse.
+"""
+import antlr4
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+import pytest
+
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.Errors import ParseCancellationException
+from antlr4.tree.Trees import Trees
+
+from Lib.CompileCache import CompileCache
+from Lib.PassManager import PassManager
+from MiniCC import (Mode, Options, build_arg_parser, parse, strip_arguments,
+                    valid_modes)
+from MiniCLexer import MiniCLexer
+from MiniCParser import MiniCParser
+from MiniCServer import handle_request
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+if HERE == os.path.realpath('.'):
+    HERE = '.'
+TEST_DIR = HERE
+
+MINICC = os.path.join(HERE, 'MiniCC.py')
+
+PROGRAM = os.path.join(TEST_DIR, 'TP04/tests/provided/step1/test00.c')
+FUNCTIONS = os.path.join(TEST_DIR, 'TP04/tests/students/functions/test_two_functions.c')
+LOOP = os.path.join(TEST_DIR, 'TP04/tests/provided/step2/test_while1.c')
+
+
+def minicc(*args):
+    """Run MiniCC.py with the arguments `args`, and return its exit code
+    and its standard output and error."""
+    res = subprocess.run([sys.executable, MINICC] + list(args), timeout=60,
+                         stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                         text=True)
+    return res.returncode, res.stdout
+
+
+class TestCompileCache:
+
+    def compile(self, cache_dir, output, *options, program=PROGRAM):
+        """Compile `program` in `output` with the cache in `cache_dir`, and
+        return the generated code."""
+        code, out = minicc('--mode', 'codegen-linear', '--reg-alloc', 'all-in-mem',
+                           '--output', output, '--cache', '--cache-dir', cache_dir,
+                           *options, program)
+        assert code == 0, out
+        with open(output) as f:
+            return f.read()
+
+    def entries(self, cache_dir):
+        return sorted(os.path.join(cache_dir, f) for f in os.listdir(cache_dir)
+                      if f.endswith('.s'))
+
+    def replace_code(self, entry, code, digest=None):
+        """Replace the code cached in `entry`, and the hash of the compiler
+        files if `digest` is given. Return these files."""
+        with open(entry) as f:
+            header = f.readline().split()
+        if digest is not None:
+            header[0] = digest
+        with open(entry, 'w') as f:
+            f.write(' '.join(header) + '\n' + code)
+        return header[1:]
+
+    def test_hit_and_miss(self, tmp_path):
+        """The code is cached with --cache only, then taken from the cache
+        for the same program and options."""
+        cache_dir = str(tmp_path / 'cache')
+        output = str(tmp_path / 'out.s')
+        code, _ = minicc('--mode', 'codegen-linear', '--reg-alloc', 'all-in-mem',
+                         '--output', output, '--cache-dir', cache_dir, PROGRAM)
+        assert code == 0
+        assert not os.path.exists(cache_dir)
+        generated = self.compile(cache_dir, output)
+        [entry] = self.entries(cache_dir)
+        with open(entry) as f:
+            f.readline()
+            assert f.read() == generated
+        files = self.replace_code(entry, '# cached\n')
+        # The modules imported by the compilation, and only them
+        assert 'TP04/MiniCCodeGen3AVisitor.py' in files
+        assert 'TP04/AllInMemAllocator.py' in files
+        assert 'TP03/MiniCClosureVisitor.py' not in files
+        # A hit: the code comes from the entry
+        assert self.compile(cache_dir, output) == '# cached\n'
+
+    def test_invalidation(self, tmp_path):
+        """Other options, or another version of the compiler, miss the
+        cached entry."""
+        cache_dir = str(tmp_path / 'cache')
+        output = str(tmp_path / 'out.s')
+        generated = self.compile(cache_dir, output)
+        [entry] = self.entries(cache_dir)
+        self.replace_code(entry, '# cached\n')
+        assert self.compile(cache_dir, output, '--disable-typecheck') != '# cached\n'
+        assert len(self.entries(cache_dir)) == 2
+        # The hash of the compiler files differs: the entry is stale.
+        self.replace_code(entry, '# cached\n', digest='0' * 64)
+        assert self.compile(cache_dir, output) == generated
+
+    def test_function_jobs(self, tmp_path):
+        """With --function-jobs, the entry records the modules imported
+        by the worker processes too."""
+        cache_dir = str(tmp_path / 'cache')
+        output = str(tmp_path / 'out.s')
+        self.compile(cache_dir, output, '--mode', 'codegen-cfg', '--function-jobs', '2',
+                     program=FUNCTIONS)
+        [entry] = self.entries(cache_dir)
+        files = self.replace_code(entry, '# cached\n')
+        assert 'TP04/BuildCFG.py' in files
+        assert 'TP04/AllInMemAllocator.py' in files
+
+    def test_lru_eviction(self, tmp_path):
+        """The least recently used entries are removed when the cache
+        holds more than its maximal size."""
+        cache = CompileCache(str(tmp_path), max_size=1)
+        code = 'x' * (400 * 1024)
+        cache.put('a', code)
+        cache.put('b', code)
+        # a is older than b, but used since b was added.
+        os.utime(tmp_path / 'a.s', (1, 1))
+        os.utime(tmp_path / 'b.s', (2, 2))
+        assert cache.get('a') == code
+        cache.put('c', code)
+        assert cache.get('b') is None
+        assert cache.get('a') == code
+        assert cache.get('c') == code
+
+
+class TestOptions:
+
+    def options(self, *argv):
+        return Options.from_args(build_arg_parser(valid_modes()).parse_args(argv))
+
+    def test_from_args(self):
+        """Options are taken from the command line, with the mode, the
+        typechecking and the file names computed."""
+        options = self.options('--mode', 'parse', '--lexer=fast',
+                               os.path.join(TEST_DIR, 'TP03/tests/provided/examples/*.c'))
+        assert options.mode == Mode.PARSE
+        assert not options.typecheck
+        assert options.lexer == 'fast'
+        assert len(options.filenames) > 1
+        options = self.options('--mode', 'codegen-linear', '--reg-alloc=naive',
+                               '--partial-eval', '--disable-typecheck', 'a.c')
+        assert (options.mode, options.reg_alloc, options.partial_eval, options.typecheck) \
+            == (Mode.LINEAR, 'naive', True, False)
+        assert options.partial_eval_fuel is None
+        assert Options(Mode.EVAL).error() is None
+
+    @pytest.mark.parametrize('argv, error', [
+        (['--mode=codegen-linear'], "the following arguments is required: --reg-alloc"),
+        (['--mode=eval', '--reg-alloc=naive'],
+         "register allocation is only available in code generation mode"),
+        (['--mode=codegen-linear', '--reg-alloc=smart'],
+         "smart register allocation is not compatible with linear code generation"),
+        (['--mode=eval', '--partial-eval'],
+         "--partial-eval is only available in code generation mode"),
+        (['--mode=codegen-linear', '--reg-alloc=naive', '--partial-eval',
+          '--disable-typecheck'],
+         "--partial-eval is not available with --fused-typing or --disable-typecheck"),
+        (['--mode=codegen-linear', '--reg-alloc=naive', '--partial-eval-fuel=2'],
+         "--partial-eval-fuel is only available with --partial-eval"),
+        (['--mode=eval', '--engine=closure', '--profile'],
+         "--profile is only available with --mode eval --engine=visitor"),
+        (['--mode=typecheck', '--max-statements=2'],
+         "--max-statements is only available with --mode eval --engine=visitor"),
+        (['--mode=codegen-linear', '--reg-alloc=naive', '--output=a.s', 'b.c'],
+         "--output is only available with a single source file"),
+    ])
+    def test_error(self, argv, error):
+        """Options which can't be used together are reported by error(),
+        and by MiniCC.py with the exit code 1."""
+        assert self.options(*argv, 'a.c').error() == error
+        assert minicc(*argv, PROGRAM) == (1, "error: " + error + "\n")
+
+
+class TestServer:
+
+    def serve(self, *requests):
+        """Send the request lines `requests` to `MiniCC.py --serve`, and
+        return its responses."""
+        res = subprocess.run([sys.executable, MINICC, '--serve'], timeout=60,
+                             input="".join(r + "\n" for r in requests),
+                             stdout=subprocess.PIPE, text=True)
+        assert res.returncode == 0
+        return [json.loads(line) for line in res.stdout.splitlines()]
+
+    def test_round_trip(self, tmp_path):
+        """Each request gets the response the command line would give."""
+        output = str(tmp_path / 'out.s')
+        requests = [
+            {"id": 1, "args": ["--mode", "eval", PROGRAM]},
+            {"id": "two", "file": "x.c", "mode": "eval",
+             "source": "int main() { println_int(1 / 0); return 0; }"},
+            {"file": PROGRAM, "mode": "codegen-linear", "reg_alloc": "naive",
+             "output": output},
+        ]
+        responses = self.serve(*(json.dumps(r) for r in requests))
+        code, out = minicc("--mode", "eval", PROGRAM)
+        assert responses == [
+            {"id": 1, "exitcode": code, "stdout": out, "stderr": ""},
+            {"id": "two", "exitcode": 1, "stdout": "Division by 0\n", "stderr": ""},
+            {"exitcode": 0, "stdout": "", "stderr": ""},
+        ]
+        assert os.path.exists(output)
+
+    def test_malformed_request(self):
+        """A malformed request gets an error, and the server goes on."""
+        responses = self.serve('not json', '[1]', '',
+                               json.dumps({"id": 3, "args": ["--mode", "eval", PROGRAM]}))
+        assert responses[0]["error"].startswith("Invalid request")
+        assert responses[1] == {"error": "Invalid request: a request must be a JSON object"}
+        assert responses[2]["id"] == 3
+        assert responses[2]["exitcode"] == 0
+
+    def test_uncaught_exception(self):
+        """An exception of the compiler is an internal error (exit code 4),
+        given in the "error" field of the response."""
+        def run(argv, source):
+            return 1 // 0
+        response = handle_request(run, json.dumps({"id": 4, "args": []}), "MiniCC.py")
+        assert response["id"] == 4
+        assert response["exitcode"] == 4
+        assert response["error"] == "ZeroDivisionError: integer division or modulo by zero"
+        assert "Traceback" in response["stderr"]
+        [response] = self.serve(json.dumps({"args": ["--mode", "eval", "nonexistent.c"]}))
+        assert response["exitcode"] == 4
+        assert response["error"].startswith("FileNotFoundError")
+
+
+class TestBatch:
+
+    def test_jobs(self):
+        """A batch gives the same output with -j as serially, and the
+        output of each file is the one of MiniCC.py on this file alone."""
+        pattern = os.path.join(TEST_DIR, 'TP03/tests/provided/examples/*.c')
+        serial = minicc('--mode', 'eval', '--disable-typecheck', pattern)
+        assert minicc('--mode', 'eval', '-j', '2', '--disable-typecheck', pattern) == serial
+        assert minicc('--mode', 'eval', '--jobs=2', '--disable-typecheck', pattern) == serial
+        code, out = minicc('--mode', 'eval', '--disable-typecheck',
+                           os.path.join(TEST_DIR, 'TP03/tests/provided/examples/test_print.c'))
+        assert code == 0
+        assert out in serial[1]
+
+    def test_strip_arguments(self):
+        """strip_arguments removes the options and their values in all their
+        forms, and the positional arguments, and nothing else."""
+        parser = build_arg_parser(valid_modes())
+        argv = ['--mode=codegen-linear', '-j2', '--reg-alloc', 'naive', 'a.c',
+                '--output=-j.s', '--jo', '3', '--partial-eval', '--func', '2', 'b.c']
+        assert strip_arguments(argv, parser, {"jobs", "filename"}) == \
+            ['--mode=codegen-linear', '--reg-alloc', 'naive', '--output=-j.s',
+             '--partial-eval', '--func', '2']
+        assert strip_arguments(argv, parser, {"jobs", "function_jobs"}) == \
+            ['--mode=codegen-linear', '--reg-alloc', 'naive', 'a.c', '--output=-j.s',
+             '--partial-eval', 'b.c']
+        argv = ['--mode', 'eval', '-j', '2', '--', '-j.c', 'a.c']
+        assert strip_arguments(argv, parser, {"jobs"}) == ['--mode', 'eval', '--', '-j.c', 'a.c']
+        assert strip_arguments(argv, parser, {"jobs", "filename"}) == ['--mode', 'eval']
+
+
+class TestFunctionJobs:
+
+    @pytest.mark.parametrize('mode, reg_alloc', [
+        ('codegen-linear', 'naive'), ('codegen-cfg', 'all-in-mem'),
+        ('codegen-ssa', 'all-in-mem'), ('codegen-optim', 'all-in-mem')])
+    def test_same_output(self, tmp_path, mode, reg_alloc):
+        """The code and the statistics of a program with several functions
+        are the same with --function-jobs 2 as serially."""
+        output = str(tmp_path / 'out.s')
+        results = []
+        for jobs in ('1', '2'):
+            res = subprocess.run([sys.executable, MINICC, '--mode', mode,
+                                  '--reg-alloc', reg_alloc, '--output', output,
+                                  '--stats', '--function-jobs', jobs, FUNCTIONS],
+                                 timeout=60, stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE, text=True)
+            assert res.returncode == 0, res.stderr
+            with open(output) as f:
+                results.append((f.read(), res.stderr))
+        assert results[0] == results[1]
+        assert "=== Statistics for f ===" in results[0][1]
+        assert "=== Statistics for main ===" in results[0][1]
+
+
+class TestPartialEval:
+
+    def code(self, tmp_path, *options):
+        """The linear code of LOOP generated with `options`, and the
+        constants it loads in temporaries."""
+        output = str(tmp_path / 'out.s')
+        code, out = minicc('--mode', 'codegen-linear', '--reg-alloc', 'none',
+                           '--output', output, *options, LOOP)
+        assert code == 0, out
+        with open(output) as f:
+            lines = [line.split() for line in f
+                     if line.strip() and not line.startswith('#')]
+        # The values loaded in temporaries
+        printed = [int(line[2]) for line in lines
+                   if line[0] == 'li' and line[1].startswith('temp')]
+        return lines, printed
+
+    def test_options(self, tmp_path):
+        """--partial-eval takes no value: the source file may follow it.
+        The program is compiled as usual when it runs out of fuel."""
+        lines, printed = self.code(tmp_path, '--partial-eval')
+        assert ['call', 'println_int'] in lines
+        assert not any(line[0].startswith('b') for line in lines)
+        assert printed == [8, 7, 6, 5, 4, 3, 2, 1, 0]
+        assert self.code(tmp_path, '--partial-eval', '--partial-eval-fuel', '5') \
+            == self.code(tmp_path)
+        code, out = minicc('--mode', 'codegen-linear', '--reg-alloc', 'none',
+                           '--partial-eval-fuel=5', LOOP)
+        assert code == 1
+        assert out == "error: --partial-eval-fuel is only available with --partial-eval\n"
+
+
+# Parses the file argv[2] in a fresh process, with the DFA cache of the
+# directory argv[1] and the recognizers argv[3:]: prints whether the cache
+# was loaded, and the parse tree.
+PARSE_WITH_DFA_CACHE = """
+import sys
+import antlr4
+from antlr4.tree.Trees import Trees
+from Lib.DFACache import DFACache
+from MiniCLexer import MiniCLexer
+from MiniCParser import MiniCParser
+recognizers = [globals()[name] for name in sys.argv[3:]]
+cache = DFACache(*recognizers, directory=sys.argv[1])
+print(cache.load())
+parser = MiniCParser(antlr4.CommonTokenStream(MiniCLexer(antlr4.FileStream(sys.argv[2]))))
+print(Trees.toStringTree(parser.prog(), None, parser))
+cache.save()
+"""
+
+
+class TestDFACache:
+
+    def parse(self, cache_dir, *recognizers):
+        res = subprocess.run([sys.executable, '-c', PARSE_WITH_DFA_CACHE, cache_dir,
+                              PROGRAM, *recognizers],
+                             cwd=HERE, timeout=60, stdout=subprocess.PIPE, text=True)
+        assert res.returncode == 0
+        loaded, tree = res.stdout.splitlines()
+        return loaded == "True", tree
+
+    def test_reload(self, tmp_path):
+        """The DFA saved by a run is loaded by the next ones, which parse
+        as without it."""
+        cache_dir = str(tmp_path / 'dfa')
+        loaded, tree = self.parse(cache_dir, 'MiniCLexer', 'MiniCParser')
+        assert not loaded
+        [entry] = os.listdir(cache_dir)
+        assert entry.endswith('.dfa')
+        assert self.parse(cache_dir, 'MiniCLexer', 'MiniCParser') == (True, tree)
+
+    def test_key(self, tmp_path):
+        """The DFA of other recognizers, or saved with another key, is not
+        loaded."""
+        cache_dir = str(tmp_path / 'dfa')
+        _, tree = self.parse(cache_dir, 'MiniCLexer', 'MiniCParser')
+        # Other recognizers: another file
+        assert self.parse(cache_dir, 'MiniCParser') == (False, tree)
+        assert len(os.listdir(cache_dir)) == 2
+        for entry in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, entry)
+            with open(path, 'rb') as f:
+                f.readline()
+                content = f.read()
+            with open(path, 'wb') as f:
+                f.write(b'0' * 64 + b'\n' + content)
+        assert self.parse(cache_dir, 'MiniCLexer', 'MiniCParser') == (False, tree)
+
+    def test_foreign_class(self, tmp_path):
+        """Only the classes of the ANTLR runtime are loaded from a file."""
+        cache_dir = str(tmp_path / 'dfa')
+        marker = str(tmp_path / 'marker')
+
+        class MakeDir:
+            def __reduce__(self):
+                return (os.makedirs, (marker,))
+        _, tree = self.parse(cache_dir, 'MiniCLexer', 'MiniCParser')
+        [entry] = os.listdir(cache_dir)
+        with open(os.path.join(cache_dir, entry), 'r+b') as f:
+            f.readline()
+            f.truncate(f.tell())
+            f.write(pickle.dumps(MakeDir()))
+        assert self.parse(cache_dir, 'MiniCLexer', 'MiniCParser') == (False, tree)
+        assert not os.path.exists(marker)
+
+    def test_option(self, tmp_path):
+        """Without --dfa-cache, nothing is saved; with it, the DFA is saved
+        in the given directory, and the output is the same."""
+        cache_dir = str(tmp_path / 'dfa')
+        expected = minicc('--mode', 'eval', PROGRAM)
+        assert not os.path.exists(cache_dir)
+        assert minicc('--mode', 'eval', '--dfa-cache', cache_dir, PROGRAM) == expected
+        assert len(os.listdir(cache_dir)) == 1
+        assert minicc('--mode', 'eval', '--dfa-cache', cache_dir, PROGRAM) == expected
+
+
+# Programs compiled with and without --large-input
+LARGE_INPUT_SOURCES = {
+    'syntax error': 'int main() {\n  int x;\n  x = 1 +;\n  return 0;\n}\n',
+    'lexical error': 'int main() {\n  int x;\n  x = 1 @ 2;\n  return 0;\n}\n',
+    # Not ASCII: read by an antlr4.FileStream
+    'non-ASCII': 'int main() {\n  println_string("\u00e9");\n  return 0;\n}\n',
+    'empty': '',
+}
+
+
+class TestLargeInput:
+
+    @pytest.mark.parametrize('mode', ['parse', 'typecheck', 'eval'])
+    @pytest.mark.parametrize('source', ['valid'] + list(LARGE_INPUT_SOURCES))
+    def test_same_output(self, tmp_path, mode, source):
+        """--large-input gives the same output and exit code as the usual
+        streams, on valid programs and on syntax errors. In parse mode,
+        the syntax is checked without parse tree, and the file parsed
+        again from its start on errors."""
+        if source == 'valid':
+            filename = PROGRAM
+        else:
+            filename = str(tmp_path / 'program.c')
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(LARGE_INPUT_SOURCES[source])
+        expected = minicc('--mode', mode, filename)
+        if source.endswith('error'):
+            assert expected[0] == 3
+        assert minicc('--mode', mode, '--large-input', filename) == expected
+        assert minicc('--mode', mode, '--large-input', '--lexer=fast', filename) == expected
+
+
+class RecordErrorListener(ErrorListener):
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def syntaxError(self, recognizer, offending_symbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+
+class SLLFailingParser(MiniCParser):
+    """MiniCParser whose parsing with SLL prediction fails after a few
+    tokens, as it would on a program with a conflict that only the full
+    context of LL prediction resolves. There is no such program in
+    MiniC: its only ambiguity (the dangling else) is resolved the same
+    way by both predictions."""
+
+    def prog(self):
+        if self._interp.predictionMode == PredictionMode.SLL:
+            for _ in range(5):
+                self.getTokenStream().consume()
+            raise ParseCancellationException("SLL conflict")
+        return super().prog()
+
+
+class TestParse:
+
+    def parse(self, source, parser_class=MiniCParser, **kwargs):
+        """Parse `source` with parse(), or with the usual LL parsing if
+        `two_stage` is False. Return the tree and the syntax errors."""
+        two_stage = kwargs.pop('two_stage', True)
+        lexer = MiniCLexer(antlr4.InputStream(source))
+        parser = parser_class(antlr4.CommonTokenStream(lexer))
+        listener = RecordErrorListener()
+        parser.removeErrorListeners()
+        parser.addErrorListener(listener)
+        tree = parse(parser, **kwargs) if two_stage else parser.prog()
+        return Trees.toStringTree(tree, None, parser), listener.errors
+
+    def test_fallback(self, capsys):
+        """When SLL prediction fails on a valid program, the program is
+        parsed again from its start with LL prediction, to the same tree,
+        without errors."""
+        with open(PROGRAM) as f:
+            source = f.read()
+        expected = self.parse(source, two_stage=False)
+        assert self.parse(source, SLLFailingParser, debug=True) == expected
+        assert expected[1] == []
+        assert capsys.readouterr().out == \
+            "SLL parsing failed, parsing again with full LL prediction\n"
+        assert self.parse(source, debug=True) == expected
+        assert capsys.readouterr().out == "Parsed with SLL prediction\n"
+
+    def test_syntax_error(self, tmp_path):
+        """A syntax error gets the messages of the LL parsing, with the
+        exit code 3, and --debug tells that SLL parsing failed."""
+        source = 'int main() {\n  int x;\n  x = (1 +;\n  x = 2 2;\n  return 0;\n}\n'
+        tree, errors = self.parse(source)
+        assert (tree, errors) == self.parse(source, two_stage=False)
+        assert len(errors) == 2
+        filename = str(tmp_path / 'error.c')
+        with open(filename, 'w') as f:
+            f.write(source)
+        messages = ''.join('line {}:{} {}\n'.format(*error) for error in errors)
+        assert minicc('--mode', 'parse', filename) == (3, messages)
+        assert minicc('--mode', 'parse', '--debug', filename) == \
+            (3, 'SLL parsing failed, parsing again with full LL prediction\n' + messages)
+
+    @pytest.mark.parametrize('large_input', [[], ['--large-input']])
+    def test_deep_program(self, tmp_path, large_input):
+        """A program nested too deep for the Python stack is parsed again
+        with a deeper one, and its syntax errors are only reported once."""
+        depth = 5000
+        filename = str(tmp_path / 'deep.c')
+        for expr, expected in [('1', (0, '')),
+                               ('1 +', (3, "line 3:{} mismatched input ')' expecting "
+                                        "{{'-', '!', '(', 'true', 'false', ID, INT, FLOAT, "
+                                        "STRING}}\n".format(depth + 9)))]:
+            with open(filename, 'w') as f:
+                f.write('int main() {\n  int x;\n  x = ' + '(' * depth + expr
+                        + ')' * depth + ';\n  return 0;\n}\n')
+            assert minicc('--mode', 'parse', *large_input, filename) == expected
+
+
+class TestPassManager:
+
+    def test_run(self):
+        """Passes are run, and only timed with time_passes."""
+        passes = PassManager()
+        assert passes.run("add", lambda x, y: x + y, 1, y=2) == 3
+        assert not passes.enabled
+        assert passes.results() == ({}, {})
+        passes = PassManager(time_passes=True)
+        with pytest.raises(ZeroDivisionError):
+            passes.run("div", lambda: 1 // 0)
+        # A failing pass is still timed.
+        assert passes.results()[0]["(program)"]["div"][0] == 1
+
+    def test_ordering(self):
+        """Timings are reported by function and in the order of the first
+        run of each pass; counters in the order of STATS."""
+        passes = PassManager(time_passes=True, stats=True)
+        passes.run("parsing", lambda: None)
+        passes.set_function("f")
+        passes.run("b", lambda: None)
+        passes.run("a", lambda: None)
+        passes.run("b", lambda: None)
+        passes.count("phis", 1)
+        passes.count("blocks", 2)
+        timings, counters = passes.results()
+        assert list(timings) == ["(program)", "f"]
+        assert list(timings["f"]) == ["b", "a"]
+        assert timings["f"]["b"][0] == 2
+        stream = io.StringIO()
+        passes.report(stream)
+        lines = [line.split()[0] for line in stream.getvalue().splitlines()]
+        assert lines == ["===", "pass", "parsing", "total",
+                         "===", "pass", "b", "a", "total",
+                         "===", "blocks", "phis"]
+
+    def test_instrumented(self):
+        """The calls of a pass by another one (e.g. the liveness analysis
+        by the allocator) are timed as a pass of their own, followed by
+        the `after` callback, within the `with` block only."""
+        class Analysis:
+            def run(self, x):
+                return x + 1
+        analysis = Analysis()
+        after = []
+        passes = PassManager(time_passes=True)
+
+        def allocation():
+            return analysis.run(1) + analysis.run(2)
+        with passes.instrumented(analysis, "run", "liveness",
+                                 after=lambda: after.append(True)):
+            assert passes.run("allocation", allocation) == 5
+        assert analysis.run(3) == 4
+        timings = passes.results()[0]["(program)"]
+        assert timings["liveness"][0] == 2
+        assert timings["allocation"][0] == 1
+        # The analysis runs within the allocation.
+        assert timings["liveness"][1] <= timings["allocation"][1]
+        assert after == [True, True]
+        assert "run" not in vars(analysis)
+
+    def test_merge(self):
+        """The results of another pass manager (of a worker process) add
+        up to the ones of this one."""
+        passes = PassManager(time_passes=True, stats=True)
+        passes.set_function("f")
+        passes.run("a", lambda: None)
+        worker = PassManager(time_passes=True, stats=True)
+        worker.set_function("f")
+        worker.run("a", lambda: None)
+        worker.set_function("g")
+        worker.run("a", lambda: None)
+        worker.count("blocks", 3)
+        passes.merge(worker.results())
+        timings, counters = passes.results()
+        assert timings["f"]["a"][0] == 2
+        assert timings["g"]["a"][0] == 1
+        assert counters == {"g": {"blocks": 3}}
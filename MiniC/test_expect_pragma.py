@@ -184,17 +184,18 @@ class TestCompiler(object):
         except OSError:
             pass
 
-    def run_command(self, cmd, scope="compile"):
+    def run_command(self, cmd, scope="compile", timeout=60):
         """Run the command cmd (given as [command, arg1, arg2, ...]), and
         return testinfo(exitcode=..., output=...) containing the
         exit code of the command it its standard output + standard error.
 
         If scope="compile" (resp. "runtime"), then the exitcode (resp.
         execcode) is set with the exit status of the command, and the
-        execcode (resp. exitcode) is set to 0.
+        execcode (resp. exitcode) is set to 0. The command is killed
+        after timeout seconds.
         """
         try:
-            output = subprocess.check_output(cmd, timeout=60,
+            output = subprocess.check_output(cmd, timeout=timeout,
                                              stderr=subprocess.STDOUT)
             status = 0
         except subprocess.CalledProcessError as e:
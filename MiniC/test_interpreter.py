@@ -1,9 +1,11 @@
 #! /usr/bin/env python3
+import asyncio
 import pytest
 import glob
 import os
 import sys
 from test_expect_pragma import TestExpectPragmas, cat, TestCompiler, filter_pathnames
+from MiniCEvalService import EvalService
 
 HERE = os.path.dirname(os.path.realpath(__file__))
 if HERE == os.path.realpath('.'):
@@ -17,6 +19,11 @@ if 'SKIP_EXPECT' in os.environ:
 
 DISABLE_TYPECHECK = False  # True to skip typechecking
 
+# Evaluation engines (--engine) to test
+ENGINES = ['visitor', 'closure', 'vm', 'pyast']
+# Options of MiniCC.py for each evaluation engine
+EVALUATIONS = {engine: ["--engine", engine] for engine in ENGINES}
+
 ALL_FILES = []
 # tests for typing AND evaluation
 ALL_FILES += glob.glob(os.path.join(TEST_DIR, 'TP03/tests/provided/**/*.c'), recursive=True)
@@ -35,12 +42,14 @@ if 'FILTER' in os.environ:
 class TestInterpret(TestExpectPragmas, TestCompiler):
     DISABLE_CODEGEN = False
 
-    def evaluate(self, file):
+    def evaluate(self, file, engine='visitor'):
+        options = EVALUATIONS[engine]
         if not DISABLE_TYPECHECK:
-            res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval", file])
+            res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval"]
+                                   + options + [file])
         else:
-            res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval",
-                                   "--disable-typecheck", file])
+            res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval"]
+                                   + options + ["--disable-typecheck", file])
         if res.exitcode == 1:
             # Execution can't distinguish exit code at runtime and static rejection
             # of the program. But we know that an exit code of 1 is reserved for
@@ -77,14 +86,117 @@ class TestInterpret(TestExpectPragmas, TestCompiler):
         gcc_result = self.run_with_gcc(filename, expect)
         self.assert_equal(gcc_result, expect, "gcc")
 
+    @pytest.mark.parametrize('engine', EVALUATIONS)
     @pytest.mark.parametrize('filename', ALL_FILES)
-    def test_eval(self, filename):
+    def test_eval(self, filename, engine):
         cat(filename)  # For diagnosis
         expect = self.get_expect(filename)
-        actual = self.evaluate(filename)
+        actual = self.evaluate(filename, engine)
         if expect:
             self.assert_equal(actual, expect, "MiniCC")
 
+    def test_deep_expression(self):
+        """Typing and evaluation of a chain of 5000 additions, deeper than
+        the Python recursion limit."""
+        filename = os.path.join(TEST_DIR, 'TP03/tests/students/interpret/deep/chain.c')
+        expect = self.get_expect(filename)
+        res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval",
+                                filename], timeout=120)
+        self.assert_equal(res, expect, "MiniCC")
+
+    def test_profile(self, tmp_path):
+        """--profile counts the executions of each statement, and
+        --profile-stacks writes the nesting of statements. Loops are
+        executed step by step, even the affine ones of
+        TP03/MiniCAffineLoop.py."""
+        filename = str(tmp_path / "profile.c")
+        stacks = str(tmp_path / "stacks.txt")
+        with open(filename, 'w') as f:
+            f.write("int main() {\n  int i;\n  i = 0;\n"
+                    "  while (i < 10) {\n    i = i + 1;\n  }\n"
+                    "  println_int(i);\n  return 0;\n}\n")
+        res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval",
+                                "--profile-stacks", stacks, filename])
+        assert res.exitcode == 0
+        lines = res.output.splitlines()
+        assert lines[:2] == ["10", "=== Statement profile ==="]
+        counts = {line.split()[0]: line.split()[2] for line in lines[3:]}
+        assert counts == {"3:2": "1", "4:2": "1", "5:4": "10", "7:2": "1"}
+        with open(stacks) as f:
+            frames = [line.rsplit(" ", 1)[0] for line in f]
+        assert "main;while@4:2;assign@5:4" in frames
+
+    def test_max_statements(self, tmp_path):
+        """--max-statements stops the program, even in a loop which would
+        be evaluated in closed form (see TP03/MiniCAffineLoop.py)."""
+        filename = str(tmp_path / "budget.c")
+        with open(filename, 'w') as f:
+            f.write("int main() { int i, s;"
+                    " for (i = 0; i < 1000000000; i = i + 1) { s = s + 2; }"
+                    " println_int(s); return 0; }\n")
+        res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval",
+                                "--max-statements", "1000", filename])
+        assert res.exitcode == 6
+        assert res.output == "Timeout: more than 1000 statements executed\n"
+
+    def test_eval_service(self):
+        """MiniCEvalService.py gives the results of evaluate(), and stops
+        the programs which don't terminate."""
+        requests = [{"id": i, "file": f} for i, f in enumerate(sorted(ALL_FILES)[:20])]
+        requests.append({"id": "loop", "file": "loop.c", "max_statements": 1000,
+                         "source": "int main() { while (true) { } return 0; }"})
+
+        async def evaluate_all():
+            async with EvalService(2) as service:
+                return await asyncio.gather(*(service.evaluate(r) for r in requests))
+        responses = asyncio.run(evaluate_all())
+        for request, response in zip(requests, responses[:-1]):
+            expected = self.evaluate(request["file"])
+            assert response["id"] == request["id"]
+            assert response["exitcode"] == expected.exitcode
+            assert response["execcode"] == expected.execcode
+            assert response["output"] == expected.output
+        assert responses[-1]["timeout"]
+        assert responses[-1]["output"] == "Timeout: more than 1000 statements executed\n"
+
+    def test_eval_service_options(self):
+        """The default budget of MiniCEvalService.py only applies to the
+        engines which count statements, and invalid options are not
+        reported as runtime errors."""
+        filename = os.path.join(TEST_DIR, 'TP03/tests/students/interpret/div/print_div0.c')
+        expected = self.evaluate(filename)
+        requests = [{"file": filename, "options": ["--engine", "closure"]},
+                    {"file": filename, "options": ["--engine", "vm"]},
+                    {"file": filename, "options": ["--engine", "closure"],
+                     "max_statements": 1000},
+                    {"file": filename, "options": ["--no-such-option"]}]
+
+        async def evaluate_all():
+            async with EvalService(2) as service:
+                return await asyncio.gather(*(service.evaluate(r) for r in requests))
+        responses = asyncio.run(evaluate_all())
+        for response in responses[:2]:
+            assert response["exitcode"] == expected.exitcode
+            assert response["execcode"] == expected.execcode
+            assert response["output"] == expected.output
+        assert responses[2] == {"error": "Invalid request: --max-statements is only "
+                                "available with --mode eval --engine=visitor"}
+        assert responses[3] == {"error": "Invalid request: unrecognized arguments: "
+                                "--no-such-option"}
+
+    @pytest.mark.parametrize('engine', ENGINES)
+    def test_output_buffer(self, engine):
+        """The lines printed before a runtime error come first, whatever
+        the size of the output buffer."""
+        filename = os.path.join(TEST_DIR, 'TP03/tests/students/interpret/div/print_div0.c')
+        expect = self.get_expect(filename)
+        for size in ["0", "16", "1000000"]:
+            res = self.run_command([sys.executable, MINIC_EVAL, "--mode", "eval",
+                                    "--engine", engine, "--output-buffer", size,
+                                    filename])
+            assert res.exitcode == expect.execcode
+            assert res.output == expect.output
+
 
 if __name__ == '__main__':
     pytest.main(sys.argv)
@@ -0,0 +1,105 @@
+#! /usr/bin/env python3
+"""
+Differential test of Lib/FastLexer.py against the generated MiniCLexer:
+both must give the same tokens and the same lexical errors, including
+when FastLexer scans the bytes of a file mapped by --large-input.
+"""
+import pytest
+import sys
+import glob
+import os
+import antlr4
+from antlr4.error.ErrorListener import ErrorListener
+from test_expect_pragma import filter_pathnames
+
+from MiniCLexer import MiniCLexer
+from Lib.FastLexer import FastLexer
+from Lib.LargeInput import MmapInputStream, open_input
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+if HERE == os.path.realpath('.'):
+    HERE = '.'
+TEST_DIR = HERE
+
+ALL_FILES = glob.glob(os.path.join(TEST_DIR, 'TP*/tests/**/*.c'), recursive=True)
+
+if 'TEST_FILES' in os.environ:
+    ALL_FILES = glob.glob(os.environ['TEST_FILES'], recursive=True)
+
+if 'FILTER' in os.environ:
+    ALL_FILES = filter_pathnames(ALL_FILES, os.environ['FILTER'])
+
+# Lexical errors, and tokens close to them.
+SOURCES = [
+    '',
+    'int main() { return 0; }',
+    'x = 1.5 + .5 * 2. - 10 % 3;\n',
+    'a || b && !c | d & e',
+    'x == y != z >= t <= u > v < w',
+    '"abc" "a""b" "" """" "a"""',
+    '"unterminated\nx = 1;',
+    '"unterminated\r\nx = 1;',
+    '"unterminated',
+    'x = 1 |',
+    'x = 1 &',
+    'x = .;',
+    'x = .',
+    'x = @ $ ` ~ ?;\n\ty = \'a\';',
+    'int intx; iff if_ else println_int println_intx',
+    '// comment\n# comment\nx // comment',
+    '\t\tx\r\n  y\n\n\tz',
+    '1.2.3 ..4 12abc',
+    'é = 1;\nx = "é";',
+]
+
+
+class RecordErrorListener(ErrorListener):
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def syntaxError(self, recognizer, offending_symbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+
+def lex(lexer_class, source):
+    return lex_stream(lexer_class, antlr4.InputStream(source))
+
+
+def lex_stream(lexer_class, input_s):
+    lexer = lexer_class(input_s)
+    lexer.removeErrorListeners()
+    listener = RecordErrorListener()
+    lexer.addErrorListener(listener)
+    stream = antlr4.CommonTokenStream(lexer)
+    stream.fill()
+    tokens = [(t.type, t.text, t.line, t.column, t.start, t.stop, t.channel,
+               t.tokenIndex) for t in stream.tokens]
+    return tokens, listener.errors
+
+
+class TestLexer(object):
+
+    def check(self, source):
+        assert lex(FastLexer, source) == lex(MiniCLexer, source)
+
+    @pytest.mark.parametrize('source', SOURCES)
+    def test_source(self, source):
+        self.check(source)
+
+    @pytest.mark.parametrize('filename', ALL_FILES)
+    def test_file(self, filename):
+        with open(filename, encoding='utf-8') as f:
+            self.check(f.read())
+
+    @pytest.mark.parametrize('source', [s for s in SOURCES if s.isascii() and s])
+    def test_mmap(self, source, tmp_path):
+        filename = tmp_path / "source.c"
+        filename.write_bytes(source.encode('ascii'))
+        input_s = open_input(str(filename))
+        assert isinstance(input_s, MmapInputStream)
+        assert lex_stream(FastLexer, input_s) == lex(MiniCLexer, source)
+
+
+if __name__ == '__main__':
+    pytest.main(sys.argv)
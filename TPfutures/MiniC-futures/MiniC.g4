@@ -21,10 +21,7 @@ param_l
     | param COM param_l  #paramList
     ;
 
-id_l
-    : ID              #idListBase
-    | ID COM id_l     #idList
-    ;
+id_l: ID (COM ID)* #idList;
 
 block: stat*   #statList;
 
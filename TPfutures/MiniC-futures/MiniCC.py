@@ -17,10 +17,23 @@ import argparse
 from antlr4 import FileStream, CommonTokenStream, ParseTreeWalker
 from antlr4.error.ErrorListener import ErrorListener
 
+import importlib.util
 import os
 import sys
 
 
+def load_dfa_cache():
+    """The DFACache class of the MiniC compiler, loaded from its file:
+    the Lib package of MiniC is not put on the path, where it could be
+    mistaken for another one."""
+    path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                        '..', '..', 'MiniC', 'Lib', 'DFACache.py')
+    spec = importlib.util.spec_from_file_location('MiniC_DFACache', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.DFACache
+
+
 class CountErrorListener(ErrorListener):
     """Count number of errors.
 
@@ -38,7 +51,8 @@ class CountErrorListener(ErrorListener):
 
 
 def main(inputname,
-         typecheck=True, typecheck_only=False, stdout=False, output_name=None, debug=False):
+         typecheck=True, typecheck_only=False, stdout=False, output_name=None, debug=False,
+         dfa_cache_dir=None):
     (basename, rest) = os.path.splitext(inputname)
     if not typecheck_only:
         if stdout:
@@ -53,7 +67,18 @@ def main(inputname,
     stream = CommonTokenStream(lexer)
     parser = MiniCParser(stream)
     parser._listeners.append(counter)
-    tree = parser.prog()
+    # Start from the DFA built by the previous runs, and save it back
+    # with the states added by this one.
+    dfa_cache = None
+    if dfa_cache_dir is not None:
+        DFACache = load_dfa_cache()
+        dfa_cache = DFACache(MiniCLexer, MiniCParser, directory=dfa_cache_dir)
+        dfa_cache.load()
+    try:
+        tree = parser.prog()
+    finally:
+        if dfa_cache is not None:
+            dfa_cache.save()
     if counter.count > 0:
         exit(3)  # Syntax or lexicography errors occurred, don't try to go further.
 
@@ -96,6 +121,9 @@ if __name__ == '__main__':
                         help="Run only the typechecker, don't try generating code.")
     parser.add_argument('--output', type=str,
                         help='Generate code to outfile')
+    parser.add_argument('--dfa-cache', type=str, metavar='DIR',
+                        help='Load the prediction DFA of the parser from DIR, '
+                        'and save it there when it has grown')
 
     args = parser.parse_args()
 
@@ -103,7 +131,7 @@ if __name__ == '__main__':
         main(args.filename,
              not args.disable_typecheck, args.disable_codegen,
              args.stdout, args.output, args.debug,
-             )
+             args.dfa_cache)
     except MiniCUnsupportedError as e:
         print(e)
         exit(5)